@@ -58,5 +58,8 @@ if context.is_offline_mode():
     )
     with context.begin_transaction():
         context.run_migrations()
+elif config.attributes.get("connection") is not None:
+    # 🔹 Migración dentro del proceso (`db/migrations.py`): usa la conexión que ya tiene el bloqueo
+    do_run_migrations(config.attributes["connection"])
 else:
     asyncio.run(run_migrations())  # 🔹 Usa `asyncio.run()` para llamar `run_migrations()`
@@ -0,0 +1,28 @@
+"""Add unique (product_id, store_id) to inventory
+
+Revision ID: a1c4e7f20b31
+Revises: e8fa6c1e6cc8
+Create Date: 2026-10-18 09:12:40.114205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c4e7f20b31"
+down_revision: Union[str, None] = "e8fa6c1e6cc8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Un producto solo puede tener un registro de inventario por tienda (requerido por `ON CONFLICT`)."""
+    with op.batch_alter_table("inventory", schema=None) as batch_op:
+        batch_op.create_unique_constraint("uq_inventory_product_store", ["product_id", "store_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("inventory", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_inventory_product_store", type_="unique")
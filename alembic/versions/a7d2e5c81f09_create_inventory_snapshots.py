@@ -0,0 +1,35 @@
+"""Create inventory_snapshots table
+
+Revision ID: a7d2e5c81f09
+Revises: f3c7a1d94b26
+Create Date: 2026-10-18 20:41:57.118402
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d2e5c81f09"
+down_revision: Union[str, None] = "f3c7a1d94b26"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Copias periódicas de `inventory` para reconstruir el stock en una fecha pasada."""
+    op.create_table(
+        "inventory_snapshots",
+        sa.Column("taken_at", sa.DateTime(), nullable=False),
+        sa.Column("product_id", sa.UUID(), nullable=False),
+        sa.Column("store_id", sa.UUID(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("taken_at", "product_id", "store_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("inventory_snapshots")
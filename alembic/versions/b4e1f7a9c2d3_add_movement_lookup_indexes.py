@@ -0,0 +1,47 @@
+"""Add movement lookup indexes and drop redundant ones
+
+Revision ID: b4e1f7a9c2d3
+Revises: a7d2e5c81f09
+Create Date: 2026-10-18 22:05:13.402871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e1f7a9c2d3"
+down_revision: Union[str, None] = "a7d2e5c81f09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 🔹 Índices que duplican la clave primaria o un prefijo de otro índice: solo encarecen las escrituras
+REDUNDANT_INDEXES = {
+    "inventory": [
+        ("ix_inventory_id", ["id"]),
+        ("ix_inventory_product_id", ["product_id"]),
+        ("ix_inventory_store_id", ["store_id"]),
+    ],
+    "movements": [("ix_movements_id", ["id"])],
+}
+
+
+def upgrade() -> None:
+    """Índices compuestos de `movements` por producto y por tienda de origen/destino en orden cronológico."""
+    op.create_index("ix_movements_product_timestamp", "movements", ["product_id", "timestamp", "id"], unique=False)
+    op.create_index("ix_movements_source_store_timestamp", "movements", ["source_store_id", "timestamp"], unique=False)
+    op.create_index("ix_movements_target_store_timestamp", "movements", ["target_store_id", "timestamp"], unique=False)
+    # 🔹 El historial de migraciones no crea todos en todas las instalaciones: se eliminan solo si existen
+    for table_name, indexes in REDUNDANT_INDEXES.items():
+        for index_name, _ in indexes:
+            op.drop_index(index_name, table_name=table_name, if_exists=True)
+
+
+def downgrade() -> None:
+    for table_name, indexes in REDUNDANT_INDEXES.items():
+        for index_name, columns in indexes:
+            op.create_index(index_name, table_name, columns, unique=False, if_not_exists=True)
+    op.drop_index("ix_movements_target_store_timestamp", table_name="movements")
+    op.drop_index("ix_movements_source_store_timestamp", table_name="movements")
+    op.drop_index("ix_movements_product_timestamp", table_name="movements")
@@ -0,0 +1,30 @@
+"""Add keyset pagination indexes
+
+Revision ID: b7d20c9e4f18
+Revises: a1c4e7f20b31
+Create Date: 2026-10-18 11:40:02.581930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d20c9e4f18"
+down_revision: Union[str, None] = "a1c4e7f20b31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Índices compuestos sobre las claves de orden de la paginación por cursor."""
+    op.create_index("ix_products_name_id", "products", ["name", "id"], unique=False)
+    op.create_index("ix_inventory_store_product", "inventory", ["store_id", "product_id"], unique=False)
+    op.create_index("ix_movements_timestamp_id", "movements", ["timestamp", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movements_timestamp_id", table_name="movements")
+    op.drop_index("ix_inventory_store_product", table_name="inventory")
+    op.drop_index("ix_products_name_id", table_name="products")
@@ -0,0 +1,34 @@
+"""Add stock_total to products
+
+Revision ID: c3f81d2a6b57
+Revises: b7d20c9e4f18
+Create Date: 2026-10-18 14:05:51.273614
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f81d2a6b57"
+down_revision: Union[str, None] = "b7d20c9e4f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Stock total por producto mantenido por los servicios, inicializado desde `inventory`."""
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("stock_total", sa.Integer(), server_default="0", nullable=False))
+    op.execute(
+        "UPDATE products SET stock_total = "
+        "COALESCE((SELECT SUM(quantity) FROM inventory WHERE inventory.product_id = products.id), 0)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.drop_column("stock_total")
@@ -0,0 +1,112 @@
+"""Partition movements by month and create movement_balances
+
+Revision ID: c8a3f5d17e42
+Revises: b4e1f7a9c2d3
+Create Date: 2026-10-18 23:12:40.551920
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8a3f5d17e42"
+down_revision: Union[str, None] = "b4e1f7a9c2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MOVEMENT_COLUMNS = "id, product_id, source_store_id, target_store_id, quantity, timestamp, type"
+MOVEMENT_INDEXES = [
+    ("ix_movements_timestamp_id", ["timestamp", "id"]),
+    ("ix_movements_product_timestamp", ["product_id", "timestamp", "id"]),
+    ("ix_movements_source_store_timestamp", ["source_store_id", "timestamp"]),
+    ("ix_movements_target_store_timestamp", ["target_store_id", "timestamp"]),
+]
+# 🔹 Una partición por mes desde el movimiento más antiguo hasta tres meses por delante (después las crea
+#    `db.partition_movements`), más `movements_default` para fechas fuera de rango
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    month_start date := date_trunc('month', COALESCE((SELECT min("timestamp") FROM movements_legacy), now()));
+    last_month date := date_trunc('month', now()) + interval '3 months';
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF movements FOR VALUES FROM (%L) TO (%L)',
+            'movements_p' || to_char(month_start, 'YYYY_MM'), month_start, month_start + interval '1 month'
+        );
+        month_start := month_start + interval '1 month';
+    END LOOP;
+END $$
+"""
+
+
+def _create_movements(primary_key: sa.PrimaryKeyConstraint, **kwargs) -> None:
+    op.create_table(
+        "movements",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("product_id", sa.UUID(), nullable=False),
+        sa.Column("source_store_id", sa.UUID(), nullable=True),
+        sa.Column("target_store_id", sa.UUID(), nullable=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column(
+            "type", postgresql.ENUM("IN", "OUT", "TRANSFER", name="movementtype", create_type=False), nullable=False
+        ),
+        sa.CheckConstraint("quantity > 0", name="check_quantity_positive"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        primary_key,
+        **kwargs,
+    )
+
+
+def _set_aside(table_name: str) -> None:
+    """Renombra `movements` (con su clave primaria) y elimina sus índices para crear la nueva tabla con los mismos."""
+    op.rename_table("movements", table_name)
+    op.execute(f"ALTER TABLE {table_name} RENAME CONSTRAINT movements_pkey TO {table_name}_pkey")
+    for index_name, _ in MOVEMENT_INDEXES:
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
+
+
+def _copy_from(table_name: str) -> None:
+    op.execute(f"INSERT INTO movements ({MOVEMENT_COLUMNS}) SELECT {MOVEMENT_COLUMNS} FROM {table_name}")
+    op.drop_table(table_name)
+    for index_name, columns in MOVEMENT_INDEXES:
+        op.create_index(index_name, "movements", columns, unique=False)
+
+
+def upgrade() -> None:
+    """
+    `movements` pasa a estar particionada por mes sobre `timestamp` (solo Postgres; la clave primaria incluye
+    `timestamp`, requisito del particionado) y se crea `movement_balances` para los saldos del historial retirado.
+    """
+    op.create_table(
+        "movement_balances",
+        sa.Column("balance_at", sa.DateTime(), nullable=False),
+        sa.Column("product_id", sa.UUID(), nullable=False),
+        sa.Column("store_id", sa.UUID(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("balance_at", "product_id", "store_id"),
+    )
+    if op.get_context().dialect.name != "postgresql":
+        return
+    _set_aside("movements_legacy")
+    _create_movements(
+        sa.PrimaryKeyConstraint("id", "timestamp", name="movements_pkey"), postgresql_partition_by="RANGE (timestamp)"
+    )
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    op.execute("CREATE TABLE movements_default PARTITION OF movements DEFAULT")
+    _copy_from("movements_legacy")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        # 🔹 Las particiones separadas por `db.partition_movements` (archivo) no se reincorporan
+        _set_aside("movements_partitioned")
+        _create_movements(sa.PrimaryKeyConstraint("id", name="movements_pkey"))
+        _copy_from("movements_partitioned")
+    op.drop_table("movement_balances")
@@ -0,0 +1,52 @@
+"""Create stores table
+
+Revision ID: d4a9b2c7e815
+Revises: c3f81d2a6b57
+Create Date: 2026-10-18 16:22:08.530417
+
+"""
+
+import uuid
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a9b2c7e815"
+down_revision: Union[str, None] = "c3f81d2a6b57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 🔹 Tiendas que antes estaban fijas en `config.VALID_STORE_IDS`
+INITIAL_STORE_IDS = (
+    "9cd61e1f-f9be-4045-b67d-2cd0ffde014f",
+    "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+    "f7c9e59e-a757-4375-b1c9-167b0a90a6e4",
+    "51814955-e9d0-47fc-9c3a-5ea8459b42f0",
+    "b5d5b3f1-8d2e-4ef6-94e5-d5f8c5b8a9b4",
+)
+
+
+def initial_store_rows() -> list[dict]:
+    """Filas de las tiendas iniciales; `db/migrations.py` las inserta también al crear una base vacía."""
+    return [{"id": uuid.UUID(store_id), "name": f"Tienda {store_id[:8]}"} for store_id in INITIAL_STORE_IDS]
+
+
+def upgrade() -> None:
+    """Registro de tiendas en BD, sembrado con las tiendas válidas que existían en la configuración."""
+    stores = op.create_table(
+        "stores",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("address", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.bulk_insert(stores, initial_store_rows())
+
+
+def downgrade() -> None:
+    op.drop_table("stores")
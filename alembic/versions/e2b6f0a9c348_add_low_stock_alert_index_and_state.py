@@ -0,0 +1,42 @@
+"""Add low stock alert partial index and version state
+
+Revision ID: e2b6f0a9c348
+Revises: d4a9b2c7e815
+Create Date: 2026-10-18 17:48:31.902736
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b6f0a9c348"
+down_revision: Union[str, None] = "d4a9b2c7e815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Índice parcial de filas en alerta de stock bajo y versión del conjunto de alertas (para `ETag`)."""
+    op.create_index(
+        "ix_inventory_low_stock",
+        "inventory",
+        ["store_id", "product_id"],
+        unique=False,
+        postgresql_where=sa.text("quantity <= min_stock"),
+        sqlite_where=sa.text("quantity <= min_stock"),
+    )
+    op.create_table(
+        "low_stock_alert_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("low_stock_alert_state")
+    op.drop_index("ix_inventory_low_stock", table_name="inventory")
@@ -0,0 +1,49 @@
+"""Create movement_rollups table
+
+Revision ID: f3c7a1d94b26
+Revises: e2b6f0a9c348
+Create Date: 2026-10-18 19:05:12.420318
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c7a1d94b26"
+down_revision: Union[str, None] = "e2b6f0a9c348"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Agregados horarios y diarios de movimientos por producto y tienda.
+    La tabla se crea vacía: rellenarla con `python -m inventory_management_system.db.backfill_rollups`.
+    """
+    op.create_table(
+        "movement_rollups",
+        sa.Column("granularity", sa.String(length=8), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("product_id", sa.UUID(), nullable=False),
+        sa.Column("store_id", sa.UUID(), nullable=False),
+        sa.Column("in_quantity", sa.BigInteger(), nullable=False),
+        sa.Column("out_quantity", sa.BigInteger(), nullable=False),
+        sa.Column("transfer_in_quantity", sa.BigInteger(), nullable=False),
+        sa.Column("transfer_out_quantity", sa.BigInteger(), nullable=False),
+        sa.Column("movements", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("granularity", "bucket", "product_id", "store_id"),
+    )
+    op.create_index(
+        "ix_movement_rollups_product", "movement_rollups", ["granularity", "product_id", "bucket"], unique=False
+    )
+    op.create_index("ix_movement_rollups_store", "movement_rollups", ["granularity", "store_id", "bucket"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movement_rollups_store", table_name="movement_rollups")
+    op.drop_index("ix_movement_rollups_product", table_name="movement_rollups")
+    op.drop_table("movement_rollups")
@@ -0,0 +1,51 @@
+"""Low stock alert version per store
+
+Revision ID: f9b3d6e2a714
+Revises: c8a3f5d17e42
+Create Date: 2026-10-18 23:57:21.604318
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f9b3d6e2a714"
+down_revision: Union[str, None] = "c8a3f5d17e42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Versión de alertas por tienda en lugar de una fila única. Cada tienda parte de la versión global anterior, de
+    modo que ningún `ETag` nuevo coincide con uno ya entregado de un estado distinto.
+    """
+    op.create_table(
+        "low_stock_alert_versions",
+        sa.Column("store_id", sa.UUID(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("store_id"),
+    )
+    op.execute(
+        "INSERT INTO low_stock_alert_versions (store_id, version)"
+        " SELECT stores.id, low_stock_alert_state.version FROM stores CROSS JOIN low_stock_alert_state"
+    )
+    op.drop_table("low_stock_alert_state")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "low_stock_alert_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        "INSERT INTO low_stock_alert_state (id, version)"
+        " SELECT 1, sum(version) FROM low_stock_alert_versions HAVING count(*) > 0"
+    )
+    op.drop_table("low_stock_alert_versions")
@@ -0,0 +1,108 @@
+"""Utilidades compartidas por los benchmarks (motor, semillas y medición)."""
+
+import os
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+# `db.database` crea su motor al importarse; los benchmarks que usan la app lo apuntan a la BD del benchmark.
+# Debe definirse antes de importar el paquete: `core.settings` lee el entorno una sola vez
+os.environ.setdefault("DATABASE_URL", BENCH_DATABASE_URL)
+
+from inventory_management_system.models import Base, Product, Store  # noqa: E402
+
+STORE_IDS = sorted(uuid.uuid5(uuid.NAMESPACE_URL, f"benchmark-store-{i}") for i in range(5))
+
+
+async def create_engine_and_schema(url: str = BENCH_DATABASE_URL) -> tuple[AsyncEngine, async_sessionmaker]:
+    """Crea el motor del benchmark con un esquema limpio y las tiendas de `STORE_IDS` registradas."""
+    engine = create_async_engine(url, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            Store.__table__.insert(), [{"id": store_id, "name": f"Tienda {i}"} for i, store_id in enumerate(STORE_IDS)]
+        )
+    return engine, async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def seed_products(session: AsyncSession, count: int) -> list[Product]:
+    """Inserta `count` productos de prueba."""
+    products = [
+        Product(
+            id=uuid.uuid4(),
+            name=f"Producto {i:07d}",
+            description="Producto de benchmark",
+            category=f"Categoria {i % 20}",
+            price=10.0 + i % 100,
+            sku=f"SKU-{i:07d}",
+        )
+        for i in range(count)
+    ]
+    session.add_all(products)
+    await session.commit()
+    return products
+
+
+def override_app_db(session_factory: async_sessionmaker):
+    """Hace que la app FastAPI use las sesiones del benchmark y devuelve la app."""
+    from inventory_management_system.db.database import get_db
+    from inventory_management_system.main import app
+
+    async def _get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    return app
+
+
+class StatementCounter:
+    """Cuenta sentencias SQL y commits emitidos por un motor (round trips a la BD)."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine.sync_engine
+        self.statements = 0
+        self.commits = 0
+
+    def _on_execute(self, *args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *args) -> None:
+        self.commits += 1
+
+    @property
+    def round_trips(self) -> int:
+        return self.statements + self.commits
+
+    @contextmanager
+    def track(self) -> Iterator["StatementCounter"]:
+        self.statements = self.commits = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        event.listen(self.engine, "commit", self._on_commit)
+        try:
+            yield self
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._on_execute)
+            event.remove(self.engine, "commit", self._on_commit)
+
+
+@contextmanager
+def timed(samples: list[float]) -> Iterator[None]:
+    """Agrega a `samples` la duración en milisegundos del bloque."""
+    start = time.perf_counter()
+    yield
+    samples.append((time.perf_counter() - start) * 1000)
+
+
+def summarize(samples: list[float]) -> str:
+    """Resumen p50/p99 de una lista de latencias en milisegundos."""
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"p50={statistics.median(ordered):.3f}ms p99={p99:.3f}ms n={len(ordered)}"
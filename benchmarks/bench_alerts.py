@@ -0,0 +1,74 @@
+"""
+Benchmark de `GET /api/inventory/alerts`: consulta anterior (ORM, tabla completa) frente al índice parcial
+y frente al sondeo con `If-None-Match` (solo se lee la versión).
+
+Uso:
+    python -m benchmarks.bench_alerts [productos]
+
+Siembra `productos * 5` filas de inventario (por defecto 20.000 x 5 = 100.000), un 1% en alerta.
+"""
+
+import asyncio
+import sys
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.future import select
+
+from benchmarks._common import STORE_IDS, create_engine_and_schema, seed_products, summarize, timed
+from inventory_management_system.models import Inventory
+from inventory_management_system.services.alert_service import get_low_stock_alerts_version
+from inventory_management_system.services.inventory_service import get_low_stock_alerts
+
+REPETITIONS = 50
+
+
+async def legacy_low_stock_alerts(db) -> list[dict]:
+    """Réplica de la versión anterior: objetos ORM completos y diccionarios en Python."""
+    result = await db.execute(select(Inventory).where(Inventory.quantity <= Inventory.min_stock))
+    return [
+        {
+            "product_id": item.product_id,
+            "store_id": item.store_id,
+            "quantity": item.quantity,
+            "min_stock": item.min_stock,
+            "alert": "Peligro, No hay Stock" if item.quantity == 0 else "Stock bajo",
+        }
+        for item in result.scalars().all()
+    ]
+
+
+async def run(product_count: int) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        products = await seed_products(session, product_count)
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "product_id": product.id,
+                "store_id": store_id,
+                "quantity": 1 if (i + j) % 100 == 0 else 50,
+                "min_stock": 5,
+            }
+            for i, product in enumerate(products)
+            for j, store_id in enumerate(STORE_IDS)
+        ]
+        await session.execute(insert(Inventory), rows)
+        await session.commit()
+
+    for label, query in (
+        ("antes (tabla completa)", legacy_low_stock_alerts),
+        ("después (índice parcial)", get_low_stock_alerts),
+        ("sondeo 304 (versión)", get_low_stock_alerts_version),
+    ):
+        samples: list[float] = []
+        async with session_factory() as session:
+            for _ in range(REPETITIONS):
+                with timed(samples):
+                    await query(session)
+        print(f"{label:<26} {summarize(samples)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
@@ -0,0 +1,88 @@
+"""
+Benchmark de consultas históricas de movimientos: en la BD frente al archivo Parquet (`archive_service`).
+Siembra un año de movimientos, mide `get_all_movements` filtrando por tienda y por producto en un mes antiguo,
+retira el historial con `expire_movements(..., archive_dir=...)` y repite las mismas consultas, ahora resueltas
+desde los archivos (sin consultas a la BD salvo el corte de `movement_balances`).
+
+Uso:
+    python -m benchmarks.bench_archive [movimientos] [repeticiones]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+from benchmarks._common import STORE_IDS, StatementCounter, create_engine_and_schema, seed_products, summarize, timed
+from inventory_management_system.core.ids import uuid7
+from inventory_management_system.models import Movement
+from inventory_management_system.models.movement import MovementType
+from inventory_management_system.services import archive_service
+from inventory_management_system.services.movement_service import get_all_movements
+from inventory_management_system.services.partition_service import expire_movements
+
+START = datetime(2025, 1, 1)
+BATCH = 10_000
+
+
+async def _seed(engine, products: list, total: int) -> None:
+    step = timedelta(days=365) / total
+    for offset in range(0, total, BATCH):
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(Movement),
+                [
+                    {
+                        "id": uuid7(),
+                        "product_id": products[i % len(products)].id,
+                        "source_store_id": STORE_IDS[i % len(STORE_IDS)],
+                        "target_store_id": STORE_IDS[(i + 1) % len(STORE_IDS)] if i % 3 == 0 else None,
+                        "quantity": 1 + i % 5,
+                        "timestamp": START + step * i,
+                        "type": MovementType.TRANSFER if i % 3 == 0 else MovementType.OUT,
+                    }
+                    for i in range(offset, min(offset + BATCH, total))
+                ],
+            )
+
+
+async def _measure(label: str, session_factory, counter: StatementCounter, queries: dict, repeats: int) -> None:
+    for name, filters in queries.items():
+        samples = []
+        async with session_factory() as session:
+            with counter.track():
+                for _ in range(repeats):
+                    with timed(samples):
+                        await get_all_movements(session, limit=100, date=date(2025, 3, 1), **filters)
+        print(f"{label:>8} {name:<10} {summarize(samples)}  sentencias/consulta={counter.statements / repeats:.1f}")
+
+
+async def run(total: int, repeats: int) -> None:
+    workdir = tempfile.mkdtemp()
+    engine, session_factory = await create_engine_and_schema(f"sqlite+aiosqlite:///{workdir}/bench_archive.db")
+    counter = StatementCounter(engine)
+    async with session_factory() as session:
+        products = await seed_products(session, 500)
+    await _seed(engine, products, total)
+    queries = {
+        "tienda": {"store_id": STORE_IDS[2], "end_date": date(2025, 3, 31)},
+        "producto": {"product_id": products[7].id, "end_date": date(2025, 3, 31)},
+    }
+    await _measure("bd", session_factory, counter, queries, repeats)
+
+    archive_dir = os.path.join(workdir, "archive")
+    os.makedirs(archive_dir)
+    async with session_factory() as session:
+        report = await expire_movements(session, 2, archive_dir=archive_dir, now=datetime(2026, 1, 15))
+    print(f"archivados={report['archived']:,} borrados={report['deleted']:,}")
+    archive_service.MOVEMENT_ARCHIVE_DIR = archive_dir
+    await _measure("archivo", session_factory, counter, queries, repeats)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [1_000_000, 20][len(args) :])))
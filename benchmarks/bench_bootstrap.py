@@ -0,0 +1,52 @@
+"""
+Benchmark del arranque con una base de datos vacía: esquema creado desde los modelos y marcado en la cabeza
+(`apply_migrations(..., bootstrap=True)`) frente a reproducir toda la cadena de `alembic/versions`.
+
+Uso:
+    python -m benchmarks.bench_bootstrap [repeticiones]
+
+Por defecto usa un SQLite nuevo en un archivo temporal por repetición; la cadena de migraciones solo funciona en
+Postgres, así que la comparación requiere `BENCH_DATABASE_URL` (el esquema `public` se vacía en cada repetición).
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks._common import summarize, timed
+from inventory_management_system.db.migrations import apply_migrations
+
+
+async def _empty_engine():
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url is None:
+        return create_async_engine(f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench_bootstrap.db")
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA public CASCADE"))
+        await conn.execute(text("CREATE SCHEMA public"))
+    return engine
+
+
+async def run(repeats: int) -> None:
+    modes = {"modelos": True}
+    if os.getenv("BENCH_DATABASE_URL"):
+        modes["migraciones"] = False
+    for label, bootstrap in modes.items():
+        samples = []
+        for _ in range(repeats):
+            engine = await _empty_engine()
+            with timed(samples):
+                report = await apply_migrations(engine, bootstrap=bootstrap)
+            await engine.dispose()
+            assert report["bootstrapped"] is bootstrap
+        print(f"{label:>12} {summarize(samples)}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [10][len(args) :])))
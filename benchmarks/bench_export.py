@@ -0,0 +1,136 @@
+"""
+Benchmark de la exportación en streaming del historial de movimientos (`GET /api/movements/export`).
+Mide filas/s y el pico de memoria (RSS) al exportar CSV, NDJSON y CSV con gzip, frente a materializar los
+movimientos como entidades ORM con `scalars().all()` (como hace `get_all_movements`).
+
+Uso:
+    python -m benchmarks.bench_export [movimientos] [movimientos_orm]
+
+Por defecto exporta 5M de movimientos desde un SQLite en un archivo temporal (en memoria la propia BD inflaría el
+RSS) y materializa 500k con el ORM; define `BENCH_DATABASE_URL` para medir contra Postgres.
+"""
+
+import asyncio
+import gc
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.future import select
+
+from benchmarks._common import STORE_IDS, create_engine_and_schema, seed_products
+from inventory_management_system.core.export import ExportFormat, encode_rows, gzip_chunks
+from inventory_management_system.models import Movement
+from inventory_management_system.models.movement import MovementType
+from inventory_management_system.services.export_service import (
+    MOVEMENT_EXPORT_COLUMNS,
+    movements_export_query,
+    stream_rows,
+)
+
+START = datetime(2026, 1, 1)
+SEED_CHUNK = 50000
+
+
+def _rss_mb() -> float:
+    """RSS actual del proceso en MB (Linux)."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+class PeakRss:
+    """Muestrea el RSS en un hilo mientras dura el bloque y guarda el pico por encima del inicial."""
+
+    def __enter__(self) -> "PeakRss":
+        gc.collect()
+        self.baseline = self.peak = _rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self) -> None:
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, _rss_mb())
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_mb())
+
+    @property
+    def growth(self) -> float:
+        return self.peak - self.baseline
+
+
+async def _seed(session, products, total: int) -> None:
+    rng = random.Random(42)
+    for offset in range(0, total, SEED_CHUNK):
+        await session.execute(
+            insert(Movement),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "product_id": rng.choice(products).id,
+                    "source_store_id": rng.choice(STORE_IDS),
+                    "target_store_id": None,
+                    "quantity": rng.randint(1, 5),
+                    "timestamp": START + timedelta(seconds=offset + i),
+                    "type": MovementType.OUT,
+                }
+                for i in range(min(SEED_CHUNK, total - offset))
+            ],
+        )
+        await session.commit()
+
+
+async def _export(engine, file_format: ExportFormat, compress: bool) -> int:
+    body = encode_rows(stream_rows(engine, movements_export_query()), MOVEMENT_EXPORT_COLUMNS, file_format)
+    if compress:
+        body = gzip_chunks(body)
+    size = 0
+    async for chunk in body:
+        size += len(chunk)
+    return size
+
+
+async def run(total: int, orm_total: int) -> None:
+    url = os.getenv("BENCH_DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench_export.db"
+    engine, session_factory = await create_engine_and_schema(url)
+    async with session_factory() as session:
+        products = await seed_products(session, 100)
+        await _seed(session, products, total)
+    print(f"{total:,} movimientos sembrados")
+
+    for file_format, compress in ((ExportFormat.CSV, False), (ExportFormat.NDJSON, False), (ExportFormat.CSV, True)):
+        with PeakRss() as rss:
+            start = time.perf_counter()
+            size = await _export(engine, file_format, compress)
+            elapsed = time.perf_counter() - start
+        label = f"{file_format.value}{'+gzip' if compress else ''}"
+        print(
+            f"export {label:<10} {total / elapsed:>10,.0f} filas/s  {size / 2**20:>8,.0f} MB"
+            f"  pico RSS +{rss.growth:,.0f} MB"
+        )
+
+    async with session_factory() as session:
+        with PeakRss() as rss:
+            start = time.perf_counter()
+            movements = (await session.execute(select(Movement).limit(orm_total))).scalars().all()
+            elapsed = time.perf_counter() - start
+        print(
+            f"ORM scalars().all() ({len(movements):,} filas) {len(movements) / elapsed:>10,.0f} filas/s"
+            f"  pico RSS +{rss.growth:,.0f} MB"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [5_000_000, 500_000][len(args) :])))
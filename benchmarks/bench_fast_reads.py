@@ -0,0 +1,69 @@
+"""
+Benchmark del camino rápido de lectura (`FAST_JSON_READS`): filas como tuplas serializadas con orjson frente a
+entidades ORM validadas por `ProductResponse`/`MovementResponse`, medido en peticiones por segundo a través de la
+app (ASGI, sin red) para páginas de 10, 100 y 1000 productos y de 10 y 100 movimientos (el máximo de la ruta).
+
+Uso:
+    python -m benchmarks.bench_fast_reads [peticiones]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from benchmarks._common import STORE_IDS, create_engine_and_schema, override_app_db, seed_products, summarize, timed
+from inventory_management_system.core import json_rows
+from inventory_management_system.core.ids import uuid7
+from inventory_management_system.models import Movement
+from inventory_management_system.models.movement import MovementType
+
+PAGES = [("/api/products/", 10), ("/api/products/", 100), ("/api/products/", 1000)]
+PAGES += [("/api/movements/", 10), ("/api/movements/", 100)]
+
+
+async def _seed_movements(engine, products: list, count: int) -> None:
+    start = datetime(2026, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(Movement),
+            [
+                {
+                    "id": uuid7(),
+                    "product_id": products[i % len(products)].id,
+                    "target_store_id": STORE_IDS[i % len(STORE_IDS)],
+                    "quantity": 1 + i % 5,
+                    "timestamp": start + timedelta(minutes=i),
+                    "type": MovementType.IN,
+                }
+                for i in range(count)
+            ],
+        )
+
+
+async def run(requests: int) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        products = await seed_products(session, 1000)
+    await _seed_movements(engine, products, 1000)
+    app = override_app_db(session_factory)
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://bench") as client:
+        for url, limit in PAGES:
+            for label, fast in (("ORM + Pydantic", False), ("filas + orjson", True)):
+                json_rows.FAST_JSON_READS = fast
+                samples: list[float] = []
+                start = time.perf_counter()
+                for _ in range(requests):
+                    with timed(samples):
+                        response = await client.get(url, params={"limit": limit})
+                    assert response.status_code == 200 and len(response.json()) == limit
+                rate = requests / (time.perf_counter() - start)
+                print(f"{url:<16} limit={limit:<5} {label:<15} {rate:8.0f} req/s  {summarize(samples)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
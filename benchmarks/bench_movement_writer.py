@@ -0,0 +1,84 @@
+"""
+Benchmark de throughput del registro de movimientos con 1, 10 y 100 escritores concurrentes:
+`create_movement` (una transacción por movimiento) frente a `MovementWriter` (group commit).
+
+Uso:
+    python -m benchmarks.bench_movement_writer [movimientos] [max_batch] [max_delay_ms]
+
+Por defecto usa SQLite en memoria, con una sola conexión: allí las transacciones directas se serializan con un
+lock (como lo haría la BD). Define `BENCH_DATABASE_URL` para medir concurrencia real contra Postgres.
+"""
+
+import asyncio
+import contextlib
+import sys
+import time
+
+from benchmarks._common import STORE_IDS, create_engine_and_schema, seed_products
+from inventory_management_system.models import Inventory
+from inventory_management_system.schemas.movement import MovementCreate, MovementType
+from inventory_management_system.services.movement_service import create_movement
+from inventory_management_system.services.movement_writer import MovementWriter
+
+CONCURRENCY = (1, 10, 100)
+
+
+def _sale(products, i: int) -> MovementCreate:
+    return MovementCreate(
+        product_id=products[i % len(products)].id,
+        source_store_id=STORE_IDS[i % len(STORE_IDS)],
+        quantity=1,
+        type=MovementType.OUT,
+    )
+
+
+async def _direct(session_factory, products, total: int, writers: int, lock) -> float:
+    async def writer(offset: int) -> None:
+        for i in range(offset, total, writers):
+            async with lock, session_factory() as session:
+                await create_movement(_sale(products, i), session)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(offset) for offset in range(writers)))
+    return total / (time.perf_counter() - start)
+
+
+async def _grouped(movement_writer: MovementWriter, products, total: int, writers: int) -> float:
+    async def writer(offset: int) -> None:
+        for i in range(offset, total, writers):
+            await movement_writer.submit(_sale(products, i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(offset) for offset in range(writers)))
+    return total / (time.perf_counter() - start)
+
+
+async def run(total: int, max_batch: int, max_delay_ms: float) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        products = await seed_products(session, 50)
+        session.add_all(
+            Inventory(product_id=product.id, store_id=store_id, quantity=10**9, min_stock=1)
+            for product in products
+            for store_id in STORE_IDS
+        )
+        await session.commit()
+    lock = asyncio.Lock() if engine.dialect.name == "sqlite" else contextlib.nullcontext()
+    for writers in CONCURRENCY:
+        direct = await _direct(session_factory, products, total, writers, lock)
+        movement_writer = MovementWriter(session_factory, max_batch=max_batch, max_delay=max_delay_ms / 1000)
+        movement_writer.start()
+        grouped = await _grouped(movement_writer, products, total, writers)
+        await movement_writer.close()
+        print(
+            f"escritores={writers:<4} directo: {direct:,.0f} mov/s  group commit: {grouped:,.0f} mov/s"
+            f"  ({grouped / direct:.1f}x, {movement_writer.flushed / max(movement_writer.batches, 1):.1f} mov/lote)"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [float(arg) for arg in sys.argv[1:]]
+    defaults = [2000, 500, 0]
+    total, max_batch, max_delay_ms = args + defaults[len(args) :]
+    asyncio.run(run(int(total), int(max_batch), max_delay_ms))
@@ -0,0 +1,72 @@
+"""
+Benchmark de un feed de POS: ventas OUT con `create_movement` una a una frente a `create_movements_batch`.
+Las ventas se concentran en pocos productos para medir el efecto de agrupar las filas repetidas del lote.
+
+Uso:
+    python -m benchmarks.bench_movements_batch [ventas] [tamaño_lote]
+
+Por defecto usa SQLite en memoria; define `BENCH_DATABASE_URL` para medir contra Postgres.
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks._common import STORE_IDS, StatementCounter, create_engine_and_schema, seed_products
+from inventory_management_system.models import Inventory
+from inventory_management_system.schemas.movement import MovementCreate, MovementType
+from inventory_management_system.services.movement_service import create_movement, create_movements_batch
+
+
+def _sales(products, count: int) -> list[MovementCreate]:
+    return [
+        MovementCreate(
+            product_id=products[i % len(products)].id,
+            source_store_id=STORE_IDS[i % len(STORE_IDS)],
+            quantity=1,
+            type=MovementType.OUT,
+        )
+        for i in range(count)
+    ]
+
+
+async def run(total: int, batch_size: int) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        products = await seed_products(session, 20)
+        session.add_all(
+            Inventory(product_id=product.id, store_id=store_id, quantity=10**9, min_stock=1)
+            for product in products
+            for store_id in STORE_IDS
+        )
+        await session.commit()
+    sales = _sales(products, total)
+    counter = StatementCounter(engine)
+
+    start = time.perf_counter()
+    with counter.track():
+        for sale in sales:
+            async with session_factory() as session:
+                await create_movement(sale, session)
+    single = total / (time.perf_counter() - start)
+    single_round_trips = counter.round_trips / total
+
+    start = time.perf_counter()
+    with counter.track():
+        for offset in range(0, total, batch_size):
+            async with session_factory() as session:
+                await create_movements_batch(sales[offset : offset + batch_size], session)
+    batch = total / (time.perf_counter() - start)
+    batch_round_trips = counter.round_trips / total
+
+    print(f"individual: {single:,.0f} movimientos/s  round_trips/movimiento={single_round_trips:.2f}")
+    print(
+        f"lote({batch_size}): {batch:,.0f} movimientos/s  round_trips/movimiento={batch_round_trips:.3f}"
+        f"  ({batch / single:.1f}x)"
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [2000, 500][len(args) :])))
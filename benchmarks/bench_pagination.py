@@ -0,0 +1,80 @@
+"""
+Benchmark de paginación de movimientos: OFFSET frente a cursor (keyset) en la página 1 y en una página profunda.
+
+Uso:
+    python -m benchmarks.bench_pagination [página_profunda] [tamaño_página]
+
+Siembra `página_profunda * tamaño_página` movimientos (por defecto 10.000 x 10 = 100.000).
+"""
+
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.future import select
+
+from benchmarks._common import STORE_IDS, create_engine_and_schema, seed_products, summarize, timed
+from inventory_management_system.core.pagination import encode_cursor
+from inventory_management_system.models import Movement
+from inventory_management_system.models.movement import MovementType
+from inventory_management_system.services.movement_service import get_all_movements, movement_cursor_key
+
+REPETITIONS = 20
+SEED_CHUNK = 10_000
+
+
+async def _seed_movements(session, products, total: int) -> None:
+    start = datetime(2025, 1, 1)
+    for offset in range(0, total, SEED_CHUNK):
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "product_id": products[i % len(products)].id,
+                "source_store_id": None,
+                "target_store_id": STORE_IDS[i % len(STORE_IDS)],
+                "quantity": 1,
+                "timestamp": start + timedelta(seconds=i),
+                "type": MovementType.IN,
+            }
+            for i in range(offset, min(offset + SEED_CHUNK, total))
+        ]
+        await session.execute(insert(Movement), rows)
+    await session.commit()
+
+
+async def run(deep_page: int, page_size: int) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        products = await seed_products(session, 100)
+        await _seed_movements(session, products, deep_page * page_size)
+        # Cursor que apunta al inicio de la página profunda (se calcula una vez, fuera de la medición)
+        last_of_previous = await session.execute(
+            select(Movement)
+            .order_by(Movement.timestamp.desc(), Movement.id.desc())
+            .offset((deep_page - 1) * page_size - 1)
+            .limit(1)
+        )
+        deep_cursor = encode_cursor(*movement_cursor_key(last_of_previous.scalar_one()))
+
+    cases = {
+        "offset página 1": {"skip": 0},
+        f"offset página {deep_page:,}": {"skip": (deep_page - 1) * page_size},
+        "cursor página 1": {},
+        f"cursor página {deep_page:,}": {"cursor": deep_cursor},
+    }
+    for label, kwargs in cases.items():
+        samples: list[float] = []
+        for _ in range(REPETITIONS):
+            async with session_factory() as session:
+                with timed(samples):
+                    page = await get_all_movements(session, limit=page_size, **kwargs)
+            assert len(page) == page_size
+        print(f"{label:<22} {summarize(samples)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [10_000, 10][len(args) :])))
@@ -0,0 +1,93 @@
+"""
+Benchmark del stock total por producto: columna mantenida `products.stock_total` frente a `SUM` por petición.
+
+Uso:
+    python -m benchmarks.bench_product_stock [productos] [tiendas] [tamaño_página]
+
+Por defecto 100.000 productos x 50 tiendas (5M filas de inventario); en SQLite conviene empezar con menos.
+"""
+
+import asyncio
+import sys
+import uuid
+
+from sqlalchemy import func, insert
+from sqlalchemy.future import select
+
+from benchmarks._common import create_engine_and_schema, summarize, timed
+from inventory_management_system.models import Inventory, Product
+from inventory_management_system.services.product_service import check_stock_totals, get_product_by_id, get_products
+
+REPETITIONS = 50
+SEED_CHUNK = 20_000
+
+
+async def _seed(session, products: int, stores: int) -> None:
+    store_ids = [uuid.uuid4() for _ in range(stores)]
+    step = max(1, SEED_CHUNK // stores)
+    for offset in range(0, products, step):
+        product_rows = [
+            {
+                "id": uuid.uuid4(),
+                "name": f"Producto {i:07d}",
+                "description": "Producto de benchmark",
+                "category": f"Categoria {i % 20}",
+                "price": 10.0,
+                "sku": f"SKU-{i:07d}",
+                "stock_total": 10 * stores,
+            }
+            for i in range(offset, min(offset + step, products))
+        ]
+        await session.execute(insert(Product), product_rows)
+        await session.execute(
+            insert(Inventory),
+            [
+                {"id": uuid.uuid4(), "product_id": row["id"], "store_id": store_id, "quantity": 10, "min_stock": 1}
+                for row in product_rows
+                for store_id in store_ids
+            ],
+        )
+    await session.commit()
+
+
+async def _page_with_aggregate(session, page_size: int) -> list:
+    """Alternativa sin columna mantenida: un `SUM` agrupado sobre `inventory` por cada página."""
+    products = (await session.execute(select(Product).order_by(Product.name, Product.id).limit(page_size))).scalars()
+    ids = [product.id for product in products]
+    totals = await session.execute(
+        select(Inventory.product_id, func.sum(Inventory.quantity))
+        .where(Inventory.product_id.in_(ids))
+        .group_by(Inventory.product_id)
+    )
+    return totals.all()
+
+
+async def run(products: int, stores: int, page_size: int) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        await _seed(session, products, stores)
+        product_id = (await session.execute(select(Product.id).limit(1))).scalar_one()
+
+    cases = {
+        f"lista {page_size} (stock_total)": lambda s: get_products(s, limit=page_size),
+        f"lista {page_size} (SUM por página)": lambda s: _page_with_aggregate(s, page_size),
+        "detalle (stock_total)": lambda s: get_product_by_id(s, product_id),
+    }
+    for label, query in cases.items():
+        samples: list[float] = []
+        for _ in range(REPETITIONS):
+            async with session_factory() as session:
+                with timed(samples):
+                    await query(session)
+        print(f"{label:<28} {summarize(samples)}")
+    samples = []
+    async with session_factory() as session:
+        with timed(samples):
+            drift = await check_stock_totals(session)
+    print(f"{'check_stock_totals':<28} {samples[0]:.1f}ms diferencias={len(drift)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [100_000, 50, 100][len(args) :])))
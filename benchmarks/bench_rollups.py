@@ -0,0 +1,112 @@
+"""
+Benchmark de `GET /api/movements/rollups` frente a agregar los movimientos crudos.
+Mide el neto diario de un producto en una tienda durante 30 días: paginando `GET /api/movements/` (100 filas por
+página, como hoy), con un `GROUP BY` sobre `movements` y leyendo `movement_rollups`.
+
+Uso:
+    python -m benchmarks.bench_rollups [movimientos] [iteraciones]
+
+Por defecto usa SQLite en memoria; define `BENCH_DATABASE_URL` para medir contra Postgres.
+"""
+
+import asyncio
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import case, func, insert
+from sqlalchemy.future import select
+
+from benchmarks._common import STORE_IDS, create_engine_and_schema, override_app_db, seed_products, summarize, timed
+from inventory_management_system.models import Movement
+from inventory_management_system.models.movement import MovementType
+from inventory_management_system.services.rollup_service import backfill_rollups, get_movement_rollups
+
+START = datetime(2026, 1, 1)
+DAYS = 90
+
+
+def _movements(products, count: int) -> list[dict]:
+    rng = random.Random(42)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "product_id": rng.choice(products).id,
+            "source_store_id": rng.choice(STORE_IDS),
+            "target_store_id": None,
+            "quantity": rng.randint(1, 5),
+            "timestamp": START + timedelta(seconds=rng.randrange(DAYS * 86400)),
+            "type": MovementType.OUT,
+        }
+        for _ in range(count)
+    ]
+
+
+async def _raw_group_by(session, product_id, store_id, start, end) -> list:
+    day = func.date(Movement.timestamp)
+    signed = case((Movement.type == MovementType.IN, Movement.quantity), else_=-Movement.quantity)
+    query = (
+        select(day, func.sum(signed))
+        .where(
+            (Movement.product_id == product_id)
+            & (Movement.source_store_id == store_id)
+            & (Movement.timestamp >= start)
+            & (Movement.timestamp < end)
+        )
+        .group_by(day)
+        .order_by(day)
+    )
+    return (await session.execute(query)).all()
+
+
+async def _api_paging(client, product_id, store_id) -> int:
+    rows, cursor = 0, None
+    while True:
+        params = {"limit": 100, "product_id": str(product_id), "store_id": str(store_id)}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/movements/", params=params)
+        rows += len(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+
+async def run(total: int, iterations: int) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        products = await seed_products(session, 100)
+        movements = _movements(products, total)
+        for offset in range(0, total, 10000):
+            await session.execute(insert(Movement), movements[offset : offset + 10000])
+        await session.commit()
+        backfill: list[float] = []
+        with timed(backfill):
+            await backfill_rollups(session)
+    print(f"backfill de {total:,} movimientos: {backfill[0]:.0f}ms")
+
+    start, end = START + timedelta(days=30), START + timedelta(days=60)
+    raw, rollups, paging = [], [], []
+    app = override_app_db(session_factory)
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://bench") as client:
+        for i in range(iterations):
+            product_id, store_id = products[i % len(products)].id, STORE_IDS[i % len(STORE_IDS)]
+            async with session_factory() as session:
+                with timed(raw):
+                    await _raw_group_by(session, product_id, store_id, start, end)
+                with timed(rollups):
+                    await get_movement_rollups(session, start=start, end=end, product_id=product_id, store_id=store_id)
+            if i < 10:
+                with timed(paging):
+                    await _api_paging(client, product_id, store_id)
+    print(f"paginando GET /api/movements/ (historial completo): {summarize(paging)}")
+    print(f"GROUP BY sobre movements:                         {summarize(raw)}")
+    print(f"movement_rollups:                                 {summarize(rollups)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [200000, 200][len(args) :])))
@@ -0,0 +1,56 @@
+"""
+Benchmark del reparto de eventos SSE: memoria por conexión inactiva y latencia de fan-out en un worker.
+
+Uso:
+    python -m benchmarks.bench_sse [conexiones]
+
+Crea `conexiones` consumidores de `sse_stream` (por defecto 5.000) repartidos entre 400 tiendas y publica eventos
+para una tienda y para todas; no abre sockets, mide el coste del broker y de los generadores.
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from inventory_management_system.core.events import EventBroker, sse_stream
+
+STORES = 400
+EVENTS = 200
+
+
+async def _consume(broker: EventBroker, store: int, received: list[int]) -> None:
+    async for chunk in sse_stream(broker, broker.subscribe(store), keepalive=60):
+        if chunk.startswith("id:"):
+            received[0] += 1
+
+
+async def run(connections: int) -> None:
+    broker = EventBroker(queue_size=256, history_size=10_000)
+    received = [0]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    consumers = [asyncio.create_task(_consume(broker, i % STORES, received)) for i in range(connections)]
+    await asyncio.sleep(0.1)
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / connections
+    tracemalloc.stop()
+    print(f"conexiones={connections} memoria/conexión={per_connection / 1024:.1f}KiB")
+
+    store_subscribers = len(range(0, connections, STORES))
+    for label, topic, expected in (("una tienda", 0, store_subscribers), ("todas (topic None)", None, connections)):
+        received[0] = 0
+        start = time.perf_counter()
+        for _ in range(EVENTS):
+            broker.publish("stock_changed", topic, {"quantity": 1})
+        while received[0] < expected * EVENTS and not broker.dropped_subscribers:
+            await asyncio.sleep(0)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{label:<20} entregas={received[0]:,} {elapsed / EVENTS:.3f}ms/evento publicado")
+    print(broker.stats())
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,94 @@
+"""
+Benchmark de `transfer_inventory`: round trips y latencia p99 antes y después del motor atómico.
+
+Uso:
+    python -m benchmarks.bench_transfer [iteraciones]
+
+Por defecto usa SQLite en memoria; define `BENCH_DATABASE_URL` para medir contra Postgres.
+"""
+
+import asyncio
+import sys
+
+from sqlalchemy.future import select
+
+from benchmarks._common import STORE_IDS, StatementCounter, create_engine_and_schema, seed_products, summarize, timed
+from inventory_management_system.models import Inventory, Product
+from inventory_management_system.schemas.inventory import InventoryTransferRequest
+from inventory_management_system.schemas.movement import MovementCreate, MovementType
+from inventory_management_system.services.inventory_service import MIN_STOCK, transfer_inventory
+from inventory_management_system.services.movement_service import create_movement
+
+
+async def legacy_transfer(transfer_data: InventoryTransferRequest, db) -> None:
+    """Réplica del flujo anterior: lecturas, varios commits, refresh y movimiento en otra transacción."""
+    await db.execute(select(Product).where(Product.id == transfer_data.product_id))
+    source = (
+        await db.execute(
+            select(Inventory).where(
+                (Inventory.product_id == transfer_data.product_id)
+                & (Inventory.store_id == transfer_data.source_store_id)
+            )
+        )
+    ).scalar_one()
+    target = (
+        await db.execute(
+            select(Inventory).where(
+                (Inventory.product_id == transfer_data.product_id)
+                & (Inventory.store_id == transfer_data.target_store_id)
+            )
+        )
+    ).scalar_one_or_none()
+    if not target:
+        target = Inventory(
+            product_id=transfer_data.product_id, store_id=transfer_data.target_store_id, quantity=0, min_stock=MIN_STOCK
+        )
+        db.add(target)
+        await db.commit()
+    source.quantity -= transfer_data.quantity
+    target.quantity += transfer_data.quantity
+    await db.commit()
+    await db.refresh(source)
+    await db.refresh(target)
+    await create_movement(
+        MovementCreate(
+            product_id=transfer_data.product_id,
+            source_store_id=transfer_data.source_store_id,
+            target_store_id=transfer_data.target_store_id,
+            quantity=transfer_data.quantity,
+            type=MovementType.TRANSFER,
+        ),
+        db,
+    )
+
+
+async def run(iterations: int) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        products = await seed_products(session, 50)
+        session.add_all(
+            Inventory(product_id=product.id, store_id=STORE_IDS[0], quantity=10**9, min_stock=1) for product in products
+        )
+        await session.commit()
+
+    counter = StatementCounter(engine)
+    for label, transfer in (("antes (legacy)", legacy_transfer), ("después (atómico)", transfer_inventory)):
+        samples: list[float] = []
+        round_trips = 0
+        for i in range(iterations):
+            transfer_data = InventoryTransferRequest(
+                product_id=products[i % len(products)].id,
+                source_store_id=STORE_IDS[0],
+                target_store_id=STORE_IDS[1 + i % (len(STORE_IDS) - 1)],
+                quantity=1,
+            )
+            async with session_factory() as session:
+                with counter.track(), timed(samples):
+                    await transfer(transfer_data, session)
+                round_trips += counter.round_trips
+        print(f"{label:<20} round_trips/transfer={round_trips / iterations:.2f} {summarize(samples)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
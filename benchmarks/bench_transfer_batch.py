@@ -0,0 +1,58 @@
+"""
+Benchmark de throughput: `POST /api/inventory/transfer` uno a uno frente a `POST /api/inventory/transfers:batch`.
+
+Uso:
+    python -m benchmarks.bench_transfer_batch [transferencias] [tamaño_lote]
+"""
+
+import asyncio
+import sys
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks._common import STORE_IDS, create_engine_and_schema, override_app_db, seed_products
+from inventory_management_system.models import Inventory
+
+
+def _payloads(products, count: int) -> list[dict]:
+    return [
+        {
+            "product_id": str(products[i % len(products)].id),
+            "source_store_id": str(STORE_IDS[0]),
+            "target_store_id": str(STORE_IDS[1 + i % (len(STORE_IDS) - 1)]),
+            "quantity": 1,
+        }
+        for i in range(count)
+    ]
+
+
+async def run(total: int, batch_size: int) -> None:
+    engine, session_factory = await create_engine_and_schema()
+    async with session_factory() as session:
+        products = await seed_products(session, 200)
+        session.add_all(
+            Inventory(product_id=product.id, store_id=STORE_IDS[0], quantity=10**9, min_stock=1) for product in products
+        )
+        await session.commit()
+    app = override_app_db(session_factory)
+    payloads = _payloads(products, total)
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        for payload in payloads:
+            assert (await client.post("/api/inventory/transfer", json=payload)).status_code == 200
+        single = total / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for offset in range(0, total, batch_size):
+            response = await client.post("/api/inventory/transfers:batch", json=payloads[offset : offset + batch_size])
+            assert response.status_code == 200
+        batch = total / (time.perf_counter() - start)
+    print(f"individual: {single:,.0f} transferencias/s")
+    print(f"lote({batch_size}): {batch:,.0f} transferencias/s  ({batch / single:.1f}x)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [2000, 200][len(args) :])))
@@ -0,0 +1,90 @@
+"""
+Benchmark de claves primarias UUIDv4 (aleatorias) frente a UUIDv7 (ordenadas por tiempo) en `movements`.
+Mide el throughput de inserción en lotes (una transacción por lote, como el registro de movimientos) y el tamaño
+final de la clave primaria y de la tabla.
+
+Uso:
+    python -m benchmarks.bench_uuid7 [movimientos] [lote]
+
+Por defecto usa un SQLite en un archivo temporal (`dbstat` da el tamaño de cada índice); define
+`BENCH_DATABASE_URL` para medir contra Postgres (`pg_relation_size`).
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+
+from benchmarks._common import STORE_IDS, create_engine_and_schema, seed_products
+from inventory_management_system.core.ids import uuid7
+from inventory_management_system.models import Movement
+from inventory_management_system.models.movement import MovementType
+
+START = datetime(2026, 1, 1)
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+async def _relation_sizes(conn) -> dict[str, int]:
+    """Bytes ocupados por `movements` y su clave primaria."""
+    if conn.dialect.name == "sqlite":
+        rows = await conn.execute(
+            text(
+                "SELECT s.name, SUM(d.pgsize) FROM dbstat AS d JOIN sqlite_schema AS s ON s.name = d.name"
+                " WHERE s.tbl_name = 'movements' GROUP BY s.name"
+            )
+        )
+        sizes = dict(rows.all())
+        primary_key = next(name for name in sizes if name.startswith("sqlite_autoindex_movements"))
+        return {"tabla": sizes["movements"], "clave primaria": sizes[primary_key]}
+    table = await conn.scalar(text("SELECT pg_relation_size('movements')"))
+    primary_key = await conn.scalar(text("SELECT pg_relation_size('movements_pkey')"))
+    return {"tabla": table, "clave primaria": primary_key}
+
+
+async def _insert(name: str, total: int, batch_size: int) -> None:
+    url = os.getenv("BENCH_DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench_{name}.db"
+    engine, session_factory = await create_engine_and_schema(url)
+    async with session_factory() as session:
+        products = await seed_products(session, 100)
+    new_id = GENERATORS[name]
+    start = time.perf_counter()
+    for offset in range(0, total, batch_size):
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(Movement),
+                [
+                    {
+                        "id": new_id(),
+                        "product_id": products[i % len(products)].id,
+                        "source_store_id": STORE_IDS[i % len(STORE_IDS)],
+                        "target_store_id": None,
+                        "quantity": 1,
+                        "timestamp": START + timedelta(seconds=i),
+                        "type": MovementType.OUT,
+                    }
+                    for i in range(offset, min(offset + batch_size, total))
+                ],
+            )
+    elapsed = time.perf_counter() - start
+    async with engine.connect() as conn:
+        sizes = await _relation_sizes(conn)
+    print(
+        f"{name}: {total / elapsed:>9,.0f} inserciones/s  "
+        + "  ".join(f"{label}={size / 2**20:,.1f} MB" for label, size in sizes.items())
+    )
+    await engine.dispose()
+
+
+async def run(total: int, batch_size: int) -> None:
+    for name in GENERATORS:
+        await _insert(name, total, batch_size)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(run(*(args + [500_000, 1000][len(args) :])))
@@ -0,0 +1,68 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from inventory_management_system.core.settings import settings
+from inventory_management_system.db.database import engine, get_db, pool_status, read_replicas
+from inventory_management_system.schemas.inventory import InventoryReconciliationReport
+from inventory_management_system.services.alert_service import inventory_events
+from inventory_management_system.services.movement_writer import movement_writer
+from inventory_management_system.services.product_service import get_product_cache_stats
+from inventory_management_system.services.reconciliation_service import reconcile_inventory
+from inventory_management_system.services.store_service import validate_store_ids
+
+router = APIRouter(tags=["Admin"])
+
+
+@router.get("/cache/products")
+async def get_product_cache_stats_route():
+    """Devuelve los contadores de la caché de productos del worker que atiende la petición."""
+    return get_product_cache_stats()
+
+
+@router.get("/events")
+async def get_inventory_events_stats_route():
+    """Devuelve suscriptores SSE, eventos publicados y suscriptores descartados por lentos en este worker."""
+    return inventory_events.stats()
+
+
+@router.get("/movements/writer")
+async def get_movement_writer_stats_route():
+    """Devuelve el estado de la escritura agrupada de movimientos (lotes confirmados y movimientos pendientes)."""
+    return movement_writer.stats()
+
+
+@router.get("/db/replicas")
+async def get_read_replicas_route():
+    """Devuelve las réplicas de lectura configuradas y si están sanas o excluidas (y durante cuánto) en este worker."""
+    return read_replicas.status()
+
+
+@router.get("/db/pool")
+async def get_db_pool_route():
+    """
+    Devuelve el perfil del motor (`APP_PROFILE`) y la ocupación de los pools de conexiones de este worker: conexiones
+    en uso (`checkedout`), libres (`checkedin`) y de desbordamiento (`overflow`, negativo mientras no se llena el pool).
+    """
+    return {
+        "profile": settings.database.profile,
+        "primary": pool_status(engine),
+        "replicas": [pool_status(session_factory.kw["bind"]) for session_factory in read_replicas.session_factories],
+    }
+
+
+@router.post("/inventory/reconcile", response_model=InventoryReconciliationReport)
+async def reconcile_inventory_route(
+    fix: bool = False, store_id: Optional[UUID] = None, db: AsyncSession = Depends(get_db)
+):
+    """
+    Concilia `inventory` con el historial de movimientos (todas las tiendas o `store_id`) y devuelve las diferencias;
+    con `fix=true` registra movimientos de ajuste que las explican.
+    """
+    if store_id:
+        await validate_store_ids((store_id,), db)
+    await db.close()
+    session_factory = async_sessionmaker(bind=db.bind, class_=AsyncSession, expire_on_commit=False)
+    return await reconcile_inventory(session_factory, [store_id] if store_id else None, fix=fix)
@@ -1,24 +1,46 @@
+from datetime import datetime, timezone
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from inventory_management_system.db.database import get_db
+from inventory_management_system.core.config import EVENTS_KEEPALIVE_SECONDS
+from inventory_management_system.core.events import sse_stream
+from inventory_management_system.core.export import ExportFormat, export_response
+from inventory_management_system.core.json_rows import fast_json_reads, row_json_response
+from inventory_management_system.core.pagination import set_next_cursor
+from inventory_management_system.db.database import get_db, get_read_db
 from inventory_management_system.schemas.inventory import (
+    InventoryAsOfResponse,
     InventoryCreate,
     InventoryResponse,
     InventoryTransferRequest,
+    InventoryTransferResult,
     InventoryUpdate,
 )
+from inventory_management_system.services.alert_service import get_low_stock_alerts_version, inventory_events
+from inventory_management_system.services.export_service import (
+    INVENTORY_EXPORT_COLUMNS,
+    store_inventory_export_query,
+    stream_rows,
+)
 from inventory_management_system.services.inventory_service import (
+    MAX_BATCH_TRANSFERS,
     create_inventory,
     delete_inventory,
     get_inventory_by_id,
     get_inventory_by_store,
     get_low_stock_alerts,
+    inventory_cursor_key,
+    low_stock_alert_cursor_key,
     transfer_inventory,
+    transfer_inventory_batch,
     update_inventory,
 )
+from inventory_management_system.services.snapshot_service import get_stock_as_of
+from inventory_management_system.services.store_service import validate_store_ids
 
 router = APIRouter(tags=["Inventory"])
 
@@ -31,10 +53,31 @@ async def create_inventory_route(inventory_data: InventoryCreate, db: AsyncSessi
 
 @router.get("/stores/{store_id}/inventory", response_model=list[InventoryResponse])
 async def get_inventory_by_store_route(
-    store_id: UUID, db: AsyncSession = Depends(get_db), limit: int = 100, offset: int = 0
+    store_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    limit: int = 100,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+):
+    """Obtiene la lista de inventarios de una tienda con paginación (cursor en la cabecera `X-Next-Cursor`)."""
+    items = await get_inventory_by_store(store_id, db, limit, offset, cursor)
+    set_next_cursor(response, items, limit, inventory_cursor_key)
+    return items
+
+
+@router.get("/stores/{store_id}/inventory/export")
+async def export_store_inventory_route(
+    store_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    file_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv o ndjson"),
 ):
-    """Obtiene la lista de inventarios de una tienda con paginación."""
-    return await get_inventory_by_store(store_id, db, limit, offset)
+    """Exporta el inventario completo de una tienda como CSV o NDJSON en streaming (gzip con `Accept-Encoding`)."""
+    await validate_store_ids((store_id,), db)
+    await db.close()
+    query = store_inventory_export_query(store_id)
+    return export_response(request, stream_rows(db.bind, query), INVENTORY_EXPORT_COLUMNS, file_format, "inventory")
 
 
 @router.post("/inventory/transfer", status_code=200)
@@ -43,15 +86,84 @@ async def transfer_inventory_route(transfer_data: InventoryTransferRequest, db:
     return await transfer_inventory(transfer_data, db)
 
 
+@router.post("/inventory/transfers:batch", response_model=list[InventoryTransferResult], status_code=200)
+async def transfer_inventory_batch_route(
+    transfers: list[InventoryTransferRequest] = Body(..., min_length=1, max_length=MAX_BATCH_TRANSFERS),
+    db: AsyncSession = Depends(get_db),
+):
+    """Aplica un lote de transferencias en una sola transacción y devuelve el resultado de cada una."""
+    return await transfer_inventory_batch(transfers, db)
+
+
 @router.get("/inventory/alerts")
-async def get_low_stock_alerts_route(db: AsyncSession = Depends(get_db)):
-    """Obtiene productos con stock bajo."""
-    return await get_low_stock_alerts(db)
+async def get_low_stock_alerts_route(
+    request: Request,
+    response: Response,
+    store_id: Optional[UUID] = None,
+    category: Optional[str] = None,
+    limit: Optional[int] = Query(None, gt=0),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Obtiene productos con stock bajo.
+    - Devuelve `ETag` con la versión del conjunto de alertas (de la tienda, con `store_id`); con `If-None-Match` igual
+      responde 304 sin leerlas.
+    - La versión se lee antes que las alertas: si cambian entre ambas lecturas, el siguiente sondeo las vuelve a pedir.
+    """
+    etag = f'"{await get_low_stock_alerts_version(db, store_id)}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    alerts = await get_low_stock_alerts(db, store_id, category, limit, cursor)
+    set_next_cursor(response, alerts, limit, low_stock_alert_cursor_key)
+    return alerts
+
+
+@router.get("/inventory/alerts/stream")
+async def stream_inventory_events_route(
+    request: Request,
+    store_id: Optional[UUID] = None,
+    last_event_id: Optional[str] = Query(None, description="Token de reanudación (alternativa a `Last-Event-ID`)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Flujo Server-Sent Events con `stock_changed`, `alert_raised` y `alert_cleared` (opcionalmente de una tienda).
+    - Cada evento lleva `id`; al reconectar con `Last-Event-ID` se reenvían los eventos perdidos o, si ya no
+      están disponibles, un evento `reset` para recargar `GET /api/inventory/alerts`.
+    - Los eventos son los del worker que atiende la conexión.
+    """
+    if store_id:
+        await validate_store_ids((store_id,), db)
+    # 🔹 La conexión puede durar horas: se libera la sesión para no retener una conexión del pool
+    await db.close()
+    subscription = inventory_events.subscribe(store_id, request.headers.get("last-event-id") or last_event_id)
+    return StreamingResponse(
+        sse_stream(inventory_events, subscription, EVENTS_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/inventory/as-of", response_model=InventoryAsOfResponse)
+async def get_stock_as_of_route(
+    at: datetime = Query(..., description="Fecha y hora a consultar (sin zona horaria se asume UTC)"),
+    product_id: Optional[UUID] = None,
+    store_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Reconstruye el stock en una fecha pasada desde la copia de inventario anterior más los movimientos."""
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    snapshot_at, items = await get_stock_as_of(db, at, product_id, store_id)
+    return {"as_of": at, "snapshot_at": snapshot_at, "items": items}
 
 
 @router.get("/inventory/item/{inventory_id}", response_model=InventoryResponse)
-async def get_inventory__by_id_route(inventory_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_inventory__by_id_route(inventory_id: UUID, db: AsyncSession = Depends(get_read_db)):
     """Obtiene un inventario por ID."""
+    if fast_json_reads():
+        return row_json_response(InventoryResponse, await get_inventory_by_id(inventory_id, db, as_rows=True))
     return await get_inventory_by_id(inventory_id, db)
 
 
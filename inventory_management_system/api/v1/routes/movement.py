@@ -1,28 +1,68 @@
-from datetime import date
+from datetime import date, datetime, timezone
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from inventory_management_system.db.database import get_db
+from inventory_management_system.core.export import ExportFormat, export_response
+from inventory_management_system.core.json_rows import fast_json_reads, row_json_response, rows_json_response
+from inventory_management_system.core.pagination import set_next_cursor
+from inventory_management_system.db.database import get_db, get_read_db
 from inventory_management_system.models.movement import MovementType
-from inventory_management_system.schemas.movement import MovementCreate, MovementResponse
-from inventory_management_system.services.movement_service import create_movement, get_all_movements, get_movement_by_id
+from inventory_management_system.schemas.movement import (
+    MovementCreate,
+    MovementResponse,
+    MovementResult,
+    MovementRollupResponse,
+)
+from inventory_management_system.services.export_service import (
+    MOVEMENT_EXPORT_COLUMNS,
+    movements_export_query,
+    stream_rows,
+)
+from inventory_management_system.services.movement_service import (
+    MAX_BATCH_MOVEMENTS,
+    create_movement,
+    create_movements_batch,
+    get_all_movements,
+    get_movement_by_id,
+    movement_cursor_key,
+)
+from inventory_management_system.services.movement_writer import movement_writer
+from inventory_management_system.services.rollup_service import (
+    RollupGranularity,
+    get_movement_rollups,
+    rollup_cursor_key,
+)
 
 router = APIRouter(tags=["Movements"])
 
 
 @router.post("/", response_model=MovementResponse, status_code=201)
 async def create_movement_route(movement_data: MovementCreate, db: AsyncSession = Depends(get_db)):
-    """Crea un nuevo movimiento de inventario."""
-    print(f"Recibido en la API: {type(movement_data)}")  # 🔍 Debug
+    """
+    Registra un movimiento de inventario y lo aplica al stock de las tiendas afectadas.
+    Con `MOVEMENT_WRITER_ENABLED` se confirma en lote junto con otros movimientos concurrentes (group commit).
+    """
+    if movement_writer.running:
+        return await movement_writer.submit(movement_data)
     return await create_movement(movement_data, db)
 
 
+@router.post("/batch", response_model=list[MovementResult], status_code=200)
+async def create_movements_batch_route(
+    movements: list[MovementCreate] = Body(..., min_length=1, max_length=MAX_BATCH_MOVEMENTS),
+    db: AsyncSession = Depends(get_db),
+):
+    """Aplica un lote de movimientos en una sola transacción y devuelve el resultado de cada uno."""
+    return await create_movements_batch(movements, db)
+
+
 @router.get("/", response_model=List[MovementResponse])
 async def get_all_movements_route(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, alias="offset", ge=0, description="Número de movimientos a omitir"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de movimientos a devolver"),
     product_id: Optional[UUID] = Query(None, description="Filtrar por ID del producto"),
@@ -30,15 +70,88 @@ async def get_all_movements_route(
         None, description="Filtrar por tipo de movimiento (IN, OUT, TRANSFER)"
     ),
     date: Optional[date] = Query(None, description="Filtrar por fecha del movimiento"),
+    end_date: Optional[date] = Query(None, description="Hasta esta fecha (incluida)"),
     store_id: Optional[UUID] = Query(None, description="Filtrar por ID de la tienda"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor)"),
 ):
     """Obtiene todos los movimientos de inventario con paginación y filtros."""
-    return await get_all_movements(
-        db, skip=skip, limit=limit, product_id=product_id, movement_type=movement_type, date=date, store_id=store_id
+    fast = fast_json_reads()
+    movements = await get_all_movements(
+        db,
+        skip=skip,
+        limit=limit,
+        product_id=product_id,
+        movement_type=movement_type,
+        date=date,
+        store_id=store_id,
+        cursor=cursor,
+        end_date=end_date,
+        as_rows=fast,
     )
+    if fast:
+        fast_response = rows_json_response(MovementResponse, movements)
+        set_next_cursor(fast_response, movements, limit, movement_cursor_key)
+        return fast_response
+    set_next_cursor(response, movements, limit, movement_cursor_key)
+    return movements
+
+
+@router.get("/rollups", response_model=List[MovementRollupResponse])
+async def get_movement_rollups_route(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    granularity: RollupGranularity = Query(RollupGranularity.DAY, description="Agregados por hora o por día"),
+    start: Optional[datetime] = Query(None, description="Desde (incluido, UTC)"),
+    end: Optional[datetime] = Query(None, description="Hasta (excluido, UTC)"),
+    product_id: Optional[UUID] = Query(None, description="Filtrar por ID del producto"),
+    store_id: Optional[UUID] = Query(None, description="Filtrar por ID de la tienda"),
+    limit: int = Query(1000, ge=1, le=10000, description="Número máximo de agregados a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor)"),
+):
+    """Devuelve los movimientos agregados por producto y tienda (IN, OUT, transferencias y neto) por hora o día."""
+    rollups = await get_movement_rollups(
+        db,
+        granularity=granularity,
+        start=_naive_utc(start),
+        end=_naive_utc(end),
+        product_id=product_id,
+        store_id=store_id,
+        limit=limit,
+        cursor=cursor,
+    )
+    set_next_cursor(response, rollups, limit, rollup_cursor_key)
+    return rollups
+
+
+@router.get("/export")
+async def export_movements_route(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    file_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv o ndjson"),
+    product_id: Optional[UUID] = Query(None, description="Filtrar por ID del producto"),
+    store_id: Optional[UUID] = Query(None, description="Filtrar por tienda de origen o destino"),
+    movement_type: Optional[MovementType] = Query(None, description="Filtrar por tipo de movimiento"),
+    start: Optional[datetime] = Query(None, description="Desde (incluido, UTC)"),
+    end: Optional[datetime] = Query(None, description="Hasta (excluido, UTC)"),
+):
+    """
+    Exporta el historial de movimientos en orden cronológico como CSV o NDJSON, en streaming y sin límite de filas
+    (cursor de servidor, memoria constante); con `Accept-Encoding: gzip` la respuesta va comprimida.
+    """
+    query = movements_export_query(product_id, store_id, movement_type, _naive_utc(start), _naive_utc(end))
+    return export_response(request, stream_rows(db.bind, query), MOVEMENT_EXPORT_COLUMNS, file_format, "movements")
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Los movimientos se guardan en UTC sin zona horaria."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 @router.get("/{movement_id}", response_model=MovementResponse)
-async def get_movement_by_id_route(movement_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_movement_by_id_route(movement_id: UUID, db: AsyncSession = Depends(get_read_db)):
     """Obtiene un movimiento de inventario por su ID."""
+    if fast_json_reads():
+        return row_json_response(MovementResponse, await get_movement_by_id(db, movement_id, as_rows=True))
     return await get_movement_by_id(db, movement_id)
@@ -1,16 +1,25 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from inventory_management_system.db.database import get_db
-from inventory_management_system.schemas.product import ProductCreate, ProductResponse, ProductUpdate
+from inventory_management_system.core.json_rows import fast_json_reads, rows_json_response
+from inventory_management_system.core.pagination import set_next_cursor
+from inventory_management_system.db.database import get_db, get_read_db
+from inventory_management_system.schemas.product import (
+    ProductCreate,
+    ProductImportSummary,
+    ProductResponse,
+    ProductUpdate,
+)
+from inventory_management_system.services.product_import_service import import_products, iter_lines
 from inventory_management_system.services.product_service import (
     create_product,
     delete_product,
     get_product_by_id,
     get_products,
+    product_cursor_key,
     update_product,
 )
 
@@ -20,19 +29,46 @@ router = APIRouter(tags=["Products"])
 # Obtener todos los productos con filtros y paginación (ASYNC)
 @router.get("/", response_model=List[ProductResponse])
 async def get_products_route(
+    response: Response,
     category: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await get_products(db, category, min_price, max_price, skip, limit)
+    fast = fast_json_reads()
+    products = await get_products(db, category, min_price, max_price, skip, limit, cursor, as_rows=fast)
+    if fast:
+        fast_response = rows_json_response(ProductResponse, products)
+        set_next_cursor(fast_response, products, limit, product_cursor_key)
+        return fast_response
+    set_next_cursor(response, products, limit, product_cursor_key)
+    return products
+
+
+# Importación masiva de productos desde NDJSON o CSV (ASYNC, en streaming)
+@router.post("/import", response_model=ProductImportSummary)
+async def import_products_route(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Importa productos leyendo el cuerpo de la petición en streaming.
+    - `Content-Type: text/csv` para CSV con encabezado (name, description, category, price, sku).
+    - `Content-Type: application/x-ndjson` (o `application/json`) para un objeto JSON por línea.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        file_format = "csv"
+    elif "json" in content_type:
+        file_format = "ndjson"
+    else:
+        raise HTTPException(status_code=415, detail="Formato no soportado. Usa text/csv o application/x-ndjson")
+    return await import_products(iter_lines(request.stream()), file_format, db)
 
 
 # Obtener detalle de un producto (ASYNC)
 @router.get("/{product_id}", response_model=ProductResponse)
-async def get_product_by_id_route(product_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_product_by_id_route(product_id: UUID, db: AsyncSession = Depends(get_read_db)):
     return await get_product_by_id(db, product_id)
 
 
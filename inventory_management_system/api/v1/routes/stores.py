@@ -0,0 +1,42 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.db.database import get_db
+from inventory_management_system.schemas.store import StoreCreate, StoreResponse, StoreUpdate
+from inventory_management_system.services.store_service import (
+    create_store,
+    delete_store,
+    get_store_by_id,
+    get_stores,
+    update_store,
+)
+
+router = APIRouter(tags=["Stores"])
+
+
+@router.get("/", response_model=list[StoreResponse])
+async def get_stores_route(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    return await get_stores(db, skip, limit)
+
+
+@router.get("/{store_id}", response_model=StoreResponse)
+async def get_store_route(store_id: UUID, db: AsyncSession = Depends(get_db)):
+    return await get_store_by_id(db, store_id)
+
+
+@router.post("/", response_model=StoreResponse, status_code=201)
+async def create_store_route(store_data: StoreCreate, db: AsyncSession = Depends(get_db)):
+    """Registra una tienda; queda disponible para inventario y transferencias inmediatamente."""
+    return await create_store(db, store_data)
+
+
+@router.put("/{store_id}", response_model=StoreResponse)
+async def update_store_route(store_id: UUID, store_data: StoreUpdate, db: AsyncSession = Depends(get_db)):
+    return await update_store(db, store_id, store_data)
+
+
+@router.delete("/{store_id}")
+async def delete_store_route(store_id: UUID, db: AsyncSession = Depends(get_db)):
+    return await delete_store(db, store_id)
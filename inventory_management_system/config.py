@@ -1,7 +0,0 @@
-VALID_STORE_IDS = {
-    "9cd61e1f-f9be-4045-b67d-2cd0ffde014f",
-    "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-    "f7c9e59e-a757-4375-b1c9-167b0a90a6e4",
-    "51814955-e9d0-47fc-9c3a-5ea8459b42f0",
-    "b5d5b3f1-8d2e-4ef6-94e5-d5f8c5b8a9b4",
-}
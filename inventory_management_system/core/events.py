@@ -0,0 +1,162 @@
+import asyncio
+import json
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, AsyncIterator, Hashable, Optional
+
+RESET_EVENT = "reset"
+SSE_RETRY_MS = 3000  # Espera sugerida al cliente antes de reconectar
+
+
+@dataclass(frozen=True)
+class Event:
+    """Evento publicado en un `EventBroker`; `id` es el token de reanudación (`<época>-<secuencia>`)."""
+
+    id: str
+    type: str
+    topic: Optional[Hashable]
+    data: dict
+
+    @cached_property
+    def sse(self) -> str:
+        """Evento en formato Server-Sent Events (se serializa una vez para todos los suscriptores)."""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+class Subscription:
+    """Suscripción con cola acotada; `get()` devuelve `None` cuando el broker la descartó por lenta."""
+
+    def __init__(self, topic: Optional[Hashable], maxsize: int) -> None:
+        self.topic = topic
+        self.dropped = False
+        self._queue: asyncio.Queue[Optional[Event]] = asyncio.Queue(maxsize=maxsize)
+
+    def matches(self, event: Event) -> bool:
+        return self.topic is None or event.topic is None or event.topic == self.topic
+
+    def offer(self, event: Event) -> bool:
+        """Encola el evento sin esperar; devuelve `False` si la cola está llena."""
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def drop(self) -> None:
+        """Vacía la cola y deja solo la marca de fin (`None`) para que el consumidor se desconecte."""
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Siguiente evento; lanza `asyncio.TimeoutError` si no llega ninguno en `timeout` segundos."""
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class EventBroker:
+    """
+    Pub/sub en memoria del proceso con reparto a suscriptores filtrados por `topic`.
+    - Cada suscriptor tiene una cola acotada; si se llena, se le descarta (no se bloquea a los publicadores ni se
+      acumula memoria) y debe reconectarse con su último `id`.
+    - Se guardan los últimos `history_size` eventos para reanudar desde un token; si el token es de otra época
+      (reinicio del proceso) o ya no está en el historial, se envía un evento `reset` para que el cliente recargue.
+    - Los eventos solo llegan a los suscriptores del mismo worker.
+    """
+
+    def __init__(self, queue_size: int, history_size: int) -> None:
+        self.queue_size = queue_size
+        self.epoch = uuid.uuid4().hex[:8]
+        self._sequence = 0
+        self._history: deque[Event] = deque(maxlen=history_size)
+        # 🔹 Suscriptores por topic (`None` = todos los topics): publicar solo recorre los interesados
+        self._subscribers: dict[Optional[Hashable], set[Subscription]] = defaultdict(set)
+        self.published = self.dropped_subscribers = 0
+
+    def publish(self, event_type: str, topic: Optional[Hashable], data: dict) -> Event:
+        """Publica un evento para los suscriptores de `topic` (o de todos los topics) sin esperar a ninguno."""
+        self._sequence += 1
+        event = Event(f"{self.epoch}-{self._sequence}", event_type, topic, data)
+        self._history.append(event)
+        self.published += 1
+        if topic is None:
+            targets = set().union(*self._subscribers.values())
+        else:
+            targets = self._subscribers.get(topic, set()) | self._subscribers.get(None, set())
+        for subscription in list(targets):
+            if not subscription.offer(event):
+                self._drop(subscription)
+        return event
+
+    def subscribe(self, topic: Optional[Hashable] = None, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Registra un suscriptor y, si trae token de reanudación, le reenvía los eventos posteriores. Si esos eventos
+        no caben en su cola recibe solo un `reset` (recarga completa) y sigue suscrito: descartarlo haría que el
+        cliente reconectara con el mismo token una y otra vez.
+        """
+        subscription = Subscription(topic, self.queue_size)
+        if last_event_id:
+            backlog = [event for event in self._replay(last_event_id) if subscription.matches(event)]
+            for event in backlog if len(backlog) <= self.queue_size else [self._reset_event()]:
+                subscription.offer(event)
+        self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "published": self.published,
+            "dropped_subscribers": self.dropped_subscribers,
+            "history": len(self._history),
+            "last_event_id": f"{self.epoch}-{self._sequence}",
+        }
+
+    def _replay(self, last_event_id: str) -> list[Event]:
+        epoch, _, sequence = last_event_id.partition("-")
+        oldest = int(self._history[0].id.partition("-")[2]) if self._history else self._sequence + 1
+        if epoch != self.epoch or not sequence.isdigit() or int(sequence) < oldest - 1:
+            return [self._reset_event()]
+        return [event for event in self._history if int(event.id.partition("-")[2]) > int(sequence)]
+
+    def _reset_event(self) -> Event:
+        """Evento que indica al cliente que perdió eventos y debe recargar el estado completo."""
+        return Event(f"{self.epoch}-{self._sequence}", RESET_EVENT, None, {})
+
+    def _drop(self, subscription: Subscription) -> None:
+        self.unsubscribe(subscription)
+        subscription.drop()
+        self.dropped_subscribers += 1
+
+
+async def sse_stream(broker: EventBroker, subscription: Subscription, keepalive: float) -> AsyncIterator[str]:
+    """
+    Genera el cuerpo `text/event-stream` de una suscripción.
+    - Envía un comentario de keep-alive si no hay eventos en `keepalive` segundos (proxies y balanceadores).
+    - Termina si el broker descarta la suscripción; el cliente reconecta con `Last-Event-ID` y se reanuda.
+    - Al desconectarse el cliente (cancelación del generador) la suscripción se elimina.
+    """
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                break
+            yield event.sse
+    finally:
+        broker.unsubscribe(subscription)
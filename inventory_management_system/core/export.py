@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+EXPORT_MEDIA_TYPES = {ExportFormat.CSV: "text/csv; charset=utf-8", ExportFormat.NDJSON: "application/x-ndjson"}
+
+
+def _plain(value: Any) -> Any:
+    """Valor exportable: fechas en ISO 8601, enums por su valor y el resto (UUID, números) tal cual o con `str`."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    plain = _plain(value)
+    return str(plain) if plain is value else plain
+
+
+async def encode_rows(
+    chunks: AsyncIterator[Sequence[Sequence[Any]]], columns: Sequence[str], file_format: ExportFormat
+) -> AsyncIterator[bytes]:
+    """
+    Serializa bloques de filas (tuplas en el orden de `columns`) a CSV con cabecera o NDJSON.
+    Produce un fragmento de bytes por bloque: la memoria depende del tamaño del bloque, no del total de filas.
+    """
+    if file_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        async for rows in chunks:
+            writer.writerows([_plain(value) for value in row] for row in rows)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+        return
+    async for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default, separators=(",", ":")) + "\n" for row in rows
+        ).encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Comprime en gzip un flujo de bytes fragmento a fragmento."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(
+    request: Request,
+    chunks: AsyncIterator[Sequence[Sequence[Any]]],
+    columns: Sequence[str],
+    file_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Respuesta en streaming de una exportación; se comprime con gzip si el cliente lo acepta (`Accept-Encoding`).
+    """
+    body = encode_rows(chunks, columns, file_format)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{file_format.value}"',
+        "Vary": "Accept-Encoding",
+    }
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=EXPORT_MEDIA_TYPES[file_format], headers=headers)
@@ -0,0 +1,40 @@
+import os
+import threading
+import time
+import uuid
+from typing import Callable
+
+from inventory_management_system.core.config import UUID7_TABLES
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+_COUNTER_MAX = 0xFFF
+
+
+def uuid7() -> uuid.UUID:
+    """
+    UUID versión 7 (RFC 9562): 48 bits de milisegundos Unix seguidos de bits aleatorios.
+    Los IDs generados en un proceso son crecientes: dentro del mismo milisegundo, los 12 bits `rand_a` son un
+    contador (con inicio aleatorio) y, si se agota, se avanza al milisegundo siguiente.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF  # Mitad inferior: margen para incrementar
+        elif _counter < _COUNTER_MAX:
+            _counter += 1
+        else:
+            _last_ms += 1
+            _counter = 0
+        timestamp_ms, counter = _last_ms, _counter
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFFFFFFFFFFFFFF
+    value = (timestamp_ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+    return uuid.UUID(int=value)
+
+
+def id_generator(table_name: str) -> Callable[[], uuid.UUID]:
+    """Generador de claves primarias de una tabla: UUIDv7 si está en `UUID7_TABLES`, UUIDv4 si no."""
+    return uuid7 if table_name in UUID7_TABLES else uuid.uuid4
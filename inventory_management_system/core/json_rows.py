@@ -0,0 +1,40 @@
+"""
+Lectura rápida de endpoints calientes (`FAST_JSON_READS`): las consultas seleccionan solo las columnas del esquema
+de respuesta como tuplas y se serializan directamente a bytes JSON con orjson, sin entidades ORM (ni su registro
+en la identity map) ni la validación de Pydantic de `response_model`. El JSON es el mismo que el de la ruta normal.
+"""
+
+from typing import Any, Sequence, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from inventory_management_system.core.config import FAST_JSON_READS
+
+
+def fast_json_reads() -> bool:
+    """Indica si las rutas de lectura usan el camino rápido (`FAST_JSON_READS`)."""
+    return FAST_JSON_READS
+
+
+def response_columns(model: Any, schema: Type[BaseModel]) -> list:
+    """Columnas de `model` con los campos de `schema`, en su orden y con su nombre (incluidos los sinónimos)."""
+    return [getattr(model, name).label(name) for name in schema.model_fields]
+
+
+class RowsJSONResponse(Response):
+    """Respuesta con el cuerpo JSON ya serializado por `rows_json_response`."""
+
+    media_type = "application/json"
+
+
+def rows_json_response(schema: Type[BaseModel], rows: Sequence[Sequence[Any]]) -> RowsJSONResponse:
+    """Lista JSON de objetos con los campos de `schema` a partir de filas en ese orden (UUID, fechas y enums)."""
+    fields = tuple(schema.model_fields)
+    return RowsJSONResponse(orjson.dumps([dict(zip(fields, row)) for row in rows]))
+
+
+def row_json_response(schema: Type[BaseModel], row: Sequence[Any]) -> RowsJSONResponse:
+    """Objeto JSON con los campos de `schema` a partir de una fila en ese orden."""
+    return RowsJSONResponse(orjson.dumps(dict(zip(schema.model_fields, row))))
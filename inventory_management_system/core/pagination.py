@@ -0,0 +1,50 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import bindparam, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Codifica los valores de la clave de orden de la última fila en un cursor opaco (base64 URL-safe)."""
+    payload = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *converters: Callable[[Any], Any]) -> tuple:
+    """
+    Decodifica un cursor generado por `encode_cursor`.
+    - `converters` convierte cada valor a su tipo (por ejemplo `UUID` o `datetime.fromisoformat`).
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(converters):
+            raise ValueError(cursor)
+        return tuple(convert(value) for convert, value in zip(converters, values))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación inválido.")
+
+
+def after_cursor(columns: Sequence[Any], values: Sequence[Any], descending: bool = False) -> Any:
+    """
+    Condición keyset `(col1, col2) > (v1, v2)` (o `<` si el orden es descendente).
+    Postgres y SQLite la resuelven como comparación de filas sobre el índice compuesto.
+    Los valores se enlazan con el tipo de su columna (`tuple_` no lo propaga) para que se serialicen igual
+    que los datos almacenados.
+    """
+    bound = tuple_(*(bindparam(None, value, type_=column.type) for column, value in zip(columns, values)))
+    if descending:
+        return tuple_(*columns) < bound
+    return tuple_(*columns) > bound
+
+
+def set_next_cursor(
+    response: Response, items: Sequence[Any], limit: Optional[int], key: Callable[[Any], tuple]
+) -> None:
+    """Añade la cabecera `X-Next-Cursor` si la página vino completa (puede haber más resultados)."""
+    if limit and len(items) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(items[-1]))
@@ -0,0 +1,30 @@
+"""
+Reconstruye los agregados de movimientos (`movement_rollups`) desde el historial `movements`.
+
+Uso:
+    python -m inventory_management_system.db.backfill_rollups [--since YYYY-MM-DD] [--chunk-size N]
+
+Sin `--since` reconstruye todo el historial que sigue en `movements`: los agregados de los meses ya retirados por
+`db.partition_movements` se conservan.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from inventory_management_system.db.database import maintenance_sessionmaker
+from inventory_management_system.services.rollup_service import BACKFILL_CHUNK_SIZE, backfill_rollups
+
+
+async def main(since: datetime | None, chunk_size: int) -> None:
+    async with maintenance_sessionmaker()() as session:
+        total = await backfill_rollups(session, since=since, chunk_size=chunk_size)
+    print(f"{total} movimientos agregados" + (f" desde {since:%Y-%m-%d}" if since else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstruye movement_rollups desde movements.")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE, help="Movimientos por bloque")
+    args = parser.parse_args()
+    asyncio.run(main(args.since, args.chunk_size))
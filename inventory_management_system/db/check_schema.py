@@ -0,0 +1,30 @@
+"""
+Verifica que el esquema de la base de datos coincida con los modelos (`Base.metadata`).
+Tras `alembic upgrade head` comprueba que una base migrada y una creada desde los modelos al arrancar
+(`BOOTSTRAP_EMPTY_DATABASE`) tienen el mismo esquema.
+
+Uso:
+    python -m inventory_management_system.db.check_schema
+
+Termina con código 1 si encuentra diferencias.
+"""
+
+import asyncio
+import sys
+
+from inventory_management_system.db.database import engine
+from inventory_management_system.db.migrations import schema_differences
+
+
+async def main() -> int:
+    async with engine.connect() as conn:
+        differences = await conn.run_sync(schema_differences)
+    await engine.dispose()
+    for difference in differences:
+        print(difference)
+    print(f"{len(differences)} diferencias entre la base de datos y los modelos")
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
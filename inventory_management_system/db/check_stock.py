@@ -0,0 +1,27 @@
+"""
+Verifica que `products.stock_total` coincida con la suma de `inventory.quantity` de cada producto.
+
+Uso:
+    python -m inventory_management_system.db.check_stock [--fix]
+
+Termina con código 1 si encuentra diferencias y no se pidió `--fix`.
+"""
+
+import asyncio
+import sys
+
+from inventory_management_system.db.database import maintenance_sessionmaker
+from inventory_management_system.services.product_service import check_stock_totals
+
+
+async def main(fix: bool) -> int:
+    async with maintenance_sessionmaker()() as session:
+        drift = await check_stock_totals(session, fix=fix)
+    for row in drift:
+        print(f"{row['product_id']}: stock_total={row['stock_total']} esperado={row['expected']}")
+    print(f"{len(drift)} productos con diferencias" + (" (corregidos)" if fix and drift else ""))
+    return 1 if drift and not fix else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main("--fix" in sys.argv)))
@@ -1,18 +1,192 @@
-import os
+import logging
+import time
+from typing import Any, Callable, Optional, Sequence
 
-from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends, Request
+from sqlalchemy import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
+from inventory_management_system.core.config import (
+    DATABASE_REPLICA_URLS,
+    DATABASE_URL,
+    REPLICA_RETRY_SECONDS,
+    REPLICA_STICKY_SECONDS,
+)
+from inventory_management_system.core.settings import DatabaseSettings, settings
 from inventory_management_system.models import Base
 
-# Cargar variables de entorno
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
+# 🔹 Las migraciones, los comandos de mantenimiento y las exportaciones recorren tablas completas, esperan bloqueos o
+#    al cliente: no se les aplican los límites de sesión del perfil (en `prod`, 30 s por sentencia)
+UNLIMITED_SESSION = {"statement_timeout_ms": 0, "idle_in_transaction_timeout_ms": 0}
+
+
+def engine_options(url: str, database: DatabaseSettings = settings.database) -> dict[str, Any]:
+    """
+    Argumentos de `create_async_engine` según el perfil (`APP_PROFILE`) y las variables `DB_*`.
+    - El tamaño del pool, `pool_timeout` y `pool_recycle` solo se aplican a pools con cola (no a SQLite en memoria).
+    - Con asyncpg fija la caché de sentencias preparadas y los parámetros de sesión (`server_settings`).
+    """
+    options: dict[str, Any] = {"echo": database.echo, "pool_pre_ping": database.pool_pre_ping}
+    backend = make_url(url)
+    if backend.get_backend_name() != "sqlite" or backend.database not in (None, "", ":memory:"):
+        options.update(
+            pool_size=database.pool_size,
+            max_overflow=database.max_overflow,
+            pool_timeout=database.pool_timeout,
+            pool_recycle=database.pool_recycle,
+        )
+    if backend.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": database.statement_cache_size,
+            "prepared_statement_cache_size": database.statement_cache_size,
+            "server_settings": database.server_settings,
+        }
+    return options
+
+
+def maintenance_engine_options(url: str, database: DatabaseSettings = settings.database) -> dict[str, Any]:
+    """`engine_options` sin `statement_timeout` ni `idle_in_transaction_session_timeout` (ver `UNLIMITED_SESSION`)."""
+    return engine_options(url, database.model_copy(update=UNLIMITED_SESSION))
+
+
+def maintenance_sessionmaker(url: str = DATABASE_URL) -> async_sessionmaker:
+    """Sesiones de los comandos de mantenimiento (`db/*.py`), sobre un motor propio sin límites de sesión."""
+    return async_sessionmaker(
+        bind=create_async_engine(url, **maintenance_engine_options(url)), class_=AsyncSession, expire_on_commit=False
+    )
+
+
+async def disable_statement_timeouts(connection: AsyncConnection) -> None:
+    """Quita los límites de sesión (`UNLIMITED_SESSION`) durante la transacción en curso (`SET LOCAL`, Postgres)."""
+    if connection.dialect.name == "postgresql":
+        await connection.exec_driver_sql("SET LOCAL statement_timeout = 0")
+        await connection.exec_driver_sql("SET LOCAL idle_in_transaction_session_timeout = 0")
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    """Ocupación del pool de un motor: conexiones abiertas, en uso, libres y de desbordamiento."""
+    pool = engine.sync_engine.pool
+    status: dict[str, Any] = {"url": engine.url.render_as_string(hide_password=True), "pool": type(pool).__name__}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        if hasattr(pool, name):
+            status[name] = getattr(pool, name)()
+    if hasattr(pool, "timeout"):
+        status["timeout"] = pool.timeout()
+    return status
+
 
 # Crear el motor de base de datos asíncrono
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+READ_PRIMARY_COOKIE = "read_primary"
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReplicaPool:
+    """
+    Réplicas de lectura con turno rotatorio entre las sanas.
+    - Una réplica que falla al conectar se excluye durante `retry_seconds` y la lectura pasa a la siguiente.
+    - `pool_pre_ping` comprueba cada conexión al tomarla del pool: una réplica caída se detecta antes de usarla.
+    """
+
+    def __init__(
+        self,
+        session_factories: Sequence[async_sessionmaker],
+        retry_seconds: float = REPLICA_RETRY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.session_factories = list(session_factories)
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._down_until = [0.0] * len(self.session_factories)
+        self._next = 0
+
+    @classmethod
+    def from_urls(cls, urls: Sequence[str]) -> "ReplicaPool":
+        return cls(
+            [
+                async_sessionmaker(
+                    bind=create_async_engine(url, **{**engine_options(url), "pool_pre_ping": True}),
+                    class_=AsyncSession,
+                    expire_on_commit=False,
+                )
+                for url in urls
+            ]
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.session_factories)
+
+    def _candidates(self) -> list[int]:
+        """Índices de las réplicas sanas empezando por la que toca en el turno (y avanza el turno)."""
+        count = len(self.session_factories)
+        start, self._next = self._next, (self._next + 1) % count
+        now = self._clock()
+        return [index % count for index in range(start, start + count) if self._down_until[index % count] <= now]
+
+    async def connect(self) -> Optional[AsyncSession]:
+        """Sesión conectada a la siguiente réplica sana, o `None` si no responde ninguna."""
+        for index in self._candidates():
+            session = self.session_factories[index](info={"replica": True})
+            try:
+                await session.connection()
+            except (OSError, SQLAlchemyError):
+                await session.close()
+                self._down_until[index] = self._clock() + self.retry_seconds
+                logging.warning(f"⚠️ Réplica {index} no disponible; se reintenta en {self.retry_seconds:.0f}s")
+                continue
+            return session
+        return None
+
+    def status(self) -> list[dict]:
+        now = self._clock()
+        return [
+            {
+                "replica": index,
+                "healthy": self._down_until[index] <= now,
+                "retry_in": max(self._down_until[index] - now, 0.0),
+                **pool_status(session_factory.kw["bind"]),
+            }
+            for index, session_factory in enumerate(self.session_factories)
+        ]
+
+
+# 🔹 Vacío si no hay `DATABASE_REPLICA_URLS`: todas las lecturas van al primario
+read_replicas = ReplicaPool.from_urls(DATABASE_REPLICA_URLS)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Tras una escritura correcta (método distinto de GET/HEAD/OPTIONS, estado < 400) envía la cookie
+    `READ_PRIMARY_COOKIE` con una vigencia de `REPLICA_STICKY_SECONDS`: mientras la conserve, `get_read_db` atiende
+    las lecturas de ese cliente desde el primario y ve sus propios cambios aunque las réplicas vayan con retraso.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] in _SAFE_METHODS or not read_replicas.enabled:
+            await self.app(scope, receive, send)
+            return
+        cookie = f"{READ_PRIMARY_COOKIE}=1; Max-Age={REPLICA_STICKY_SECONDS}; Path=/; HttpOnly; SameSite=Lax"
+
+        async def send_with_cookie(message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
 
 # Crear las tablas en la base de datos (solo para pruebas, usa Alembic en producción)
 async def init_db():
@@ -24,3 +198,19 @@ async def init_db():
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Sesión para rutas de solo lectura: una réplica (si hay y alguna responde) o, si no, la sesión del primario de
+    `get_db` (que no se conecta si no se usa). Los clientes con la cookie `READ_PRIMARY_COOKIE` (escribieron hace
+    poco) leen siempre del primario.
+    """
+    session = None
+    if read_replicas.enabled and READ_PRIMARY_COOKIE not in request.cookies:
+        session = await read_replicas.connect()
+    if session is None:
+        yield db
+        return
+    async with session:
+        yield session
@@ -0,0 +1,29 @@
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def get_dialect_name(db: AsyncSession) -> str:
+    """Devuelve el nombre del dialecto de la sesión ('postgresql', 'sqlite', ...)."""
+    return db.get_bind().dialect.name
+
+
+def is_postgres(db: AsyncSession) -> bool:
+    """Indica si la sesión está conectada a Postgres (bloqueos de fila, COPY, particiones...)."""
+    return get_dialect_name(db) == "postgresql"
+
+
+def is_replica(db: AsyncSession) -> bool:
+    """Indica si la sesión lee de una réplica (`get_read_db`): sus datos pueden ir con retraso respecto al primario."""
+    return bool(db.info.get("replica"))
+
+
+def dialect_insert(db: AsyncSession, table: Any) -> Any:
+    """
+    Construye un `INSERT` del dialecto activo para poder usar `ON CONFLICT`.
+    - Postgres y SQLite comparten la misma API (`on_conflict_do_update` / `on_conflict_do_nothing`).
+    """
+    if is_postgres(db):
+        return postgresql.insert(table)
+    return sqlite.insert(table)
@@ -1,12 +1,198 @@
+"""
+Migraciones de Alembic dentro del proceso de la API, al arrancar (`main.lifespan`).
+- Camino rápido: compara la revisión de `alembic_version` con la cabeza de `alembic/versions`, obtenida leyendo
+  `revision`/`down_revision` de cada archivo sin importar los scripts; si coinciden no se carga Alembic.
+- Si hay que migrar, un solo worker lo hace: en Postgres con un advisory lock de sesión y en SQLite con un bloqueo
+  de archivo (`<base>.migrations.lock`). Los demás esperan, vuelven a comprobar la revisión y no repiten nada.
+  La espera y la migración no tienen los límites de sesión del perfil (`disable_statement_timeouts`).
+- Una base vacía (sin tablas ni revisión) no reproduce la cadena de migraciones: se crea el esquema actual desde
+  `Base.metadata` en una transacción, con las tiendas iniciales, y se marca la cabeza (`BOOTSTRAP_EMPTY_DATABASE`).
+  `schema_differences` (y `python -m inventory_management_system.db.check_schema`) comprueba que el esquema
+  coincide con los modelos.
+"""
+
+import asyncio
+import fcntl
 import logging
-import subprocess
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import Column, MetaData, PrimaryKeyConstraint, String, Table, inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from inventory_management_system.core.config import BOOTSTRAP_EMPTY_DATABASE, MOVEMENT_PARTITIONS_AHEAD
+from inventory_management_system.db.database import disable_statement_timeouts
+from inventory_management_system.models import Base, Store
+from inventory_management_system.services.partition_service import add_months, month_start, partition_name
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+# 🔹 Clave del advisory lock de Postgres, común a todos los workers de la aplicación
+MIGRATIONS_LOCK_ID = 4_201_113_370
+
+# 🔹 Misma definición que la tabla de versiones que crea Alembic
+ALEMBIC_VERSION = Table(
+    "alembic_version",
+    MetaData(),
+    Column("version_num", String(32), nullable=False),
+    PrimaryKeyConstraint("version_num", name="alembic_version_pkc"),
+)
+# 🔹 Revisión que siembra las tiendas iniciales: el bootstrap inserta las mismas filas que su `upgrade()`
+STORES_SEED_REVISION = "d4a9b2c7e815"
+# 🔹 Particiones de `movements` (y las separadas al retirarlas): existen en la BD pero no en los modelos
+_PARTITION_TABLE = re.compile(r"^movements_(p\d{4}_\d{2}|default)$")
+
+_REVISION = re.compile(r"^revision\b[^=]*=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\b[^=]*=(.*)$", re.MULTILINE)
+
+
+def script_heads(versions_dir: Path = ALEMBIC_DIR / "versions") -> set[str]:
+    """Revisiones de `versions_dir` que ninguna otra tiene como `down_revision` (sin ejecutar los scripts)."""
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION.search(source)
+        if down_revision:
+            parents.update(re.findall(r"['\"](\w+)['\"]", down_revision.group(1)))
+    return revisions - parents
+
+
+def _current_heads(connection) -> set[str]:
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def _is_empty(connection) -> bool:
+    return not inspect(connection).get_table_names()
+
+
+def initial_store_rows() -> list[dict]:
+    """Tiendas que siembra la migración `STORES_SEED_REVISION` (leídas de su script, única fuente de los datos)."""
+    script = ScriptDirectory(str(ALEMBIC_DIR)).get_revision(STORES_SEED_REVISION)
+    return script.module.initial_store_rows()
+
+
+def _bootstrap(connection, heads: set[str]) -> None:
+    """
+    Crea el esquema actual desde los modelos y marca `heads` en `alembic_version`, en la transacción en curso.
+    - En Postgres crea además la partición por defecto de `movements` y las del mes actual y los siguientes.
+    - Inserta las mismas tiendas iniciales que la cadena de migraciones: una base creada así y una migrada
+      tienen los mismos datos de partida.
+    """
+    Base.metadata.create_all(connection)
+    connection.execute(Store.__table__.insert(), initial_store_rows())
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("CREATE TABLE movements_default PARTITION OF movements DEFAULT"))
+        current = month_start(datetime.now(timezone.utc).replace(tzinfo=None))
+        for month in (add_months(current, offset) for offset in range(MOVEMENT_PARTITIONS_AHEAD + 1)):
+            connection.execute(
+                text(
+                    f"CREATE TABLE {partition_name(month)} PARTITION OF movements"
+                    f" FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+                )
+            )
+    ALEMBIC_VERSION.create(connection)
+    connection.execute(ALEMBIC_VERSION.insert(), [{"version_num": head} for head in sorted(heads)])
+
+
+def _include_name(name: Optional[str], type_: str, parent_names: dict) -> bool:
+    return not (type_ == "table" and name and _PARTITION_TABLE.match(name))
+
+
+def schema_differences(connection) -> list:
+    """
+    Diferencias entre el esquema de la base y `Base.metadata` (tablas, columnas, tipos, índices y restricciones
+    únicas y de clave foránea), como las ve `alembic revision --autogenerate`; vacío si coinciden. Se ignoran las
+    particiones de `movements`.
+    """
+    # 🔹 SQLite no conserva los tipos declarados (un UUID se refleja como NUMERIC): ahí no se comparan
+    compare_type = connection.dialect.name != "sqlite"
+    context = MigrationContext.configure(connection, opts={"compare_type": compare_type, "include_name": _include_name})
+    return compare_metadata(context, Base.metadata)
+
+
+def _upgrade(connection) -> None:
+    """Ejecuta `alembic upgrade head` sobre la conexión dada (`env.py` la toma de `config.attributes`)."""
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+@asynccontextmanager
+async def _migration_lock(connection: AsyncConnection) -> AsyncIterator[None]:
+    """Bloqueo exclusivo entre workers mientras se migra: advisory lock en Postgres, archivo en SQLite."""
+    url = connection.engine.url
+    if url.get_backend_name() == "postgresql":
+        await disable_statement_timeouts(connection)  # 🔹 La espera por el bloqueo puede durar toda una migración
+        await connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATIONS_LOCK_ID})
+        await connection.commit()
+        try:
+            yield
+        finally:
+            await connection.rollback()  # 🔹 Si la migración falló, la transacción abortada impide liberar el bloqueo
+            await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATIONS_LOCK_ID})
+            await connection.commit()
+    elif url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+        with open(f"{url.database}.migrations.lock", "w") as lock_file:
+            await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    else:
+        yield
 
 
-def apply_migrations():
-    """Ejecuta las migraciones de Alembic de manera sincrónica."""
-    try:
-        logging.info("⏳ Ejecutando migraciones con Alembic...")
-        subprocess.run(["alembic", "upgrade", "head"], check=True)
-        logging.info("✅ Migraciones aplicadas correctamente.")
-    except subprocess.CalledProcessError as e:
-        logging.error(f"⚠️ Error al ejecutar las migraciones: {e}")
+async def apply_migrations(
+    engine: AsyncEngine, heads: Optional[set[str]] = None, bootstrap: bool = BOOTSTRAP_EMPTY_DATABASE
+) -> dict:
+    """
+    Lleva la base de datos a la última revisión y devuelve `{"from", "to", "applied", "bootstrapped", "seconds"}`.
+    `heads` son las revisiones esperadas (por defecto, `script_heads()`); con `bootstrap`, una base vacía se crea
+    desde los modelos en lugar de migrarse. Un error al migrar se propaga.
+    """
+    started = time.perf_counter()
+    heads = script_heads() if heads is None else heads
+    async with engine.connect() as connection:
+        current = await connection.run_sync(_current_heads)
+        await connection.commit()
+        applied = bootstrapped = False
+        if current != heads:
+            async with _migration_lock(connection):
+                # 🔹 Otro worker pudo migrar mientras se esperaba el bloqueo
+                current = await connection.run_sync(_current_heads)
+                await connection.commit()
+                if current != heads:
+                    await disable_statement_timeouts(connection)
+                    bootstrapped = bootstrap and not current and await connection.run_sync(_is_empty)
+                    if bootstrapped:
+                        logging.info(
+                            f"⏳ Base de datos vacía: creando el esquema desde los modelos ({sorted(heads)})..."
+                        )
+                        await connection.run_sync(_bootstrap, heads)
+                    else:
+                        logging.info(
+                            f"⏳ Migrando la base de datos de {sorted(current) or 'vacía'} a {sorted(heads)}..."
+                        )
+                        await connection.run_sync(_upgrade)
+                    await connection.commit()
+                    applied = True
+    return {
+        "from": sorted(current),
+        "to": sorted(heads),
+        "applied": applied,
+        "bootstrapped": bootstrapped,
+        "seconds": time.perf_counter() - started,
+    }
@@ -0,0 +1,53 @@
+"""
+Mantenimiento de las particiones mensuales de `movements` (Postgres), para programarlo con cron.
+
+Uso:
+    python -m inventory_management_system.db.partition_movements [--ahead N] [--retention-months N] [--drop]
+        [--archive-dir DIR]
+
+Crea las particiones de los próximos `--ahead` meses y, con `--retention-months`, retira los meses anteriores:
+guarda su saldo en `movement_balances`, los copia a archivos Parquet por mes y tienda si hay `--archive-dir`
+(por defecto `MOVEMENT_ARCHIVE_DIR`) y separa las particiones (quedan como tablas de archivo) o, con `--drop`,
+las elimina. En SQLite solo borra los movimientos expirados.
+"""
+
+import argparse
+import asyncio
+
+from inventory_management_system.core.config import (
+    MOVEMENT_ARCHIVE_DIR,
+    MOVEMENT_PARTITIONS_AHEAD,
+    MOVEMENT_RETENTION_MONTHS,
+)
+from inventory_management_system.db.database import maintenance_sessionmaker
+from inventory_management_system.services.partition_service import ensure_movement_partitions, expire_movements
+
+
+async def main(ahead: int, retention_months: int, drop: bool, archive_dir: str) -> None:
+    async with maintenance_sessionmaker()() as session:
+        created = await ensure_movement_partitions(session, ahead)
+        print(f"Particiones creadas: {', '.join(created) or 'ninguna'}")
+        if retention_months > 0:
+            report = await expire_movements(session, retention_months, drop=drop, archive_dir=archive_dir)
+            action = "eliminadas" if drop else "separadas"
+            print(
+                f"Corte {report['cutoff']:%Y-%m-%d}: {report['balances']} saldos guardados,"
+                f" {report['archived']} movimientos archivados,"
+                f" particiones {action}: {', '.join(report['partitions']) or 'ninguna'},"
+                f" {report['deleted']} movimientos borrados"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crea y retira particiones mensuales de movements.")
+    parser.add_argument("--ahead", type=int, default=MOVEMENT_PARTITIONS_AHEAD, help="Meses a crear por adelantado")
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=MOVEMENT_RETENTION_MONTHS,
+        help="Meses completos de historial a conservar (0: todos)",
+    )
+    parser.add_argument("--drop", action="store_true", help="Eliminar las particiones expiradas en lugar de separarlas")
+    parser.add_argument("--archive-dir", default=MOVEMENT_ARCHIVE_DIR, help="Directorio del archivo Parquet")
+    args = parser.parse_args()
+    asyncio.run(main(args.ahead, args.retention_months, args.drop, args.archive_dir))
@@ -0,0 +1,37 @@
+"""
+Concilia `inventory` con el stock que implica el historial de movimientos, tienda por tienda.
+
+Uso:
+    python -m inventory_management_system.db.reconcile_inventory [--store ID ...] [--workers N] [--fix]
+
+Con `--fix` registra un movimiento de ajuste (IN/OUT) por cada diferencia; sin él termina con código 1 si las hay.
+"""
+
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+
+from inventory_management_system.db.database import maintenance_sessionmaker
+from inventory_management_system.services.reconciliation_service import RECONCILE_CONCURRENCY, reconcile_inventory
+
+
+async def main(store_ids: list[UUID] | None, workers: int, fix: bool) -> int:
+    report = await reconcile_inventory(maintenance_sessionmaker(), store_ids, fix=fix, concurrency=workers)
+    for row in report["items"]:
+        print(
+            f"{row['store_id']} {row['product_id']}: inventario={row['actual']} historial={row['expected']}"
+            f" diferencia={row['drift']:+d}"
+        )
+    drift = report["items"]
+    print(f"{report['stores']} tiendas, {len(drift)} diferencias" + (" (ajustadas)" if fix and drift else ""))
+    return 1 if drift and not fix else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concilia inventory con el historial de movimientos.")
+    parser.add_argument("--store", type=UUID, action="append", help="Tienda a conciliar (por defecto, todas)")
+    parser.add_argument("--workers", type=int, default=RECONCILE_CONCURRENCY, help="Tiendas en paralelo")
+    parser.add_argument("--fix", action="store_true", help="Registrar movimientos de ajuste")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.store, args.workers, args.fix)))
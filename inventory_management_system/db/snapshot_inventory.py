@@ -0,0 +1,29 @@
+"""
+Toma una copia de `inventory` en `inventory_snapshots` y borra las anteriores a las `--keep` más recientes (para
+programarla con cron; el proceso de la API solo las toma con `INVENTORY_SNAPSHOT_INTERVAL_HOURS`).
+
+Uso:
+    python -m inventory_management_system.db.snapshot_inventory [--keep N]
+"""
+
+import argparse
+import asyncio
+
+from inventory_management_system.core.config import INVENTORY_SNAPSHOT_RETENTION
+from inventory_management_system.db.database import maintenance_sessionmaker
+from inventory_management_system.services.snapshot_service import take_inventory_snapshot
+
+
+async def main(keep: int) -> None:
+    async with maintenance_sessionmaker()() as session:
+        taken_at = await take_inventory_snapshot(session, keep)
+    print(f"Copia de inventario tomada: {taken_at:%Y-%m-%d %H:%M:%S}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Toma una copia de inventory en inventory_snapshots.")
+    parser.add_argument(
+        "--keep", type=int, default=INVENTORY_SNAPSHOT_RETENTION, help="Copias más recientes a conservar"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.keep))
@@ -0,0 +1,32 @@
+"""
+Escrituras de una fila con `RETURNING` (Postgres y SQLite ≥ 3.35): la fila creada o modificada vuelve en la misma
+sentencia como entidad de la sesión, con los valores por defecto y de servidor ya cargados. Sustituyen a
+`db.add()` / `setattr()` seguidos de `commit()` y `refresh()`, que cuesta un `SELECT` más por escritura.
+"""
+
+from typing import Any, Mapping, Optional, TypeVar
+
+from sqlalchemy import ColumnElement, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+Model = TypeVar("Model")
+
+
+async def insert_returning(db: AsyncSession, model: type[Model], values: Mapping[str, Any]) -> Model:
+    """`INSERT ... RETURNING` de una fila de `model`, sin commit; devuelve la entidad creada."""
+    return await db.scalar(insert(model).values(**values).returning(model))
+
+
+async def update_returning(
+    db: AsyncSession, model: type[Model], where: ColumnElement[bool], values: Mapping[str, Any]
+) -> Optional[Model]:
+    """
+    `UPDATE ... RETURNING` de la fila de `model` que cumple `where`, sin commit; devuelve la entidad actualizada
+    (si ya estaba cargada en la sesión, la misma instancia con los valores nuevos) o `None` si no existe.
+    Sin `values` no escribe nada y solo lee la fila.
+    """
+    if not values:
+        return await db.scalar(select(model).where(where))
+    stmt = update(model).where(where).values(**values).returning(model)
+    return await db.scalar(stmt.execution_options(populate_existing=True))
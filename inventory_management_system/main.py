@@ -1,27 +1,74 @@
 import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
 from typing import AsyncGenerator
 
 import uvicorn
 from fastapi import FastAPI
 
-from inventory_management_system.api.v1.routes import inventory, movement, products
+from inventory_management_system.api.v1.routes import admin, inventory, movement, products, stores
+from inventory_management_system.core.config import (
+    INVENTORY_SNAPSHOT_INTERVAL_HOURS,
+    MIGRATE_ON_STARTUP,
+    MOVEMENT_WRITER_ENABLED,
+)
+from inventory_management_system.db.database import AsyncSessionLocal, ReadYourWritesMiddleware, engine
 from inventory_management_system.db.migrations import apply_migrations
+from inventory_management_system.services.movement_writer import movement_writer
+from inventory_management_system.services.snapshot_service import run_snapshot_scheduler
+from inventory_management_system.services.store_service import store_registry
 
-app = FastAPI(title="Inventory Management System", version="1.0.0")
-app.include_router(products.router, prefix="/api/products")
-app.include_router(inventory.router, prefix="/api")
-app.include_router(movement.router, prefix="/api/movements")
 
+@asynccontextmanager
+async def background_tasks_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """
+    Arranca las tareas de fondo habilitadas: escritura agrupada de movimientos y copias periódicas de inventario.
+    Al cerrar, confirma los movimientos pendientes y detiene las copias.
+    """
+    if MOVEMENT_WRITER_ENABLED:
+        movement_writer.start()
+    snapshots = None
+    if INVENTORY_SNAPSHOT_INTERVAL_HOURS > 0:
+        interval = timedelta(hours=INVENTORY_SNAPSHOT_INTERVAL_HOURS)
+        snapshots = asyncio.create_task(run_snapshot_scheduler(AsyncSessionLocal, interval))
+    try:
+        yield
+    finally:
+        if snapshots:
+            snapshots.cancel()
+        await movement_writer.close()
 
+
+@asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Manejador de ciclo de vida para aplicar migraciones al iniciar la API."""
-    logging.info("⏳ Aplicando migraciones de Alembic...")
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, apply_migrations)
-    logging.info("✅ Migraciones aplicadas correctamente.")
-    yield  # Aquí se ejecuta la aplicación
-    logging.info("🛑 Cerrando la aplicación...")
+    """
+    Manejador de ciclo de vida: aplica las migraciones (`MIGRATE_ON_STARTUP`), carga el registro de tiendas, arranca
+    las tareas de fondo e informa del tiempo de arranque. Un error al migrar detiene el arranque.
+    """
+    started = time.perf_counter()
+    if MIGRATE_ON_STARTUP:
+        report = await apply_migrations(engine)
+        action = "ya al día"
+        if report["applied"]:
+            action = "omitidas: esquema creado desde los modelos" if report["bootstrapped"] else "aplicadas"
+        logging.info(f"✅ Migraciones {action} ({', '.join(report['to'])}) en {report['seconds'] * 1000:.0f} ms")
+    async with AsyncSessionLocal(bind=engine) as session:
+        await store_registry.load(session)
+    async with background_tasks_lifespan(app):
+        logging.info(f"🚀 API lista en {(time.perf_counter() - started) * 1000:.0f} ms")
+        yield  # Aquí se ejecuta la aplicación
+        logging.info("🛑 Cerrando la aplicación...")
+
+
+app = FastAPI(title="Inventory Management System", version="1.0.0", lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware)
+app.include_router(products.router, prefix="/api/products")
+app.include_router(inventory.router, prefix="/api")
+app.include_router(movement.router, prefix="/api/movements")
+app.include_router(stores.router, prefix="/api/stores")
+app.include_router(admin.router, prefix="/api/admin")
 
 
 @app.get("/")
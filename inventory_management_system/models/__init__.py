@@ -7,9 +7,23 @@ class Base(DeclarativeBase):
 
 
 # Importar todos los modelos para que Alembic los detecte
+from .alert import LowStockAlertVersion
 from .inventory import Inventory
 from .movement import Movement
 from .product import Product
+from .rollup import MovementRollup
+from .snapshot import InventorySnapshot, MovementBalance
+from .store import Store
 
 # Opcionalmente, puedes exponer `Base` en el namespace del módulo
-__all__ = ["Base", "Product", "Inventory", "Movement"]
+__all__ = [
+    "Base",
+    "Product",
+    "Inventory",
+    "Movement",
+    "Store",
+    "LowStockAlertVersion",
+    "MovementRollup",
+    "InventorySnapshot",
+    "MovementBalance",
+]
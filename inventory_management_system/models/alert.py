@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column
+from sqlalchemy.dialects.postgresql import UUID
+
+from inventory_management_system.models import Base
+
+
+class LowStockAlertVersion(Base):
+    """
+    Versión del conjunto de alertas de stock bajo de cada tienda (una fila por `store_id`).
+    Los servicios incrementan la de la tienda en la misma transacción que cualquier escritura que añada, quite o
+    modifique una fila con `quantity <= min_stock`; `GET /api/inventory/alerts` la usa como `ETag`. Con una fila por
+    tienda, las escrituras de tiendas distintas no se esperan entre sí.
+    """
+
+    __tablename__ = "low_stock_alert_versions"
+
+    store_id = Column(UUID(as_uuid=True), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,18 +1,19 @@
-import uuid
-
-from sqlalchemy import CheckConstraint, Column, ForeignKey, Integer
+from sqlalchemy import CheckConstraint, Column, ForeignKey, Index, Integer, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
+from inventory_management_system.core.ids import id_generator
 from inventory_management_system.models import Base
 
 
 class Inventory(Base):
     __tablename__ = "inventory"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), index=True, nullable=False)
-    store_id = Column(UUID(as_uuid=True), index=True, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=id_generator("inventory"))
+    # 🔹 Sin índices propios: `product_id` es prefijo de `uq_inventory_product_store` y `store_id`, de
+    #    `ix_inventory_store_product`
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    store_id = Column(UUID(as_uuid=True), nullable=False)
     quantity = Column(Integer, nullable=False)
     min_stock = Column(Integer, nullable=False)
 
@@ -22,4 +23,16 @@ class Inventory(Base):
     __table_args__ = (
         CheckConstraint("quantity >= 0", name="check_quantity_positive"),
         CheckConstraint("min_stock >= 0", name="check_min_stock_positive"),
+        # 🔹 Un producto solo puede tener un registro por tienda (necesario para el upsert de transferencias)
+        UniqueConstraint("product_id", "store_id", name="uq_inventory_product_store"),
+        # 🔹 Clave de la paginación por cursor de `get_inventory_by_store`
+        Index("ix_inventory_store_product", "store_id", "product_id"),
+        # 🔹 Índice parcial con solo las filas en alerta de stock bajo (`get_low_stock_alerts`)
+        Index(
+            "ix_inventory_low_stock",
+            "store_id",
+            "product_id",
+            postgresql_where=text("quantity <= min_stock"),
+            sqlite_where=text("quantity <= min_stock"),
+        ),
     )
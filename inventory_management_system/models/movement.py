@@ -1,12 +1,14 @@
 import enum
-import uuid
+from datetime import datetime, timezone
 
-from sqlalchemy import CheckConstraint, Column, DateTime, Enum, ForeignKey, Integer
+from sqlalchemy import CheckConstraint, Column, Enum, ForeignKey, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
+from inventory_management_system.core.ids import id_generator
 from inventory_management_system.models import Base
+from inventory_management_system.models.types import Timestamp
 
 
 class MovementType(str, enum.Enum):
@@ -15,20 +17,39 @@ class MovementType(str, enum.Enum):
     TRANSFER = "TRANSFER"
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Movement(Base):
+    """
+    Historial de movimientos. En Postgres la tabla está particionada por mes sobre `timestamp` (ver
+    `services/partition_service.py`), por lo que la clave primaria incluye `timestamp`; en SQLite es una sola tabla.
+    """
+
     __tablename__ = "movements"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=id_generator("movements"))
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
     source_store_id = Column(UUID(as_uuid=True), nullable=True)
     target_store_id = Column(UUID(as_uuid=True), nullable=True)
     quantity = Column(Integer, nullable=False)
-    timestamp = Column(DateTime, server_default=func.now(), nullable=False)
+    timestamp = Column(Timestamp, primary_key=True, default=_utcnow, server_default=func.now())
     type = Column(Enum(MovementType), nullable=False)
 
     product = relationship("Product", back_populates="movements")
 
-    __table_args__ = (CheckConstraint("quantity > 0", name="check_quantity_positive"),)
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="check_quantity_positive"),
+        # 🔹 Clave de la paginación por cursor de `get_all_movements`
+        Index("ix_movements_timestamp_id", "timestamp", "id"),
+        # 🔹 Filtros por producto y por tienda de origen/destino, en orden cronológico (listado, exportación,
+        #    historial por tienda de la conciliación y el stock `as_of`)
+        Index("ix_movements_product_timestamp", "product_id", "timestamp", "id"),
+        Index("ix_movements_source_store_timestamp", "source_store_id", "timestamp"),
+        Index("ix_movements_target_store_timestamp", "target_store_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
     @validates("type")
     def validate_type(self, key, value):
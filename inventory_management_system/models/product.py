@@ -1,24 +1,30 @@
-import uuid
-
-from sqlalchemy import CheckConstraint, Column, Float, String
+from sqlalchemy import CheckConstraint, Column, Float, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, synonym
 
+from inventory_management_system.core.ids import id_generator
 from inventory_management_system.models import Base
 
 
 class Product(Base):
     __tablename__ = "products"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=id_generator("products"), index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(String, nullable=False)
     category = Column(String, nullable=False)
     price = Column(Float, nullable=False)
     sku = Column(String, nullable=False, unique=True)
+    # 🔹 Suma de `inventory.quantity` del producto, mantenida por los servicios que escriben inventario
+    stock_total = Column(Integer, nullable=False, default=0, server_default="0")
+    stock = synonym("stock_total")
 
     # 🔹 Relación con Inventory (stock ahora se maneja desde inventory)
     inventory = relationship("Inventory", back_populates="product", cascade="all, delete-orphan")
     movements = relationship("Movement", back_populates="product")
 
-    __table_args__ = (CheckConstraint("price > 0", name="check_price_positive"),)
+    __table_args__ = (
+        CheckConstraint("price > 0", name="check_price_positive"),
+        # 🔹 Clave de la paginación por cursor de `get_products`
+        Index("ix_products_name_id", "name", "id"),
+    )
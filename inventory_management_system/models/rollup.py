@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, Column, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from inventory_management_system.models import Base
+from inventory_management_system.models.types import Timestamp
+
+
+class MovementRollup(Base):
+    """
+    Movimientos agregados por `(granularity, bucket, product_id, store_id)`, con `granularity` `hour` o `day`.
+    Los servicios suman cada movimiento en la misma transacción en que lo registran; las transferencias cuentan
+    como salida en el origen (`transfer_out_quantity`) y como entrada en el destino (`transfer_in_quantity`).
+    Se reconstruyen desde `movements` con `python -m inventory_management_system.db.backfill_rollups`.
+    """
+
+    __tablename__ = "movement_rollups"
+
+    granularity = Column(String(8), primary_key=True)
+    bucket = Column(Timestamp, primary_key=True)
+    product_id = Column(UUID(as_uuid=True), primary_key=True)
+    store_id = Column(UUID(as_uuid=True), primary_key=True)
+    in_quantity = Column(BigInteger, nullable=False, default=0)
+    out_quantity = Column(BigInteger, nullable=False, default=0)
+    transfer_in_quantity = Column(BigInteger, nullable=False, default=0)
+    transfer_out_quantity = Column(BigInteger, nullable=False, default=0)
+    movements = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        # 🔹 Consultas por producto o por tienda en un rango de fechas
+        Index("ix_movement_rollups_product", "granularity", "product_id", "bucket"),
+        Index("ix_movement_rollups_store", "granularity", "store_id", "bucket"),
+    )
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from inventory_management_system.models import Base
+from inventory_management_system.models.types import Timestamp
+
+
+class InventorySnapshot(Base):
+    """
+    Copia compacta de `inventory` (solo `product_id`, `store_id`, `quantity`) tomada en `taken_at` (UTC).
+    `as_of` parte de la copia más reciente anterior a la fecha pedida y reproduce solo los movimientos posteriores.
+    """
+
+    __tablename__ = "inventory_snapshots"
+
+    taken_at = Column(Timestamp, primary_key=True)
+    product_id = Column(UUID(as_uuid=True), primary_key=True)
+    store_id = Column(UUID(as_uuid=True), primary_key=True)
+    quantity = Column(Integer, nullable=False)
+
+
+class MovementBalance(Base):
+    """
+    Saldo del historial de movimientos anterior a `balance_at` por `(product_id, store_id)`.
+    Se guarda al retirar movimientos antiguos (particiones expiradas): la conciliación parte del último saldo y
+    suma solo los movimientos conservados, con el mismo resultado que recorrer el historial completo.
+    """
+
+    __tablename__ = "movement_balances"
+
+    balance_at = Column(Timestamp, primary_key=True)
+    product_id = Column(UUID(as_uuid=True), primary_key=True)
+    store_id = Column(UUID(as_uuid=True), primary_key=True)
+    quantity = Column(Integer, nullable=False)
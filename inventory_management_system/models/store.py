@@ -0,0 +1,17 @@
+import uuid
+
+from sqlalchemy import Column, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from inventory_management_system.models import Base
+from inventory_management_system.models.types import Timestamp
+
+
+class Store(Base):
+    __tablename__ = "stores"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String, nullable=False, unique=True)
+    address = Column(String, nullable=True)
+    created_at = Column(Timestamp, server_default=func.now(), nullable=False)
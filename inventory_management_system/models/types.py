@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.types import TypeDecorator
+
+
+class _SQLiteTimestamp(TypeDecorator):
+    """
+    Fecha/hora en SQLite con el mismo formato que `CURRENT_TIMESTAMP` (`YYYY-MM-DD HH:MM:SS[.ffffff]`).
+    SQLite compara las fechas como texto: el `DATETIME` por defecto siempre añade `.000000`, de modo que una
+    fila sellada por `server_default=func.now()` nunca es igual al mismo instante enviado como parámetro, y la
+    paginación por cursor `(timestamp, id)` repetía filas. `isoformat` omite los microsegundos cuando son 0.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.isoformat(sep=" ") if isinstance(value, datetime) else value
+
+    def process_result_value(self, value, dialect):
+        return datetime.fromisoformat(value) if value is not None else None
+
+
+# 🔹 `DateTime` en Postgres; en SQLite (pruebas) se almacena con formato comparable como texto
+Timestamp = DateTime().with_variant(_SQLiteTimestamp(), "sqlite")
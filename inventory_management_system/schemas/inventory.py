@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
@@ -38,9 +39,57 @@ class InventoryTransferRequest(BaseModel):
     quantity: int = Field(..., gt=0, description="Cantidad a transferir (debe ser mayor a 0)")
 
 
+class InventoryTransferResult(BaseModel):
+    """Resultado de una transferencia dentro de un lote."""
+
+    product_id: UUID = Field(..., description="ID del producto transferido")
+    source_store_id: UUID = Field(..., description="ID de la tienda de origen")
+    target_store_id: UUID = Field(..., description="ID de la tienda de destino")
+    quantity: int = Field(..., description="Cantidad solicitada")
+    status_code: int = Field(..., description="200 si se aplicó, o el código de error de la transferencia")
+    detail: str = Field(..., description="Mensaje del resultado")
+    remaining_stock: Optional[int] = Field(None, description="Stock en la tienda de origen tras la transferencia")
+    new_stock: Optional[int] = Field(None, description="Stock en la tienda de destino tras la transferencia")
+
+
 class InventoryResponse(InventoryBase):
     """Esquema para responder con datos de inventario existentes."""
 
     id: UUID = Field(..., description="ID único del inventario")
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class InventoryAsOfItem(BaseModel):
+    """Stock de un producto en una tienda en una fecha pasada."""
+
+    product_id: UUID
+    store_id: UUID
+    quantity: int
+
+
+class InventoryAsOfResponse(BaseModel):
+    """Stock reconstruido en `as_of` desde la copia `snapshot_at` más los movimientos posteriores."""
+
+    as_of: datetime = Field(..., description="Fecha consultada (UTC)")
+    snapshot_at: Optional[datetime] = Field(None, description="Copia de inventario usada como punto de partida")
+    items: list[InventoryAsOfItem]
+
+
+class InventoryDriftItem(BaseModel):
+    """Diferencia entre el stock de `inventory` y el que implica el historial de movimientos."""
+
+    product_id: UUID
+    store_id: UUID
+    expected: int = Field(..., description="Stock según el historial de movimientos")
+    actual: int = Field(..., description="Stock en `inventory` (0 si no hay fila)")
+    drift: int = Field(..., description="`actual - expected`")
+
+
+class InventoryReconciliationReport(BaseModel):
+    """Informe de conciliación del inventario con el historial de movimientos."""
+
+    checked_at: datetime = Field(..., description="Inicio de la conciliación (UTC)")
+    stores: int = Field(..., description="Tiendas revisadas")
+    fixed: bool = Field(..., description="Si se registraron movimientos de ajuste para las diferencias")
+    items: list[InventoryDriftItem]
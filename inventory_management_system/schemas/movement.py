@@ -26,9 +26,9 @@ class MovementCreate(MovementBase):
     @model_validator(mode="before")
     @classmethod
     def validate_stores(cls: Type["MovementCreate"], values: dict[str, Any]) -> dict[str, Any]:
-        # Validar y corregir el timestamp si viene vacío
+        # Un timestamp vacío equivale a no enviarlo: lo asigna el servidor al registrar el movimiento
         if "timestamp" in values and values["timestamp"] in ("", None):
-            values["timestamp"] = datetime.now(timezone.utc)
+            values = {key: value for key, value in values.items() if key != "timestamp"}
         movement_type: MovementType = values.get("type")
         source_store: Optional[UUID] = values.get("source_store_id")
         target_store: Optional[UUID] = values.get("target_store_id")
@@ -45,3 +45,33 @@ class MovementResponse(MovementBase):
     id: UUID
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class MovementResult(BaseModel):
+    """Resultado de un movimiento dentro de un lote."""
+
+    product_id: UUID = Field(..., description="ID del producto del movimiento")
+    source_store_id: Optional[UUID] = Field(None, description="ID de la tienda de origen")
+    target_store_id: Optional[UUID] = Field(None, description="ID de la tienda de destino")
+    quantity: int = Field(..., description="Cantidad solicitada")
+    type: MovementType
+    status_code: int = Field(..., description="201 si se aplicó, o el código de error del movimiento")
+    detail: str = Field(..., description="Mensaje del resultado")
+    id: Optional[UUID] = Field(None, description="ID del movimiento registrado")
+    source_stock: Optional[int] = Field(None, description="Stock en la tienda de origen tras el lote")
+    target_stock: Optional[int] = Field(None, description="Stock en la tienda de destino tras el lote")
+
+
+class MovementRollupResponse(BaseModel):
+    """Movimientos agregados de un producto en una tienda durante una hora o un día."""
+
+    granularity: str = Field(..., description="Granularidad del agregado (`hour` o `day`)")
+    bucket: datetime = Field(..., description="Inicio del intervalo (UTC)")
+    product_id: UUID
+    store_id: UUID
+    in_quantity: int = Field(..., description="Unidades recibidas por movimientos IN")
+    out_quantity: int = Field(..., description="Unidades retiradas por movimientos OUT")
+    transfer_in_quantity: int = Field(..., description="Unidades recibidas por transferencias")
+    transfer_out_quantity: int = Field(..., description="Unidades enviadas por transferencias")
+    movements: int = Field(..., description="Número de movimientos agregados")
+    net_quantity: int = Field(..., description="Cambio neto de stock en el intervalo")
@@ -31,3 +31,20 @@ class ProductResponse(ProductBase):
     stock: Optional[int] = Field(None, description="Stock total calculado desde inventory")
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductImportError(BaseModel):
+    """Error de una fila durante la importación masiva de productos."""
+
+    row: int = Field(..., description="Número de la fila de datos (empieza en 1, sin contar el encabezado CSV)")
+    sku: Optional[str] = Field(None, description="SKU de la fila, si se pudo leer")
+    detail: str = Field(..., description="Motivo por el que la fila no se importó")
+
+
+class ProductImportSummary(BaseModel):
+    """Resumen de una importación masiva de productos."""
+
+    total_rows: int = Field(0, description="Filas de datos leídas")
+    created: int = Field(0, description="Productos creados")
+    failed: int = Field(0, description="Filas rechazadas")
+    errors: list[ProductImportError] = Field(default_factory=list, description="Errores por fila (lista acotada)")
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class StoreBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100, description="Nombre único de la tienda")
+    address: Optional[str] = Field(None, max_length=200, description="Dirección de la tienda")
+
+
+class StoreCreate(StoreBase):
+    """Esquema para registrar una tienda; el ID es opcional para dar de alta tiendas ya existentes."""
+
+    id: Optional[UUID] = Field(None, description="ID de la tienda (se genera si no se indica)")
+
+
+class StoreUpdate(BaseModel):
+    """Esquema para actualizar una tienda. Todos los campos son opcionales."""
+
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    address: Optional[str] = Field(None, max_length=200)
+
+
+class StoreResponse(StoreBase):
+    id: UUID
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,83 @@
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from inventory_management_system.core.config import EVENTS_HISTORY_SIZE, EVENTS_QUEUE_SIZE
+from inventory_management_system.core.events import EventBroker
+from inventory_management_system.db.dialect import dialect_insert
+from inventory_management_system.models.alert import LowStockAlertVersion
+
+STOCK_CHANGED = "stock_changed"
+ALERT_RAISED = "alert_raised"
+ALERT_CLEARED = "alert_cleared"
+
+# 🔹 Eventos de stock del worker, por tienda (`GET /api/inventory/alerts/stream`)
+inventory_events = EventBroker(queue_size=EVENTS_QUEUE_SIZE, history_size=EVENTS_HISTORY_SIZE)
+# Cambio de stock de una fila: (product_id, store_id, (quantity, min_stock) antes, (quantity, min_stock) después)
+StockChange = tuple[UUID, UUID, Optional[tuple[int, int]], Optional[tuple[int, int]]]
+
+
+def is_low_stock(quantity: int, min_stock: int) -> bool:
+    """Condición de alerta; debe coincidir con el predicado del índice parcial `ix_inventory_low_stock`."""
+    return quantity <= min_stock
+
+
+async def get_low_stock_alerts_version(db: AsyncSession, store_id: Optional[UUID] = None) -> int:
+    """
+    Versión actual del conjunto de alertas de stock bajo de `store_id` (una lectura por clave primaria) o, sin
+    tienda, de todas: la suma de las versiones por tienda, que también cambia con cada escritura que las afecta.
+    """
+    query = select(func.coalesce(func.sum(LowStockAlertVersion.version), 0))
+    if store_id:
+        query = query.where(LowStockAlertVersion.store_id == store_id)
+    return int(await db.scalar(query))
+
+
+async def touch_low_stock_alerts(db: AsyncSession, store_id: UUID, *states: Optional[tuple[int, int]]) -> None:
+    """
+    Incrementa la versión de alertas de `store_id` si alguno de los estados `(quantity, min_stock)` (antes o después
+    de una escritura) está en alerta; las escrituras que no afectan al conjunto no la tocan.
+    Se ejecuta dentro de la transacción del llamador y se confirma con su commit.
+    """
+    if any(state is not None and is_low_stock(*state) for state in states):
+        await bump_low_stock_alerts_version(db, [store_id])
+
+
+async def bump_low_stock_alerts_version(db: AsyncSession, store_ids: Iterable[UUID]) -> None:
+    """
+    Incrementa la versión de alertas de cada tienda (upsert de su fila) dentro de la transacción del llamador.
+    Las filas se bloquean siempre en el mismo orden para evitar deadlocks entre transacciones concurrentes.
+    """
+    store_ids = sorted(set(store_ids), key=str)
+    if not store_ids:
+        return
+    stmt = dialect_insert(db, LowStockAlertVersion)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LowStockAlertVersion.store_id], set_={"version": LowStockAlertVersion.version + 1}
+    )
+    await db.execute(stmt, [{"store_id": store_id, "version": 1} for store_id in store_ids])
+
+
+def publish_stock_changes(changes: list[StockChange]) -> None:
+    """
+    Publica `stock_changed` por cada fila modificada y `alert_raised` / `alert_cleared` cuando entra o sale
+    del conjunto de alertas. Se llama después del commit: solo se anuncian cambios confirmados.
+    `None` como estado indica que la fila no existía (alta) o dejó de existir (baja).
+    """
+    for product_id, store_id, before, after in changes:
+        was_low = before is not None and is_low_stock(*before)
+        now_low = after is not None and is_low_stock(*after)
+        data = {
+            "product_id": product_id,
+            "store_id": store_id,
+            "quantity": after[0] if after else 0,
+            "min_stock": after[1] if after else None,
+        }
+        inventory_events.publish(STOCK_CHANGED, store_id, data)
+        if now_low and not was_low:
+            inventory_events.publish(ALERT_RAISED, store_id, data)
+        elif was_low and not now_low:
+            inventory_events.publish(ALERT_CLEARED, store_id, data)
@@ -0,0 +1,214 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from inventory_management_system.core.config import MOVEMENT_ARCHIVE_DIR
+from inventory_management_system.models.movement import Movement, MovementType
+from inventory_management_system.models.snapshot import MovementBalance
+
+ARCHIVE_YIELD_PER = 10_000
+ARCHIVE_ROW_GROUP_SIZE = 64_000
+ARCHIVE_COLUMNS = ("id", "product_id", "source_store_id", "target_store_id", "quantity", "timestamp", "type")
+ARCHIVE_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("product_id", pa.string()),
+        ("source_store_id", pa.string()),
+        ("target_store_id", pa.string()),
+        ("quantity", pa.int32()),
+        ("timestamp", pa.timestamp("us")),
+        ("type", pa.string()),
+    ]
+)
+_STORES_KEY = b"stores"  # 🔹 Metadato del archivo: tiendas de origen o destino de sus movimientos
+
+
+def archive_enabled() -> bool:
+    """Indica si hay un archivo de movimientos configurado (`MOVEMENT_ARCHIVE_DIR`)."""
+    return bool(MOVEMENT_ARCHIVE_DIR) and os.path.isdir(MOVEMENT_ARCHIVE_DIR)
+
+
+def _archive_row(row) -> tuple:
+    return (
+        str(row.id),
+        str(row.product_id),
+        str(row.source_store_id) if row.source_store_id else None,
+        str(row.target_store_id) if row.target_store_id else None,
+        row.quantity,
+        row.timestamp,
+        MovementType(row.type).value,
+    )
+
+
+def _write_month(archive_dir: str, month: str, groups: dict[str, list[tuple]], part: str) -> None:
+    """
+    Escribe un Parquet (zstd) por tienda en `<archive_dir>/<AAAA-MM>/store=<id>-<part>.parquet`, en orden
+    cronológico (las estadísticas de cada grupo de filas permiten saltar rangos de `timestamp` al leer).
+    - `part` identifica la ejecución (su corte): otra ejecución que archive más filas del mismo mes y tienda (por
+      ejemplo, movimientos con fecha atrasada) añade su propio archivo en lugar de reemplazar el anterior, y
+      `_read_month` lee todos.
+    - Se escribe en un temporal y se renombra: repetir una ejecución con el mismo corte reemplaza solo sus archivos.
+    """
+    directory = os.path.join(archive_dir, month)
+    os.makedirs(directory, exist_ok=True)
+    for store, rows in groups.items():
+        columns = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), ARCHIVE_SCHEMA)]
+        stores = {store_id for row in rows for store_id in row[2:4] if store_id}
+        table = pa.Table.from_arrays(
+            columns, schema=ARCHIVE_SCHEMA.with_metadata({_STORES_KEY: ",".join(sorted(stores))})
+        )
+        path = os.path.join(directory, f"store={store}-{part}.parquet")
+        pq.write_table(table, f"{path}.tmp", compression="zstd", row_group_size=ARCHIVE_ROW_GROUP_SIZE)
+        os.replace(f"{path}.tmp", path)
+
+
+async def archive_movements(db: AsyncSession, before: datetime, archive_dir: Optional[str] = None) -> int:
+    """
+    Copia al archivo columnar los movimientos con `timestamp < before`, agrupados por mes y por tienda (la de
+    origen, o la de destino si no tiene); devuelve cuántos copió. Lee con un cursor de servidor en orden
+    cronológico y escribe cada mes al terminarlo: la memoria depende del mes más grande, no del historial.
+    No borra nada: de eso se encarga `expire_movements`, en la misma transacción.
+    """
+    archive_dir = archive_dir or MOVEMENT_ARCHIVE_DIR
+    part = f"{before:%Y%m%dT%H%M%S}"
+    query = (
+        select(*(getattr(Movement, column) for column in ARCHIVE_COLUMNS))
+        .where(Movement.timestamp < before)
+        .order_by(Movement.timestamp, Movement.id)
+    )
+    result = await db.stream(query.execution_options(yield_per=ARCHIVE_YIELD_PER))
+    month, groups, total = None, defaultdict(list), 0
+    async for rows in result.partitions():
+        for row in rows:
+            row_month = f"{row.timestamp:%Y-%m}"
+            if row_month != month:
+                if groups:
+                    await asyncio.to_thread(_write_month, archive_dir, month, groups, part)
+                month, groups = row_month, defaultdict(list)
+            groups[str(row.source_store_id or row.target_store_id)].append(_archive_row(row))
+            total += 1
+    if groups:
+        await asyncio.to_thread(_write_month, archive_dir, month, groups, part)
+    return total
+
+
+def _filter_expression(
+    product_id: Optional[UUID],
+    movement_type: Optional[MovementType],
+    store_id: Optional[UUID],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    before: Optional[tuple[datetime, UUID]],
+) -> pc.Expression:
+    """Filtros de `get_all_movements` como expresión de Arrow, que `read_table` aplica por grupo de filas."""
+    expression = pc.scalar(True)
+    if product_id:
+        expression &= pc.field("product_id") == str(product_id)
+    if movement_type:
+        expression &= pc.field("type") == MovementType(movement_type).value
+    if store_id:
+        expression &= (pc.field("source_store_id") == str(store_id)) | (pc.field("target_store_id") == str(store_id))
+    if start:
+        expression &= pc.field("timestamp") >= pa.scalar(start, pa.timestamp("us"))
+    if end:
+        expression &= pc.field("timestamp") < pa.scalar(end, pa.timestamp("us"))
+    if before:
+        timestamp = pa.scalar(before[0], pa.timestamp("us"))
+        expression &= (pc.field("timestamp") < timestamp) | (
+            (pc.field("timestamp") == timestamp) & (pc.field("id") < str(before[1]))
+        )
+    return expression
+
+
+def _month_dirs(archive_dir: str, start: Optional[datetime], end: Optional[datetime]) -> list[str]:
+    """Directorios mensuales que pueden tener movimientos en `[start, end)`, del más reciente al más antiguo."""
+    first = f"{start:%Y-%m}" if start else ""
+    last = f"{end - timedelta(microseconds=1):%Y-%m}" if end else "9999-12"
+    months = [name for name in os.listdir(archive_dir) if first <= name <= last]
+    return [os.path.join(archive_dir, name) for name in sorted(months, reverse=True)]
+
+
+def _read_month(directory: str, store_id: Optional[UUID], expression: pc.Expression) -> Optional[pa.Table]:
+    """
+    Lee (con `memory_map`) los archivos del mes que pueden contener la tienda, de todas las ejecuciones, aplicando
+    los filtros.
+    """
+    tables = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".parquet"):
+            continue
+        path = os.path.join(directory, name)
+        if store_id and str(store_id) not in pq.read_schema(path).metadata.get(_STORES_KEY, b"").decode().split(","):
+            continue
+        tables.append(pq.read_table(path, filters=expression, memory_map=True))
+    return pa.concat_tables(tables) if tables else None
+
+
+def read_archived_movements(
+    archive_dir: str,
+    limit: int,
+    offset: int = 0,
+    product_id: Optional[UUID] = None,
+    movement_type: Optional[MovementType] = None,
+    store_id: Optional[UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    before: Optional[tuple[datetime, UUID]] = None,
+) -> list[Movement]:
+    """
+    Movimientos archivados con los filtros de `get_all_movements`, del más reciente al más antiguo (`timestamp`,
+    `id`), como entidades `Movement` sin sesión.
+    - Descarta meses por el nombre del directorio y archivos por sus tiendas (metadatos); dentro de cada archivo,
+      los grupos de filas por sus estadísticas.
+    - Lee mes a mes desde el más reciente y se detiene al completar `offset + limit` filas.
+    - `before` es la clave `(timestamp, id)` del cursor: solo filas anteriores.
+    """
+    expression = _filter_expression(product_id, movement_type, store_id, start, end, before)
+    needed, rows = offset + limit, []
+    for directory in _month_dirs(archive_dir, start, end):
+        table = _read_month(directory, store_id, expression)
+        if table is None:
+            continue
+        table = table.sort_by([("timestamp", "descending"), ("id", "descending")])
+        rows.extend(table.slice(0, needed - len(rows)).to_pylist())
+        if len(rows) >= needed:
+            break
+    return [
+        Movement(
+            id=UUID(row["id"]),
+            product_id=UUID(row["product_id"]),
+            source_store_id=UUID(row["source_store_id"]) if row["source_store_id"] else None,
+            target_store_id=UUID(row["target_store_id"]) if row["target_store_id"] else None,
+            quantity=row["quantity"],
+            timestamp=row["timestamp"],
+            type=MovementType(row["type"]),
+        )
+        for row in rows[offset:]
+    ]
+
+
+async def get_archived_movements(
+    db: AsyncSession, limit: int, offset: int = 0, end: Optional[datetime] = None, **filters
+) -> list[Movement]:
+    """
+    Página de movimientos archivados para completar una consulta sobre `movements`.
+    Solo se leen los anteriores al último corte de `expire_movements` (`movement_balances`): los posteriores
+    siguen en la BD, y así una fila nunca aparece en ambos lados. La lectura de archivos va en un hilo aparte.
+    """
+    if not archive_enabled():
+        return []
+    boundary = await db.scalar(select(func.max(MovementBalance.balance_at)))
+    if boundary is None:
+        return []
+    end = boundary if end is None else min(end, boundary)
+    return await asyncio.to_thread(read_archived_movements, MOVEMENT_ARCHIVE_DIR, limit, offset, end=end, **filters)
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, Select, func
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+
+from inventory_management_system.db.database import disable_statement_timeouts
+from inventory_management_system.models.inventory import Inventory
+from inventory_management_system.models.movement import Movement, MovementType
+
+EXPORT_YIELD_PER = 5000
+MOVEMENT_EXPORT_COLUMNS = ("id", "timestamp", "type", "product_id", "source_store_id", "target_store_id", "quantity")
+INVENTORY_EXPORT_COLUMNS = ("id", "product_id", "store_id", "quantity", "min_stock")
+
+
+async def stream_rows(bind: AsyncEngine, query: Select) -> AsyncIterator[Sequence[Row]]:
+    """
+    Ejecuta `query` con un cursor de servidor (`stream` + `yield_per`) y entrega las filas en bloques de
+    `EXPORT_YIELD_PER` tuplas, sin construir entidades ORM.
+    - Usa una sesión propia sobre `bind`: el flujo no depende de la sesión de la petición, que puede cerrarse antes
+      de enviar la respuesta, y la conexión se libera al terminar o al desconectarse el cliente.
+    - Sin los límites de sesión del perfil (`disable_statement_timeouts`): un cliente lento no corta la exportación.
+    """
+    async with AsyncSession(bind) as session:
+        # 🔹 La transacción sigue abierta mientras el cliente lee: sin `idle_in_transaction_session_timeout`
+        await disable_statement_timeouts(await session.connection())
+        result = await session.stream(query.execution_options(yield_per=EXPORT_YIELD_PER))
+        async for rows in result.partitions():
+            yield rows
+
+
+def movements_export_query(
+    product_id: Optional[UUID] = None,
+    store_id: Optional[UUID] = None,
+    movement_type: Optional[MovementType] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Select:
+    """
+    Movimientos en orden cronológico `(timestamp, id)` con las columnas de `MOVEMENT_EXPORT_COLUMNS`.
+    `start` incluido y `end` excluido; `store_id` coincide con la tienda de origen o la de destino.
+    """
+    query = select(*(getattr(Movement, column) for column in MOVEMENT_EXPORT_COLUMNS)).order_by(
+        Movement.timestamp, Movement.id
+    )
+    if product_id:
+        query = query.where(Movement.product_id == product_id)
+    if store_id:
+        query = query.where((Movement.source_store_id == store_id) | (Movement.target_store_id == store_id))
+    if movement_type:
+        query = query.where(Movement.type == movement_type)
+    if start:
+        query = query.where(Movement.timestamp >= start)
+    if end:
+        query = query.where(Movement.timestamp < end)
+    return query
+
+
+def store_inventory_export_query(store_id: UUID) -> Select:
+    """Inventario de una tienda ordenado por `product_id` con las columnas de `INVENTORY_EXPORT_COLUMNS`."""
+    return (
+        select(
+            Inventory.id,
+            Inventory.product_id,
+            Inventory.store_id,
+            Inventory.quantity,
+            func.coalesce(Inventory.min_stock, 0).label("min_stock"),
+        )
+        .where(Inventory.store_id == store_id)
+        .order_by(Inventory.product_id)
+    )
@@ -1,18 +1,49 @@
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql import func
 
-from inventory_management_system.config import VALID_STORE_IDS
+from inventory_management_system.core.json_rows import response_columns
+from inventory_management_system.core.pagination import after_cursor, decode_cursor
+from inventory_management_system.db.dialect import dialect_insert, is_postgres
+from inventory_management_system.db.writes import insert_returning, update_returning
 from inventory_management_system.models.inventory import Inventory
 from inventory_management_system.models.product import Product
-from inventory_management_system.schemas.inventory import InventoryCreate, InventoryTransferRequest, InventoryUpdate
-from inventory_management_system.schemas.movement import MovementCreate, MovementType
-from inventory_management_system.services.movement_service import create_movement
+from inventory_management_system.schemas.inventory import (
+    InventoryCreate,
+    InventoryResponse,
+    InventoryTransferRequest,
+    InventoryTransferResult,
+    InventoryUpdate,
+)
+from inventory_management_system.schemas.movement import MovementType
+from inventory_management_system.schemas.product import ProductResponse
+from inventory_management_system.services.alert_service import publish_stock_changes, touch_low_stock_alerts
+from inventory_management_system.services.product_service import (
+    get_cached_product,
+    get_existing_product_ids,
+    product_cache,
+)
+from inventory_management_system.services.stock_service import (
+    MIN_STOCK,
+    adjustment_values,
+    apply_to_stock,
+    insert_movements,
+    lock_stock,
+    min_stock_error,
+    movement_values,
+    new_inventory_id,
+    publish_stock,
+    select_inventory_for_update,
+    source_not_found_error,
+    write_stock,
+)
+from inventory_management_system.services.store_service import store_registry, validate_store_ids
 
-MIN_STOCK = 5
+MAX_BATCH_TRANSFERS = 1000
 
 
 async def create_inventory(inventory_data: InventoryCreate, db: AsyncSession) -> Inventory | None:
@@ -27,20 +58,58 @@ async def create_inventory(inventory_data: InventoryCreate, db: AsyncSession) ->
         raise HTTPException(
             status_code=409, detail="El producto ya está registrado en esta tienda. Usa la opción de actualizar stock."
         )
-    # 🔹 Crear nueva entrada en `inventory`
-    new_inventory = Inventory(**inventory_data.model_dump())
-    db.add(new_inventory)
+    # 🔹 Crear nueva entrada en `inventory` (`INSERT ... RETURNING`: sin `refresh()` tras el commit)
+    new_inventory = await insert_returning(db, Inventory, inventory_data.model_dump())
+    await _adjust_product_stock(inventory_data.product_id, inventory_data.quantity, db)
+    await touch_low_stock_alerts(db, inventory_data.store_id, (inventory_data.quantity, inventory_data.min_stock))
+    # 🔹 Crea nueva entrada en `movement (IN)` dentro de la misma transacción
+    await insert_movements(
+        [
+            movement_values(
+                MovementType.IN, inventory_data.product_id, None, inventory_data.store_id, inventory_data.quantity
+            )
+        ],
+        db,
+    )
     await db.commit()
-    await db.refresh(new_inventory)
-    await _create_new_movement(inventory_data, "IN", db)
-    # 🔹 Crear nueva entrada en `inventory`
+    product_cache.invalidate(inventory_data.product_id)
+    publish_stock_changes(
+        [
+            (
+                inventory_data.product_id,
+                inventory_data.store_id,
+                None,
+                (inventory_data.quantity, inventory_data.min_stock),
+            )
+        ]
+    )
     return new_inventory
 
 
-async def _get_product_by_id(product_id: UUID, db: AsyncSession) -> Product | None:
-    """Valida si el producto existe en la base de datos."""
-    result = await db.execute(select(Product).where(Product.id == product_id))
-    product = result.scalar_one_or_none()
+async def _adjust_product_stock(product_id: UUID, delta: int, db: AsyncSession) -> None:
+    """
+    Suma `delta` al stock total del producto (`products.stock_total`) dentro de la transacción en curso.
+    Las transferencias no lo llaman: mueven stock entre tiendas sin cambiar el total del producto.
+    Tras el commit, el llamador debe invalidar el producto en `product_cache`.
+    """
+    if delta:
+        await db.execute(
+            update(Product).where(Product.id == product_id).values(stock_total=Product.stock_total + delta)
+        )
+
+
+async def _record_adjustment(product_id: UUID, store_id: UUID, delta: int, db: AsyncSession) -> None:
+    """
+    Registra un ajuste manual de stock como movimiento IN (`delta > 0`) u OUT (`delta < 0`) en la transacción en
+    curso, para que el historial explique todo cambio de `inventory.quantity` (consultas `as_of` y agregados).
+    """
+    if delta:
+        await insert_movements([adjustment_values(product_id, store_id, delta)], db)
+
+
+async def _get_product_by_id(product_id: UUID, db: AsyncSession) -> ProductResponse | None:
+    """Valida si el producto existe (consultando primero la caché de productos)."""
+    product = await get_cached_product(db, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="El producto no está registrado en la base de datos.")
     return product
@@ -48,99 +117,223 @@ async def _get_product_by_id(product_id: UUID, db: AsyncSession) -> Product | No
 
 async def _check_inventory_exists(product_id: UUID, store_id: UUID, db: AsyncSession) -> bool | None:
     """Verifica si un producto ya está registrado en el inventario de una tienda específica."""
-    await _validate_store_id(store_id)
+    await validate_store_ids((store_id,), db)
     result = await db.execute(
         select(Inventory).where((Inventory.product_id == product_id) & (Inventory.store_id == store_id))
     )
     return result.scalar_one_or_none() is not None
 
 
-async def _validate_store_id(store_id: UUID) -> None:
-    """Verifica si una tienda es válida antes de continuar con la operación."""
-    if str(store_id) not in VALID_STORE_IDS:
-        raise HTTPException(status_code=400, detail="Tienda no válida.")
-
-
-async def _create_new_movement(data: InventoryCreate | InventoryTransferRequest, type_movement: str, db: AsyncSession):
-    """
-    Crea un nuevo movimiento en la tabla `movement`.
-    - `data` puede ser de tipo `InventoryCreate` o `InventoryTransferRequest`
-    - `type_movement` define el tipo de movimiento ('IN', 'OUT', 'TRANSFER')
-    """
-    if type_movement == "IN":
-        source_store_id = None
-        target_store_id = data.store_id
-        create_type = MovementType.IN
-    elif type_movement == "TRANSFER":
-        source_store_id = data.source_store_id
-        target_store_id = data.target_store_id
-        create_type = MovementType.TRANSFER
-    elif type_movement == "OUT":
-        source_store_id = data.store_id
-        target_store_id = None
-        create_type = MovementType.OUT
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Tipo de movimiento '{type_movement}' no es válido. Debe ser 'IN', 'OUT' o 'TRANSFER'.",
-        )
-
-    movement_data = MovementCreate(
-        product_id=data.product_id,
-        source_store_id=source_store_id,
-        target_store_id=target_store_id,
-        quantity=data.quantity,
-        type=create_type,
-    )
-    await create_movement(movement_data, db)
-
-
 async def transfer_inventory(transfer_data: InventoryTransferRequest, db: AsyncSession):
-    """Transfiere stock de un producto de una tienda a otra, validando stock disponible."""
+    """
+    Transfiere stock de un producto de una tienda a otra en una sola transacción.
+    - El descuento en origen es un `UPDATE ... RETURNING` condicional que valida el stock mínimo en la BD.
+    - El destino se actualiza con un upsert (`INSERT ... ON CONFLICT DO UPDATE`).
+    - En Postgres las filas se bloquean antes, siempre en el mismo orden, para evitar deadlocks.
+    - El origen siempre queda por encima del mínimo, así que solo el destino puede afectar a las alertas.
+    """
     # 🔹 Validar que el producto existe
     await _get_product_by_id(transfer_data.product_id, db)
     # 🔹 Validar que las tiendas de entrada y salida del producto existen
-    await _validate_store_id(transfer_data.source_store_id)
-    await _validate_store_id(transfer_data.target_store_id)
-    # 🔹 Obtener el inventario de la tienda de origen
-    source_inventory = await _get_inventory_record(transfer_data.product_id, transfer_data.source_store_id, db)
-    if not source_inventory:
-        raise HTTPException(status_code=404, detail="El producto no existe en la tienda de origen.")
-    if source_inventory.min_stock >= (source_inventory.quantity - transfer_data.quantity):
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Producto a enviar sobrepasa el minimo stock en la tienda de origen. "
-                f"Stock actual en tienda de origen: {source_inventory.quantity} ."
-                f"Minimo Stock permitido: {source_inventory.min_stock}"
-            ),
+    await validate_store_ids(_transfer_store_ids(transfer_data), db)
+    try:
+        if is_postgres(db):
+            await select_inventory_for_update(
+                [
+                    (transfer_data.product_id, transfer_data.source_store_id),
+                    (transfer_data.product_id, transfer_data.target_store_id),
+                ],
+                db,
+            )
+        remaining_stock, source_min_stock = await _decrement_source_stock(transfer_data, db)
+        new_stock, target_min_stock = await _increment_target_stock(
+            transfer_data.product_id, transfer_data.target_store_id, transfer_data.quantity, db
         )
-    # 🔹 Obtener o crear el inventario en la tienda de destino
-    target_inventory = await _get_inventory_record(transfer_data.product_id, transfer_data.target_store_id, db)
-    if not target_inventory:
-        target_inventory = Inventory(
-            product_id=transfer_data.product_id,
-            store_id=transfer_data.target_store_id,
-            quantity=0,
-            min_stock=MIN_STOCK,
+        await touch_low_stock_alerts(
+            db,
+            transfer_data.target_store_id,
+            (new_stock - transfer_data.quantity, target_min_stock),
+            (new_stock, target_min_stock),
         )
-        db.add(target_inventory)
+        # 🔹 Crea nueva entrada en `movement (TRANSFER)` dentro de la misma transacción
+        await insert_movements([_transfer_movement_values(transfer_data)], db)
         await db.commit()
-    # 🔹 Realizar la transferencia
-    source_inventory.quantity -= transfer_data.quantity
-    target_inventory.quantity += transfer_data.quantity
-    await db.commit()
-    await db.refresh(source_inventory)
-    await db.refresh(target_inventory)
-    # 🔹 Crea nueva entrada en `movement (TRANSFER)`
-    await _create_new_movement(transfer_data, "TRANSFER", db)
+    except Exception:
+        await db.rollback()
+        raise
+    publish_stock_changes(
+        [
+            (
+                transfer_data.product_id,
+                transfer_data.source_store_id,
+                (remaining_stock + transfer_data.quantity, source_min_stock),
+                (remaining_stock, source_min_stock),
+            ),
+            (
+                transfer_data.product_id,
+                transfer_data.target_store_id,
+                (new_stock - transfer_data.quantity, target_min_stock),
+                (new_stock, target_min_stock),
+            ),
+        ]
+    )
     return {
         "message": "Transferencia completada con éxito",
-        "source_store": {"store_id": transfer_data.source_store_id, "remaining_stock": source_inventory.quantity},
-        "target_store": {"store_id": transfer_data.target_store_id, "new_stock": target_inventory.quantity},
+        "source_store": {"store_id": transfer_data.source_store_id, "remaining_stock": remaining_stock},
+        "target_store": {"store_id": transfer_data.target_store_id, "new_stock": new_stock},
     }
 
 
+async def _decrement_source_stock(transfer_data: InventoryTransferRequest, db: AsyncSession) -> tuple[int, int]:
+    """
+    Descuenta el stock en la tienda de origen solo si queda por encima del mínimo y devuelve
+    `(quantity, min_stock)` tras el descuento.
+    Si el `UPDATE` no afecta filas, se consulta el registro para devolver el error adecuado.
+    """
+    result = await db.execute(
+        update(Inventory)
+        .where(
+            (Inventory.product_id == transfer_data.product_id)
+            & (Inventory.store_id == transfer_data.source_store_id)
+            & (Inventory.quantity - transfer_data.quantity > Inventory.min_stock)
+        )
+        .values(quantity=Inventory.quantity - transfer_data.quantity)
+        .returning(Inventory.quantity, Inventory.min_stock)
+    )
+    source = result.one_or_none()
+    if source is not None:
+        return tuple(source)
+    source_inventory = await _get_inventory_record(transfer_data.product_id, transfer_data.source_store_id, db)
+    if not source_inventory:
+        raise source_not_found_error()
+    raise min_stock_error(source_inventory.quantity, source_inventory.min_stock)
+
+
+async def _increment_target_stock(product_id: UUID, store_id: UUID, quantity: int, db: AsyncSession) -> tuple[int, int]:
+    """
+    Suma stock en la tienda de destino, creando el registro con `MIN_STOCK` si no existe.
+    Devuelve `(quantity, min_stock)` del registro tras la suma.
+    """
+    stmt = dialect_insert(db, Inventory).values(
+        id=new_inventory_id(), product_id=product_id, store_id=store_id, quantity=quantity, min_stock=MIN_STOCK
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Inventory.product_id, Inventory.store_id],
+        set_={"quantity": Inventory.quantity + stmt.excluded.quantity},
+    ).returning(Inventory.quantity, Inventory.min_stock)
+    result = await db.execute(stmt)
+    return tuple(result.one())
+
+
+async def transfer_inventory_batch(
+    transfers: list[InventoryTransferRequest], db: AsyncSession
+) -> list[InventoryTransferResult]:
+    """
+    Aplica un lote de transferencias en una sola transacción y devuelve un resultado por cada una.
+    - Productos validados con una sola consulta `IN (...)`; tiendas validadas en lote contra `store_registry`.
+    - Las filas afectadas se leen y bloquean una vez, en orden `(product_id, store_id)`.
+    - Las transferencias se aplican en orden sobre esas filas; las que fallan se reportan y se omiten.
+    - Stock y movimientos TRANSFER se escriben con inserts/updates masivos y un único commit.
+    """
+    existing_products = await get_existing_product_ids({t.product_id for t in transfers}, db)
+    unknown_stores = await store_registry.find_unknown({s for t in transfers for s in _transfer_store_ids(t)}, db)
+    results: list[InventoryTransferResult | None] = [None] * len(transfers)
+    pending: list[int] = []
+    for index, transfer_data in enumerate(transfers):
+        try:
+            _validate_batch_transfer(transfer_data, existing_products, unknown_stores)
+            pending.append(index)
+        except HTTPException as exc:
+            results[index] = _transfer_result(transfer_data, exc.status_code, exc.detail)
+    try:
+        stock = await lock_stock(
+            {(transfers[i].product_id, store_id) for i in pending for store_id in _transfer_store_ids(transfers[i])}, db
+        )
+        movements = []
+        for index in pending:
+            results[index] = _apply_transfer_to_stock(transfers[index], stock)
+            if results[index].status_code == 200:
+                movements.append(_transfer_movement_values(transfers[index]))
+        offsets = await write_stock(stock, movements, db)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    _apply_stock_offsets(results, offsets)
+    publish_stock(stock, offsets)
+    return results
+
+
+def _validate_batch_transfer(
+    transfer_data: InventoryTransferRequest, existing_products: set[UUID], unknown_stores: set[UUID]
+) -> None:
+    """Valida producto y tiendas de una transferencia del lote sin consultar la BD."""
+    if transfer_data.product_id not in existing_products:
+        raise HTTPException(status_code=404, detail="El producto no está registrado en la base de datos.")
+    if unknown_stores.intersection(_transfer_store_ids(transfer_data)):
+        raise HTTPException(status_code=400, detail="Tienda no válida.")
+
+
+def _transfer_store_ids(transfer_data: InventoryTransferRequest) -> tuple[UUID, UUID]:
+    return transfer_data.source_store_id, transfer_data.target_store_id
+
+
+def _transfer_movement_values(transfer_data: InventoryTransferRequest) -> dict:
+    """Columnas del movimiento TRANSFER asociado a una transferencia."""
+    return movement_values(
+        MovementType.TRANSFER,
+        transfer_data.product_id,
+        transfer_data.source_store_id,
+        transfer_data.target_store_id,
+        transfer_data.quantity,
+    )
+
+
+def _apply_transfer_to_stock(transfer_data: InventoryTransferRequest, stock: dict) -> InventoryTransferResult:
+    """Aplica una transferencia sobre el stock bloqueado en memoria, validando el stock mínimo."""
+    try:
+        apply_to_stock(
+            stock,
+            MovementType.TRANSFER,
+            transfer_data.product_id,
+            transfer_data.source_store_id,
+            transfer_data.target_store_id,
+            transfer_data.quantity,
+        )
+    except HTTPException as exc:
+        return _transfer_result(transfer_data, exc.status_code, exc.detail)
+    return _transfer_result(
+        transfer_data,
+        200,
+        "Transferencia completada con éxito",
+        remaining_stock=stock[(transfer_data.product_id, transfer_data.source_store_id)]["quantity"],
+        new_stock=stock[(transfer_data.product_id, transfer_data.target_store_id)]["quantity"],
+    )
+
+
+def _apply_stock_offsets(results: list[InventoryTransferResult], offsets: dict) -> None:
+    """Corrige el stock informado en los resultados con el stock real de las filas creadas en paralelo."""
+    for result in results:
+        if result.status_code != 200:
+            continue
+        result.remaining_stock += offsets.get((result.product_id, result.source_store_id), 0)
+        result.new_stock += offsets.get((result.product_id, result.target_store_id), 0)
+
+
+def _transfer_result(
+    transfer_data: InventoryTransferRequest, status_code: int, detail: str, **stock: int
+) -> InventoryTransferResult:
+    return InventoryTransferResult(
+        product_id=transfer_data.product_id,
+        source_store_id=transfer_data.source_store_id,
+        target_store_id=transfer_data.target_store_id,
+        quantity=transfer_data.quantity,
+        status_code=status_code,
+        detail=detail,
+        **stock,
+    )
+
+
 async def _get_inventory_record(product_id: UUID, store_id: UUID, db: AsyncSession) -> Inventory | None:
     """Obtiene un registro de inventario específico para un producto en una tienda."""
     result = await db.execute(
@@ -149,71 +342,155 @@ async def _get_inventory_record(product_id: UUID, store_id: UUID, db: AsyncSessi
     return result.scalar_one_or_none()
 
 
-async def get_inventory_by_store(store_id: UUID, db: AsyncSession, limit: int | None = 100, offset: int = 0):
-    """Obtiene el inventario de una tienda con opción de paginación."""
-    await _validate_store_id(store_id)
-    query = select(
-        Inventory.id,
-        Inventory.product_id,
-        Inventory.store_id,
-        Inventory.quantity,
-        func.coalesce(Inventory.min_stock, 0).label("min_stock"),
-    ).where(Inventory.store_id == store_id)
+async def get_inventory_by_store(
+    store_id: UUID, db: AsyncSession, limit: int | None = 100, offset: int = 0, cursor: str | None = None
+):
+    """
+    Obtiene el inventario de una tienda ordenado por `product_id`, con opción de paginación.
+    - Con `cursor` (ver `inventory_cursor_key`) se pagina por keyset sobre `(store_id, product_id)`.
+    - `offset` se mantiene por compatibilidad.
+    """
+    await validate_store_ids((store_id,), db)
+    query = (
+        select(
+            Inventory.id,
+            Inventory.product_id,
+            Inventory.store_id,
+            Inventory.quantity,
+            func.coalesce(Inventory.min_stock, 0).label("min_stock"),
+        )
+        .where(Inventory.store_id == store_id)
+        .order_by(Inventory.product_id)
+    )
+    if cursor:
+        query = query.where(after_cursor((Inventory.product_id,), decode_cursor(cursor, UUID)))
     if limit:  # Si limit es None, no aplicar paginación
-        query = query.limit(limit).offset(offset)
+        query = query.limit(limit)
+        if not cursor:
+            query = query.offset(offset)
     result = await db.execute(query)
     return result.mappings().all()  # Retorna diccionarios en lugar de objetos SQLAlchemy
 
 
-async def get_low_stock_alerts(db: AsyncSession):
-    """Lista productos con stock bajo en cualquier tienda."""
-    query = select(Inventory).where(Inventory.quantity <= Inventory.min_stock)
-    result = await db.execute(query)
-    low_stock_items = result.scalars().all()
+def inventory_cursor_key(item) -> tuple:
+    """Clave de orden de una fila de inventario de tienda para el cursor de paginación."""
+    return (item["product_id"],)
+
 
+async def get_low_stock_alerts(
+    db: AsyncSession,
+    store_id: UUID | None = None,
+    category: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+):
+    """
+    Lista productos con stock bajo, ordenados por `(store_id, product_id)`.
+    - La condición coincide con el índice parcial `ix_inventory_low_stock`: solo se recorren filas en alerta.
+    - Filtros opcionales por tienda y por categoría del producto.
+    - Con `cursor` (ver `low_stock_alert_cursor_key`) se pagina por keyset; sin `limit` se devuelven todas.
+    """
+    query = (
+        select(Inventory.product_id, Inventory.store_id, Inventory.quantity, Inventory.min_stock)
+        .where(Inventory.quantity <= Inventory.min_stock)
+        .order_by(Inventory.store_id, Inventory.product_id)
+        .limit(limit)
+    )
+    if store_id:
+        query = query.where(Inventory.store_id == store_id)
+    if category:
+        query = query.join(Product, Product.id == Inventory.product_id).where(Product.category == category)
+    if cursor:
+        query = query.where(after_cursor((Inventory.store_id, Inventory.product_id), decode_cursor(cursor, UUID, UUID)))
+    result = await db.execute(query)
     return [
-        {
-            "product_id": item.product_id,
-            "store_id": item.store_id,
-            "quantity": item.quantity,
-            "min_stock": item.min_stock,
-            "alert": "Peligro, No hay Stock" if item.quantity == 0 else "Stock bajo",
-        }
-        for item in low_stock_items
+        dict(item, alert="Peligro, No hay Stock" if item["quantity"] == 0 else "Stock bajo")
+        for item in result.mappings()
     ]
 
 
-async def get_inventory_by_id(inventory_id: UUID, db: AsyncSession) -> Inventory:
-    """Obtiene un inventario por ID o lanza una excepción si no existe."""
-    result = await db.execute(select(Inventory).where(Inventory.id == inventory_id))
-    inventory = result.scalar_one_or_none()
+def low_stock_alert_cursor_key(alert: dict) -> tuple:
+    """Clave de orden `(store_id, product_id)` de una alerta, para `encode_cursor`."""
+    return alert["store_id"], alert["product_id"]
+
+
+async def get_inventory_by_id(inventory_id: UUID, db: AsyncSession, as_rows: bool = False) -> Inventory:
+    """
+    Obtiene un inventario por ID o lanza una excepción si no existe.
+    Con `as_rows` devuelve una fila con las columnas de `InventoryResponse` en lugar de la entidad.
+    """
+    if as_rows:
+        result = await db.execute(
+            select(*response_columns(Inventory, InventoryResponse)).where(Inventory.id == inventory_id)
+        )
+        inventory = result.one_or_none()
+    else:
+        result = await db.execute(select(Inventory).where(Inventory.id == inventory_id))
+        inventory = result.scalar_one_or_none()
     if not inventory:
         raise HTTPException(status_code=404, detail="Inventario no encontrado.")
     return inventory
 
 
 async def update_inventory(inventory_id: UUID, inventory_data: InventoryUpdate, db: AsyncSession) -> Inventory:
-    """Actualiza la cantidad o el stock mínimo de un inventario existente sin sobrescribir valores no
-    proporcionados."""
-    inventory = await get_inventory_by_id(inventory_id, db)
+    """
+    Actualiza la cantidad o el stock mínimo de un inventario existente sin sobrescribir valores no
+    proporcionados. La fila se escribe con `UPDATE ... RETURNING`, sin `refresh()` tras el commit.
+    - La fila se lee y bloquea primero (`FOR UPDATE`): el ajuste del stock total y el movimiento se calculan
+      sobre la cantidad vigente aunque otra escritura la cambiara después de cargarla en la sesión.
+    - Mismo orden de bloqueo que los movimientos y las transferencias: inventario, producto y alertas.
+    """
+    inventory = await _get_inventory_for_update(inventory_id, db)
+    before = (inventory.quantity, inventory.min_stock)
     # Validación en services porque en update puede venir solo quantity o min_stock
     update_data = inventory_data.model_dump(exclude_unset=True)
     new_quantity = update_data.get("quantity", inventory.quantity)
     new_min_stock = update_data.get("min_stock", inventory.min_stock)
     if new_quantity < new_min_stock:
         raise HTTPException(status_code=400, detail="La cantidad no puede ser menor al stock mínimo.")
-    for key, value in update_data.items():
-        setattr(inventory, key, value)
+    if update_data:
+        inventory = await update_returning(db, Inventory, Inventory.id == inventory_id, update_data)
+    await _adjust_product_stock(inventory.product_id, new_quantity - before[0], db)
+    await _record_adjustment(inventory.product_id, inventory.store_id, new_quantity - before[0], db)
+    await touch_low_stock_alerts(db, inventory.store_id, before, (new_quantity, new_min_stock))
     await db.commit()
-    await db.refresh(inventory)
+    product_cache.invalidate(inventory.product_id)
+    publish_stock_changes([(inventory.product_id, inventory.store_id, before, (new_quantity, new_min_stock))])
     return inventory
 
 
-async def delete_inventory(inventory_id: UUID, db: AsyncSession):
-    """Elimina un inventario, validando que exista."""
-    inventory = await get_inventory_by_id(inventory_id, db)
+async def _get_inventory_for_update(inventory_id: UUID, db: AsyncSession) -> Inventory:
+    """Lee y bloquea (`FOR UPDATE`) un inventario con sus valores vigentes, aunque ya estuviera en la sesión."""
+    result = await db.execute(
+        select(Inventory)
+        .where(Inventory.id == inventory_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    inventory = result.scalar_one_or_none()
     if not inventory:
+        raise HTTPException(status_code=404, detail="Inventario no encontrado.")
+    return inventory
+
+
+async def delete_inventory(inventory_id: UUID, db: AsyncSession):
+    """
+    Elimina un inventario, validando que exista. El `DELETE ... RETURNING` es la primera escritura: bloquea la
+    fila y devuelve la cantidad vigente, sobre la que se ajustan el stock total, el historial y las alertas.
+    """
+    result = await db.execute(
+        delete(Inventory)
+        .where(Inventory.id == inventory_id)
+        .returning(Inventory.product_id, Inventory.store_id, Inventory.quantity, Inventory.min_stock)
+    )
+    deleted = result.one_or_none()
+    if not deleted:
         raise HTTPException(status_code=404, detail="Inventario no encontrado")
-    await db.delete(inventory)
+    product_id, store_id, quantity, min_stock = deleted
+    await _adjust_product_stock(product_id, -quantity, db)
+    await _record_adjustment(product_id, store_id, -quantity, db)
+    await touch_low_stock_alerts(db, store_id, (quantity, min_stock))
     await db.commit()
+    product_cache.invalidate(product_id)
+    publish_stock_changes([(product_id, store_id, (quantity, min_stock), None)])
     return {"message": "Inventario eliminado correctamente"}
@@ -1,29 +1,180 @@
-from datetime import datetime
+from collections import namedtuple
+from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import Select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from inventory_management_system.core.json_rows import response_columns
+from inventory_management_system.core.pagination import after_cursor, decode_cursor
 from inventory_management_system.models.movement import Movement, MovementType
-from inventory_management_system.schemas.movement import MovementCreate
+from inventory_management_system.schemas.movement import MovementCreate, MovementResponse, MovementResult
+from inventory_management_system.services.archive_service import archive_enabled, get_archived_movements
+from inventory_management_system.services.product_service import get_cached_product, get_existing_product_ids
+from inventory_management_system.services.snapshot_service import check_movement_timestamp, movement_time_window
+from inventory_management_system.services.stock_service import (
+    apply_to_stock,
+    insert_movements,
+    lock_stock,
+    movement_values,
+    publish_stock,
+    write_stock,
+)
+from inventory_management_system.services.store_service import store_registry, validate_store_ids
 
+MAX_BATCH_MOVEMENTS = 1000
+# 🔹 Fila de `get_all_movements(as_rows=True)` para los movimientos que vienen del archivo
+MovementRow = namedtuple("MovementRow", MovementResponse.model_fields)
 
-async def create_movement(movement_data: MovementCreate, db: AsyncSession) -> Movement | None:
-    """Servicio principal para manejar la creación de movimientos de inventario."""
-    movement_data = movement_data.model_copy()
-    movement_data.timestamp = (
-        movement_data.timestamp.replace(tzinfo=None) if movement_data.timestamp else datetime.now().replace(tzinfo=None)
-    )
-    movement_data.type = movement_data.type or MovementType.OUT
-    new_movement = Movement(**movement_data.model_dump(exclude_unset=True))
-    db.add(new_movement)
-    await db.commit()
-    await db.refresh(new_movement)
+
+async def create_movement(movement_data: MovementCreate, db: AsyncSession) -> Movement:
+    """
+    Registra un movimiento y lo aplica al inventario en una sola transacción.
+    - IN suma en la tienda de destino (creando el registro si no existe).
+    - OUT descuenta en la tienda de origen sin dejar stock negativo (ventas del POS).
+    - TRANSFER mueve stock entre tiendas respetando el stock mínimo del origen.
+    - Sin `timestamp` se usa la hora del servidor al escribir; el del cliente se valida con `movement_time_window`.
+    """
+    if not await get_cached_product(db, movement_data.product_id):
+        raise HTTPException(status_code=404, detail="El producto no está registrado en la base de datos.")
+    await validate_store_ids(_movement_store_ids(movement_data), db)
+    try:
+        stock = await lock_stock(_movement_stock_keys(movement_data), db)
+        if _has_client_timestamp(movement_data):
+            check_movement_timestamp(movement_data.timestamp, await movement_time_window(db))
+        apply_to_stock(stock, *_movement_args(movement_data))
+        offsets = await write_stock(stock, [], db)
+        (new_movement,) = await insert_movements([_movement_values(movement_data)], db, returning=True)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    publish_stock(stock, offsets)
     return new_movement
 
 
+async def create_movements_batch(movements: list[MovementCreate], db: AsyncSession) -> list[MovementResult]:
+    """
+    Aplica un lote de movimientos (por ejemplo, las ventas de un POS) en una sola transacción.
+    - Productos y tiendas se validan en lote; las filas afectadas se leen y bloquean una sola vez.
+    - Los movimientos se aplican en orden sobre el stock en memoria: los que fallan se reportan y se omiten.
+    - Cada `(product_id, store_id)` se escribe con un único `UPDATE` aunque la toquen muchos movimientos,
+      y el historial se inserta con un `INSERT` masivo.
+    """
+    results, _ = await apply_movements(movements, db)
+    return results
+
+
+async def apply_movements(
+    movements: list[MovementCreate], db: AsyncSession
+) -> tuple[list[MovementResult], dict[UUID, Movement]]:
+    """
+    Motor de `create_movements_batch`: devuelve los resultados y los movimientos registrados, indexados por `id`.
+    El historial se inserta con un único `INSERT ... RETURNING` de varias filas.
+    """
+    existing_products = await get_existing_product_ids({m.product_id for m in movements}, db)
+    unknown_stores = await store_registry.find_unknown({s for m in movements for s in _movement_store_ids(m)}, db)
+    results: list[MovementResult | None] = [None] * len(movements)
+    pending: list[int] = []
+    for index, movement_data in enumerate(movements):
+        if movement_data.product_id not in existing_products:
+            results[index] = _movement_result(movement_data, 404, "El producto no está registrado en la base de datos.")
+        elif unknown_stores.intersection(_movement_store_ids(movement_data)):
+            results[index] = _movement_result(movement_data, 400, "Tienda no válida.")
+        else:
+            pending.append(index)
+    try:
+        stock = await lock_stock({key for i in pending for key in _movement_stock_keys(movements[i])}, db)
+        ledger = []
+        window = await movement_time_window(db) if any(_has_client_timestamp(movements[i]) for i in pending) else None
+        for index in pending:
+            try:
+                if _has_client_timestamp(movements[index]):
+                    check_movement_timestamp(movements[index].timestamp, window)
+                apply_to_stock(stock, *_movement_args(movements[index]))
+            except HTTPException as exc:
+                results[index] = _movement_result(movements[index], exc.status_code, exc.detail)
+                continue
+            ledger.append(_movement_values(movements[index]))
+            results[index] = _movement_result(movements[index], 201, "Movimiento registrado", id=ledger[-1]["id"])
+        offsets = await write_stock(stock, [], db)
+        created = await insert_movements(ledger, db, returning=True)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    _set_result_stock(results, stock, offsets)
+    publish_stock(stock, offsets)
+    return results, {movement.id: movement for movement in created}
+
+
+def _movement_store_ids(movement_data: MovementCreate) -> tuple[UUID, ...]:
+    return tuple(s for s in (movement_data.source_store_id, movement_data.target_store_id) if s)
+
+
+def _movement_args(movement_data: MovementCreate) -> tuple:
+    """Argumentos de `apply_to_stock`; solo se usan las tiendas que corresponden al tipo de movimiento."""
+    return (
+        movement_data.type,
+        movement_data.product_id,
+        movement_data.source_store_id if movement_data.type != MovementType.IN else None,
+        movement_data.target_store_id if movement_data.type != MovementType.OUT else None,
+        movement_data.quantity,
+    )
+
+
+def _movement_stock_keys(movement_data: MovementCreate) -> set[tuple[UUID, UUID]]:
+    """Filas de inventario `(product_id, store_id)` que modifica el movimiento."""
+    _, product_id, source_store_id, target_store_id, _ = _movement_args(movement_data)
+    return {(product_id, store_id) for store_id in (source_store_id, target_store_id) if store_id}
+
+
+def _has_client_timestamp(movement_data: MovementCreate) -> bool:
+    return "timestamp" in movement_data.model_fields_set
+
+
+def _movement_values(movement_data: MovementCreate) -> dict:
+    """
+    Columnas del movimiento en el historial, tal como se recibió. Sin `timestamp` del cliente se toma la hora actual
+    (con las filas ya bloqueadas), no la de validación del request.
+    """
+    return movement_values(
+        movement_data.type,
+        movement_data.product_id,
+        movement_data.source_store_id,
+        movement_data.target_store_id,
+        movement_data.quantity,
+        timestamp=movement_data.timestamp if _has_client_timestamp(movement_data) else None,
+    )
+
+
+def _movement_result(movement_data: MovementCreate, status_code: int, detail: str, **extra) -> MovementResult:
+    return MovementResult(
+        product_id=movement_data.product_id,
+        source_store_id=movement_data.source_store_id,
+        target_store_id=movement_data.target_store_id,
+        quantity=movement_data.quantity,
+        type=movement_data.type,
+        status_code=status_code,
+        detail=detail,
+        **extra,
+    )
+
+
+def _set_result_stock(results: list[MovementResult], stock: dict, offsets: dict) -> None:
+    """Informa el stock final de las tiendas de cada movimiento aplicado (incluye filas creadas en paralelo)."""
+    for result in results:
+        if result.status_code != 201:
+            continue
+        for store_id, field in ((result.source_store_id, "source_stock"), (result.target_store_id, "target_stock")):
+            key = (result.product_id, store_id)
+            if key in stock:
+                setattr(result, field, stock[key]["quantity"] + offsets.get(key, 0))
+
+
 async def get_all_movements(
     db: AsyncSession,
     skip: int = 0,
@@ -32,30 +183,106 @@ async def get_all_movements(
     movement_type: Optional[MovementType] = None,
     date: Optional[datetime] = None,
     store_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    end_date: Optional[datetime] = None,
+    as_rows: bool = False,
 ) -> Movement | None:
-    """Obtiene todos los movimientos con paginación y filtros."""
-    stmt = select(Movement).order_by(Movement.timestamp.desc()).offset(skip).limit(limit)
-    # Aplicar filtros opcionales
+    """
+    Obtiene todos los movimientos con paginación y filtros, del más reciente al más antiguo.
+    - Con `cursor` (ver `movement_cursor_key`) se pagina por keyset sobre `(timestamp, id)` y se ignora `skip`;
+      una página vacía indica el final en lugar de un 404.
+    - `skip` se mantiene por compatibilidad (OFFSET).
+    - `date` / `end_date` (días incluidos) y el cursor se traducen en rangos simples sobre `timestamp`: en Postgres
+      solo se recorren las particiones mensuales del intervalo.
+    - Si la BD no completa la página y hay archivo (`MOVEMENT_ARCHIVE_DIR`), sigue con los movimientos archivados.
+    - Con `as_rows` devuelve filas con las columnas de `MovementResponse` en lugar de entidades.
+    """
+    filters = {
+        "product_id": product_id,
+        "movement_type": movement_type,
+        "store_id": store_id,
+        "start": datetime.combine(date, datetime.min.time()) if date else None,
+        "end": datetime.combine(end_date, datetime.min.time()) + timedelta(days=1) if end_date else None,
+        "before": decode_cursor(cursor, datetime.fromisoformat, UUID) if cursor else None,
+    }
+    skip = 0 if cursor else skip
+    stmt = _movements_query(**filters)
+    if as_rows:
+        stmt = stmt.with_only_columns(*response_columns(Movement, MovementResponse))
+    result = await db.execute(stmt.order_by(Movement.timestamp.desc(), Movement.id.desc()).limit(limit).offset(skip))
+    movements = list(result.all() if as_rows else result.scalars().all())
+    if len(movements) < limit and archive_enabled():
+        archived = await _archived_page(db, stmt, len(movements), limit, skip, filters)
+        if as_rows:
+            archived = [
+                MovementRow(*(getattr(movement, field) for field in MovementRow._fields)) for movement in archived
+            ]
+        movements += archived
+    if not movements and not cursor:
+        raise HTTPException(status_code=404, detail="No hay movimientos registrados.")
+    return movements
+
+
+def _movements_query(
+    product_id: Optional[UUID],
+    movement_type: Optional[MovementType],
+    store_id: Optional[UUID],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    before: Optional[tuple[datetime, UUID]],
+) -> Select:
+    """Movimientos que cumplen los filtros de `get_all_movements` (`before`: clave del cursor), sin orden."""
+    stmt = select(Movement)
+    if before:
+        stmt = stmt.where(
+            after_cursor((Movement.timestamp, Movement.id), before, descending=True),
+            # 🔹 Redundante, pero la poda de particiones no analiza comparaciones de filas
+            Movement.timestamp <= before[0],
+        )
     if product_id:
         stmt = stmt.where(Movement.product_id == product_id)
     if movement_type:
         stmt = stmt.where(Movement.type == movement_type)
-    if date:
-        stmt = stmt.where(Movement.timestamp >= datetime.combine(date, datetime.min.time()))
+    if start:
+        stmt = stmt.where(Movement.timestamp >= start)
+    if end:
+        stmt = stmt.where(Movement.timestamp < end)
     if store_id:
         stmt = stmt.where((Movement.source_store_id == store_id) | (Movement.target_store_id == store_id))
-    result = await db.execute(stmt)
-    movements = result.scalars().all()
-    if not movements:
-        raise HTTPException(status_code=404, detail="No hay movimientos registrados.")
-    return movements
+    return stmt
+
+
+async def _archived_page(
+    db: AsyncSession, stmt: Select, found: int, limit: int, skip: int, filters: dict
+) -> list[Movement]:
+    """
+    Completa la página con movimientos archivados (todos anteriores a los de la BD). Si la BD no aportó ninguno
+    con `skip`, el desplazamiento en el archivo descuenta los que sí tiene la BD.
+    """
+    offset = 0
+    if not found and skip:
+        offset = max(skip - await db.scalar(select(func.count()).select_from(stmt.subquery())), 0)
+    return await get_archived_movements(db, limit - found, offset, **filters)
+
+
+def movement_cursor_key(movement: Movement) -> tuple:
+    """Clave de orden de un movimiento para el cursor de paginación."""
+    return movement.timestamp, movement.id
 
 
-async def get_movement_by_id(db: AsyncSession, movement_id: UUID) -> Movement | None:
-    """Obtiene un movimiento específico por su ID."""
-    stmt = select(Movement).where(Movement.id == movement_id)
-    result = await db.execute(stmt)
-    movement = result.scalars().first()
+async def get_movement_by_id(db: AsyncSession, movement_id: UUID, as_rows: bool = False) -> Movement | None:
+    """
+    Obtiene un movimiento específico por su ID.
+    Con `as_rows` devuelve una fila con las columnas de `MovementResponse` en lugar de la entidad.
+    """
+    if as_rows:
+        result = await db.execute(
+            select(*response_columns(Movement, MovementResponse)).where(Movement.id == movement_id)
+        )
+        movement = result.first()
+    else:
+        result = await db.execute(select(Movement).where(Movement.id == movement_id))
+        movement = result.scalars().first()
     if not movement:
         raise HTTPException(status_code=404, detail=f"No se encontró un movimiento con ID {movement_id}")
     return movement
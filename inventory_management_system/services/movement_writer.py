@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from inventory_management_system.core.config import MOVEMENT_WRITER_MAX_BATCH, MOVEMENT_WRITER_MAX_DELAY_MS
+from inventory_management_system.db.database import AsyncSessionLocal
+from inventory_management_system.models.movement import Movement
+from inventory_management_system.schemas.movement import MovementCreate
+from inventory_management_system.services.movement_service import apply_movements
+
+_STOP = None  # Marca de cierre en la cola
+
+
+class MovementWriter:
+    """
+    Escritura agrupada (group commit) de movimientos.
+    - `submit()` encola el movimiento y espera su resultado; un único proceso de fondo aplica los movimientos
+      encolados con `apply_movements` (una transacción y un commit por lote).
+    - Un lote se confirma al llegar a `max_batch` movimientos o `max_delay` segundos después del primero.
+    - Cada llamador recibe su `Movement` o la `HTTPException` de su movimiento; si falla el lote completo,
+      todos reciben el error.
+    - `close()` deja de aceptar movimientos y confirma los pendientes antes de terminar.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], max_batch: int, max_delay: float) -> None:
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.batches = self.flushed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._closing
+
+    def start(self) -> None:
+        """Arranca el proceso de fondo en el event loop actual."""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, movement_data: MovementCreate) -> Movement:
+        """Encola un movimiento y devuelve el `Movement` registrado cuando se confirma su lote."""
+        if not self.running:
+            raise RuntimeError("MovementWriter no está en ejecución.")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((movement_data, future))
+        return await future
+
+    async def close(self) -> None:
+        """Confirma los movimientos pendientes y detiene el proceso de fondo."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = self._queue = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "batches": self.batches,
+            "flushed": self.flushed,
+        }
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch, stopping = await self._collect(item)
+            await self._flush(batch)
+
+    async def _collect(self, first: tuple) -> tuple[list[tuple], bool]:
+        """Junta movimientos hasta llenar el lote o agotar `max_delay`; indica si llegó la marca de cierre."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        batch = [first]
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _flush(self, batch: list[tuple]) -> None:
+        # 🔹 Los llamadores que ya se cancelaron (cliente desconectado) no llegan a aplicarse
+        batch = [(movement_data, future) for movement_data, future in batch if not future.done()]
+        if not batch:
+            return
+        try:
+            async with self.session_factory() as session:
+                results, created = await apply_movements([movement_data for movement_data, _ in batch], session)
+        except Exception as exc:
+            logging.exception("Error al confirmar un lote de movimientos")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.batches += 1
+        self.flushed += len(created)
+        for result, (_, future) in zip(results, batch):
+            if future.done():
+                continue
+            if result.status_code == 201:
+                future.set_result(created[result.id])
+            else:
+                future.set_exception(HTTPException(status_code=result.status_code, detail=result.detail))
+
+
+movement_writer = MovementWriter(
+    AsyncSessionLocal, max_batch=MOVEMENT_WRITER_MAX_BATCH, max_delay=MOVEMENT_WRITER_MAX_DELAY_MS / 1000
+)
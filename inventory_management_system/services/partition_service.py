@@ -0,0 +1,213 @@
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from inventory_management_system.core.config import MOVEMENT_PARTITIONS_AHEAD
+from inventory_management_system.db.dialect import is_postgres
+from inventory_management_system.models.movement import Movement
+from inventory_management_system.models.snapshot import MovementBalance
+from inventory_management_system.services.archive_service import archive_movements
+from inventory_management_system.services.snapshot_service import movement_deltas
+
+_PARTITION_NAME = re.compile(r"^movements_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    """Primer instante del mes de `value`."""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Inicio del mes desplazado `months` meses (positivos o negativos) respecto de `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Nombre de la partición de `movements` del mes: `movements_pAAAA_MM`."""
+    return f"movements_p{month.year:04d}_{month.month:02d}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def movements_partitioned(db: AsyncSession) -> bool:
+    """Indica si `movements` es una tabla particionada (solo en Postgres, tras la migración)."""
+    if not is_postgres(db):
+        return False
+    return bool(
+        await db.scalar(
+            text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'movements'::regclass)")
+        )
+    )
+
+
+async def list_movement_partitions(db: AsyncSession) -> list[tuple[str, datetime]]:
+    """Particiones mensuales adjuntas a `movements` como `(nombre, inicio del mes)`, en orden cronológico."""
+    rows = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits AS i JOIN pg_class AS c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = 'movements'::regclass"
+        )
+    )
+    partitions = []
+    for (name,) in rows:
+        match = _PARTITION_NAME.match(name)
+        if match:  # 🔹 `movements_default` no tiene rango
+            partitions.append((name, datetime(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def ensure_movement_partitions(
+    db: AsyncSession, months_ahead: int = MOVEMENT_PARTITIONS_AHEAD, now: Optional[datetime] = None
+) -> list[str]:
+    """
+    Crea las particiones del mes actual y de los `months_ahead` siguientes que aún no existan; devuelve las creadas.
+    - Si `movements_default` ya tiene movimientos del mes (llegaron antes de crear su partición), Postgres rechaza
+      `CREATE TABLE ... PARTITION OF`: la partición se crea aparte, recibe esas filas y se adjunta
+      (`partition_from_default_statements`).
+    - Sin particionado (SQLite o antes de la migración) no hace nada: `movements` es una sola tabla.
+    """
+    if not await movements_partitioned(db):
+        return []
+    current = month_start(now or _utcnow())
+    existing = {name for name, _ in await list_movement_partitions(db)}
+    created = []
+    try:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            if await _default_has_rows(db, month):
+                for statement in partition_from_default_statements(month):
+                    await db.execute(text(statement))
+            else:
+                await db.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF movements"
+                        f" FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+                    )
+                )
+            created.append(name)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return created
+
+
+async def _fold_balances(db: AsyncSession, cutoff: datetime) -> int:
+    """
+    Guarda en `movement_balances` el saldo por `(product_id, store_id)` de todo el historial anterior a `cutoff`:
+    el último saldo guardado más los movimientos desde entonces. Devuelve el número de filas escritas.
+    """
+    previous_at = await db.scalar(
+        select(func.max(MovementBalance.balance_at)).where(MovementBalance.balance_at < cutoff)
+    )
+    balances: dict = {}
+    window = Movement.timestamp < cutoff
+    if previous_at is not None:
+        window &= Movement.timestamp >= previous_at
+        rows = await db.execute(
+            select(MovementBalance.product_id, MovementBalance.store_id, MovementBalance.quantity).where(
+                MovementBalance.balance_at == previous_at
+            )
+        )
+        balances = {(product_id, store_id): quantity for product_id, store_id, quantity in rows}
+    for product_id, store_id, delta in await db.execute(movement_deltas(window)):
+        balances[(product_id, store_id)] = balances.get((product_id, store_id), 0) + delta
+    values = [
+        {"balance_at": cutoff, "product_id": product_id, "store_id": store_id, "quantity": quantity}
+        for (product_id, store_id), quantity in balances.items()
+        if store_id is not None
+    ]
+    if values:
+        await db.execute(insert(MovementBalance), values)
+    return len(values)
+
+
+async def _default_has_rows(db: AsyncSession, month: datetime) -> bool:
+    """Indica si `movements_default` tiene movimientos del mes de `month`."""
+    return bool(
+        await db.scalar(
+            text(
+                "SELECT to_regclass('movements_default') IS NOT NULL AND EXISTS ("
+                'SELECT 1 FROM movements_default WHERE "timestamp" >= :start AND "timestamp" < :end)'
+            ),
+            {"start": month, "end": add_months(month, 1)},
+        )
+    )
+
+
+def partition_from_default_statements(month: datetime) -> list[str]:
+    """
+    Sentencias que crean la partición del mes con las filas que ya están en `movements_default`: una tabla con la
+    estructura de `movements`, a la que se mueven esas filas, adjuntada después (`ATTACH PARTITION` crea sus
+    índices y claves, y comprueba que `movements_default` ya no tiene filas del rango).
+    `movements_default` se bloquea primero para que no reciba filas del mes mientras se mueven; `movements` sigue
+    admitiendo lecturas y escrituras del resto de meses.
+    """
+    name = partition_name(month)
+    start, end = f"{month:%Y-%m-%d}", f"{add_months(month, 1):%Y-%m-%d}"
+    in_month = f"\"timestamp\" >= '{start}' AND \"timestamp\" < '{end}'"
+    return [
+        "LOCK TABLE movements_default IN EXCLUSIVE MODE",
+        f"CREATE TABLE {name} (LIKE movements INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"INSERT INTO {name} SELECT * FROM movements_default WHERE {in_month}",
+        f"DELETE FROM movements_default WHERE {in_month}",
+        f"ALTER TABLE movements ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')",
+    ]
+
+
+async def expire_movements(
+    db: AsyncSession,
+    retention_months: int,
+    drop: bool = False,
+    now: Optional[datetime] = None,
+    archive_dir: Optional[str] = None,
+) -> dict:
+    """
+    Retira del historial los movimientos de los meses anteriores a los últimos `retention_months` completos.
+    - Primero guarda el saldo acumulado hasta el corte en `movement_balances`, para que la conciliación siga
+      cuadrando sin esos movimientos.
+    - En Postgres separa (`DETACH PARTITION`) las particiones expiradas, que quedan como tablas de archivo con su
+      nombre, o las elimina con `drop=True`; lo que quede antes del corte (`movements_default`) se borra.
+    - En SQLite (o sin particionado) borra las filas anteriores al corte.
+    - Con `archive_dir`, antes de retirarlos copia los movimientos al archivo columnar (`archive_movements`), que
+      `get_all_movements` sigue consultando.
+    Devuelve `{cutoff, balances, archived, partitions, deleted}`; si el corte ya se aplicó no hace nada.
+    """
+    cutoff = add_months(month_start(now or _utcnow()), -retention_months)
+    report = {"cutoff": cutoff, "balances": 0, "archived": 0, "partitions": [], "deleted": 0}
+    try:
+        latest = await db.scalar(select(func.max(MovementBalance.balance_at)))
+        if latest is not None and latest >= cutoff:
+            await db.rollback()
+            return report
+        if is_postgres(db):
+            # 🔹 Ningún movimiento anterior al corte puede registrarse mientras se calcula el saldo
+            await db.execute(text("LOCK TABLE movements IN SHARE ROW EXCLUSIVE MODE"))
+        report["balances"] = await _fold_balances(db, cutoff)
+        if archive_dir:
+            report["archived"] = await archive_movements(db, cutoff, archive_dir)
+        if await movements_partitioned(db):
+            for name, month in await list_movement_partitions(db):
+                if add_months(month, 1) > cutoff:
+                    break
+                await db.execute(text(f"ALTER TABLE movements DETACH PARTITION {name}"))
+                if drop:
+                    await db.execute(text(f"DROP TABLE {name}"))
+                report["partitions"].append(name)
+        result = await db.execute(delete(Movement).where(Movement.timestamp < cutoff))
+        report["deleted"] = result.rowcount
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return report
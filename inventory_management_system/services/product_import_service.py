@@ -0,0 +1,238 @@
+import codecs
+import csv
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from asyncpg import PostgresError
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from inventory_management_system.db.dialect import is_postgres
+from inventory_management_system.models.product import Product
+from inventory_management_system.schemas.product import ProductCreate, ProductImportError, ProductImportSummary
+from inventory_management_system.services.product_service import new_product_id
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+MAX_CSV_RECORD_LINES = 100
+PRODUCT_COLUMNS = ("id", "name", "description", "category", "price", "sku")
+UNCLOSED_QUOTE_ERROR = "Campo entre comillas sin cerrar"
+
+# (número de fila, datos de la fila o None, error de lectura o None)
+ParsedRow = tuple[int, Optional[dict[str, Any]], Optional[str]]
+
+
+async def import_products(lines: AsyncIterator[str], file_format: str, db: AsyncSession) -> ProductImportSummary:
+    """
+    Importa productos desde un flujo de líneas NDJSON o CSV sin cargar el archivo completo en memoria.
+    - Las filas se validan con `ProductCreate` en bloques de `IMPORT_CHUNK_SIZE`.
+    - Los conflictos de SKU/nombre de cada bloque se resuelven con una sola consulta `IN (...)`.
+    - Cada bloque se escribe en bloque (COPY en Postgres, `executemany` en SQLite) y se confirma por separado.
+    """
+    summary = ProductImportSummary()
+    rows = _parse_csv(lines) if file_format == "csv" else _parse_ndjson(lines)
+    chunk: list[ParsedRow] = []
+    async for parsed_row in rows:
+        chunk.append(parsed_row)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await _import_chunk(chunk, db, summary)
+            chunk = []
+    if chunk:
+        await _import_chunk(chunk, db, summary)
+    return summary
+
+
+async def iter_lines(byte_chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Convierte un flujo de bytes UTF-8 en líneas, guardando en memoria solo la línea incompleta."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in byte_chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _parse_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """Lee un objeto JSON por línea, ignorando líneas vacías."""
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row_number, None, f"JSON inválido: {exc.msg}"
+            continue
+        if not isinstance(data, dict):
+            yield row_number, None, "Cada línea debe ser un objeto JSON"
+            continue
+        yield row_number, data, None
+
+
+async def _parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """Lee un CSV con encabezado; admite campos entre comillas que contienen saltos de línea."""
+    reader = _CsvRecordReader()
+    header: Optional[list[str]] = None
+    row_number = 0
+
+    async def _records() -> AsyncIterator[tuple[Optional[list[str]], Optional[str]]]:
+        async for line in lines:
+            for record in reader.feed(line):
+                yield record
+        for record in reader.close():
+            yield record
+
+    async for values, error in _records():
+        if header is None and values is not None:
+            header = [column.strip() for column in values]
+            continue
+        row_number += 1
+        if error:
+            yield row_number, None, error
+        elif len(values) != len(header):
+            yield row_number, None, f"Se esperaban {len(header)} columnas y se recibieron {len(values)}"
+        else:
+            yield row_number, dict(zip(header, values)), None
+
+
+class _CsvRecordReader:
+    """
+    Agrupa líneas en registros CSV dejando que el módulo `csv` decida si un campo entre comillas continúa.
+    - Una comilla dentro de un campo sin comillas (`Tubo 3" PVC`) es un carácter literal.
+    - Un campo entre comillas que no se cierra en `MAX_CSV_RECORD_LINES` líneas (o al final del archivo) se
+      reporta como error de su primera línea y las líneas siguientes se vuelven a procesar como registros.
+    """
+
+    def __init__(self) -> None:
+        self.pending: list[str] = []
+
+    def feed(self, line: str) -> Iterator[tuple[Optional[list[str]], Optional[str]]]:
+        queue = deque([line])
+        while queue:
+            self.pending.append(queue.popleft())
+            try:
+                values = next(csv.reader(["\n".join(self.pending)], strict=True), [])
+            except csv.Error as exc:
+                if "unexpected end of data" not in str(exc):
+                    self.pending = []
+                    yield None, f"CSV inválido: {exc}"
+                elif len(self.pending) >= MAX_CSV_RECORD_LINES:
+                    queue.extendleft(reversed(self.pending[1:]))
+                    self.pending = []
+                    yield None, UNCLOSED_QUOTE_ERROR
+                continue
+            self.pending = []
+            if values:
+                yield values, None
+
+    def close(self) -> Iterator[tuple[Optional[list[str]], Optional[str]]]:
+        while self.pending:
+            rest, self.pending = self.pending[1:], []
+            yield None, UNCLOSED_QUOTE_ERROR
+            for line in rest:
+                yield from self.feed(line)
+
+
+async def _import_chunk(chunk: list[ParsedRow], db: AsyncSession, summary: ProductImportSummary) -> None:
+    """Valida, deduplica e inserta un bloque de filas."""
+    summary.total_rows += len(chunk)
+    valid = _validate_rows(chunk, summary)
+    accepted = await _drop_conflicts(valid, db, summary)
+    if accepted:
+        await _write_rows(accepted, db, summary)
+
+
+def _validate_rows(chunk: list[ParsedRow], summary: ProductImportSummary) -> list[tuple[int, ProductCreate]]:
+    """Valida las filas del bloque con `ProductCreate`, registrando las que fallan."""
+    valid: list[tuple[int, ProductCreate]] = []
+    for row_number, data, error in chunk:
+        if error:
+            _add_error(summary, row_number, None, error)
+            continue
+        try:
+            valid.append((row_number, ProductCreate.model_validate(data)))
+        except ValidationError as exc:
+            sku = data.get("sku")
+            _add_error(summary, row_number, sku if isinstance(sku, str) else None, _format_validation_error(exc))
+    return valid
+
+
+async def _drop_conflicts(
+    valid: list[tuple[int, ProductCreate]], db: AsyncSession, summary: ProductImportSummary
+) -> list[tuple[int, ProductCreate]]:
+    """Descarta las filas cuyo SKU o nombre ya existe en la BD o se repite dentro del bloque."""
+    taken_skus, taken_names = await _find_existing_skus_and_names(valid, db)
+    accepted: list[tuple[int, ProductCreate]] = []
+    for row_number, product in valid:
+        if product.sku in taken_skus or product.name in taken_names:
+            _add_error(summary, row_number, product.sku, "Ya existe un producto con este SKU o nombre")
+            continue
+        taken_skus.add(product.sku)
+        taken_names.add(product.name)
+        accepted.append((row_number, product))
+    return accepted
+
+
+async def _write_rows(
+    accepted: list[tuple[int, ProductCreate]], db: AsyncSession, summary: ProductImportSummary
+) -> None:
+    """
+    Inserta y confirma el bloque. Si la BD lo rechaza (p. ej. otro proceso creó el mismo SKU entre la consulta
+    de conflictos y el COPY), se deshace solo ese bloque y sus filas se reportan como error.
+    """
+    try:
+        await _insert_products([{"id": new_product_id(), **product.model_dump()} for _, product in accepted], db)
+        await db.commit()
+    except (SQLAlchemyError, PostgresError) as exc:
+        await db.rollback()
+        detail = f"No se pudo insertar el bloque: {exc.__class__.__name__}. Reintenta estas filas."
+        for row_number, product in accepted:
+            _add_error(summary, row_number, product.sku, detail)
+        return
+    summary.created += len(accepted)
+
+
+async def _find_existing_skus_and_names(
+    products: list[tuple[int, ProductCreate]], db: AsyncSession
+) -> tuple[set[str], set[str]]:
+    """Obtiene, con una sola consulta, los SKU y nombres del bloque que ya existen en la BD."""
+    if not products:
+        return set(), set()
+    skus = {product.sku for _, product in products}
+    names = {product.name for _, product in products}
+    result = await db.execute(select(Product.sku, Product.name).where(Product.sku.in_(skus) | Product.name.in_(names)))
+    rows = result.all()
+    return {sku for sku, _ in rows}, {name for _, name in rows}
+
+
+async def _insert_products(rows: list[dict[str, Any]], db: AsyncSession) -> None:
+    """Inserta productos con COPY en Postgres o con un INSERT `executemany` en el resto de dialectos."""
+    if is_postgres(db):
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Product.__tablename__,
+            records=[tuple(row[column] for column in PRODUCT_COLUMNS) for row in rows],
+            columns=PRODUCT_COLUMNS,
+        )
+    else:
+        await db.execute(insert(Product), rows)
+
+
+def _add_error(summary: ProductImportSummary, row: int, sku: Optional[str], detail: str) -> None:
+    summary.failed += 1
+    if len(summary.errors) < MAX_REPORTED_ERRORS:
+        summary.errors.append(ProductImportError(row=row, sku=sku, detail=detail))
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, error['loc'])) or 'fila'}: {error['msg']}" for error in exc.errors())
@@ -1,14 +1,33 @@
 import uuid
 
 from fastapi import HTTPException
+from sqlalchemy import func, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from inventory_management_system.core.cache import TTLCache
+from inventory_management_system.core.config import (
+    PRODUCT_CACHE_MAXSIZE,
+    PRODUCT_CACHE_NEGATIVE_TTL,
+    PRODUCT_CACHE_TTL,
+)
+from inventory_management_system.core.ids import id_generator
+from inventory_management_system.core.json_rows import response_columns
+from inventory_management_system.core.pagination import after_cursor, decode_cursor
+from inventory_management_system.db.dialect import is_replica
+from inventory_management_system.db.writes import insert_returning, update_returning
+from inventory_management_system.models.inventory import Inventory
 from inventory_management_system.models.product import Product
-from inventory_management_system.schemas.product import ProductCreate, ProductUpdate
+from inventory_management_system.schemas.product import ProductCreate, ProductResponse, ProductUpdate
+from inventory_management_system.services.alert_service import bump_low_stock_alerts_version
 
 UUID = uuid.UUID
+new_product_id = id_generator(Product.__tablename__)
+
+# 🔹 Caché de productos del worker: se invalida en cada escritura de productos o de su stock total
+product_cache = TTLCache(maxsize=PRODUCT_CACHE_MAXSIZE, ttl=PRODUCT_CACHE_TTL)
+_NOT_CACHED = object()
 
 
 # Obtener todos los productos con filtros y paginación (ASYNC)
@@ -19,8 +38,17 @@ async def get_products(
     max_price: float = None,
     skip: int = 0,
     limit: int = 10,
+    cursor: str | None = None,
+    as_rows: bool = False,
 ):
-    query = select(Product)
+    """
+    Lista productos ordenados por `(name, id)`.
+    - Con `cursor` (ver `product_cursor_key`) se pagina por keyset y se ignora `skip`.
+    - `skip` se mantiene por compatibilidad (OFFSET).
+    - Con `as_rows` devuelve filas con las columnas de `ProductResponse` en lugar de entidades.
+    """
+    query = select(*response_columns(Product, ProductResponse)) if as_rows else select(Product)
+    query = query.order_by(Product.name, Product.id)
     if not Product.id:
         raise HTTPException(status_code=404, detail="No hay productos existentes")
     if category:
@@ -30,21 +58,70 @@ async def get_products(
     if max_price:
         query = query.where(Product.price <= max_price)
 
-    query = query.offset(skip).limit(limit)  # Aplicar paginación
+    if cursor:
+        query = query.where(after_cursor((Product.name, Product.id), decode_cursor(cursor, str, UUID)))
+    else:
+        query = query.offset(skip)
+    query = query.limit(limit)  # Aplicar paginación
     result = await db.execute(query)
-    return result.scalars().all()
+    return result.all() if as_rows else result.scalars().all()
+
+
+def product_cursor_key(product: Product) -> tuple:
+    """Clave de orden de un producto para el cursor de paginación."""
+    return product.name, product.id
 
 
-# Obtener un producto por ID (ASYNC)
+# Obtener un producto por ID (ASYNC, a través de la caché)
 async def get_product_by_id(db: AsyncSession, product_id: UUID):
-    query = select(Product).where(Product.id == product_id)
-    result = await db.execute(query)
-    product = result.scalar_one_or_none()
+    product = await get_cached_product(db, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
     return product
 
 
+async def get_cached_product(db: AsyncSession, product_id: UUID) -> ProductResponse | None:
+    """
+    Obtiene una copia inmutable (`ProductResponse`) del producto desde `product_cache` o, si no está, de la BD.
+    Los IDs inexistentes se guardan como `None` con un TTL corto (caché negativa).
+    """
+    cached = product_cache.get(product_id, _NOT_CACHED)
+    if cached is not _NOT_CACHED:
+        return cached
+    version = product_cache.version
+    result = await db.execute(select(Product).where(Product.id == product_id))
+    product = result.scalar_one_or_none()
+    snapshot = ProductResponse.model_validate(product) if product else None
+    if is_replica(db):
+        return snapshot  # 🔹 Una réplica con retraso no debe fijar en la caché un producto ausente o desactualizado
+    if not product:
+        product_cache.set(product_id, None, ttl=PRODUCT_CACHE_NEGATIVE_TTL, version=version)
+        return None
+    product_cache.set(product_id, snapshot, version=version)
+    return snapshot
+
+
+async def get_existing_product_ids(product_ids: set[UUID], db: AsyncSession) -> set[UUID]:
+    """Devuelve cuáles de los productos indicados existen: primero la caché, y los demás con una sola consulta."""
+    existing: set[UUID] = set()
+    unknown: set[UUID] = set()
+    for product_id in product_ids:
+        cached = product_cache.get(product_id, _NOT_CACHED)
+        if cached is _NOT_CACHED:
+            unknown.add(product_id)
+        elif cached is not None:
+            existing.add(product_id)
+    if unknown:
+        result = await db.execute(select(Product.id).where(Product.id.in_(unknown)))
+        existing.update(result.scalars().all())
+    return existing
+
+
+def get_product_cache_stats() -> dict:
+    """Estadísticas de la caché de productos del worker actual."""
+    return product_cache.stats()
+
+
 async def create_product(db: AsyncSession, product_data: ProductCreate):
     """Crea un nuevo producto en la base de datos con validación de duplicados."""
     try:
@@ -54,18 +131,10 @@ async def create_product(db: AsyncSession, product_data: ProductCreate):
         )
         if existing_product.scalar_one_or_none():
             raise HTTPException(status_code=400, detail="Ya existe un producto con este SKU o nombre")
-        # Crear el nuevo producto
-        new_product = Product(
-            id=uuid.uuid4(),
-            name=product_data.name,
-            description=product_data.description,
-            category=product_data.category,
-            price=product_data.price,
-            sku=product_data.sku,
-        )
-        db.add(new_product)
+        # Crear el nuevo producto (`INSERT ... RETURNING`: sin `refresh()` tras el commit)
+        new_product = await insert_returning(db, Product, {"id": new_product_id(), **product_data.model_dump()})
         await db.commit()
-        await db.refresh(new_product)
+        product_cache.invalidate(new_product.id)
         return new_product
     except SQLAlchemyError as e:
         await db.rollback()  # Deshacer cambios si ocurre un error
@@ -74,22 +143,18 @@ async def create_product(db: AsyncSession, product_data: ProductCreate):
 
 # Actualizar producto existente (ASYNC)
 async def update_product(db: AsyncSession, product_id: UUID, product_data: ProductUpdate):
+    """Actualiza los campos indicados con un único `UPDATE ... RETURNING` (404 si el producto no existe)."""
     if isinstance(product_id, str):
         try:
             product_id = UUID(product_id)
         except ValueError:
             raise HTTPException(status_code=400, detail="ID de producto con formato invalido")
-    query = select(Product).where(Product.id == product_id)
-    result = await db.execute(query)
-    product = result.scalar_one_or_none()
+    update_fields = product_data.model_dump(exclude_unset=True)
+    product = await update_returning(db, Product, Product.id == product_id, update_fields)
     if not product:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
-    update_fields = product_data.model_dump(exclude_unset=True)
-    for key, value in update_fields.items():
-        setattr(product, key, value)
-
     await db.commit()
-    await db.refresh(product)
+    product_cache.invalidate(product_id)
     return product
 
 
@@ -101,6 +166,38 @@ async def delete_product(db: AsyncSession, product_id: UUID):
     if not product:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
 
+    # 🔹 El borrado en cascada de su inventario quita sus filas en alerta: cambia la versión de esas tiendas
+    low_stock_stores = await db.scalars(
+        select(Inventory.store_id).where(Inventory.product_id == product_id, Inventory.quantity <= Inventory.min_stock)
+    )
+    await bump_low_stock_alerts_version(db, low_stock_stores.all())
     await db.delete(product)
     await db.commit()
+    product_cache.invalidate(product_id)
     return {"message": "Producto eliminado exitosamente"}
+
+
+async def check_stock_totals(db: AsyncSession, fix: bool = False) -> list[dict]:
+    """
+    Compara `products.stock_total` con `SUM(inventory.quantity)` en una sola consulta agregada.
+    - Devuelve los productos con diferencias (`product_id`, `stock_total`, `expected`).
+    - Con `fix=True` corrige los totales en un único `UPDATE` masivo.
+    """
+    expected = (
+        select(Inventory.product_id, func.sum(Inventory.quantity).label("quantity"))
+        .group_by(Inventory.product_id)
+        .subquery()
+    )
+    expected_quantity = func.coalesce(expected.c.quantity, 0)
+    query = (
+        select(Product.id.label("product_id"), Product.stock_total, expected_quantity.label("expected"))
+        .outerjoin(expected, expected.c.product_id == Product.id)
+        .where(Product.stock_total != expected_quantity)
+    )
+    drift = [dict(row) for row in (await db.execute(query)).mappings().all()]
+    if fix and drift:
+        await db.execute(update(Product), [{"id": row["product_id"], "stock_total": row["expected"]} for row in drift])
+        await db.commit()
+        for row in drift:
+            product_cache.invalidate(row["product_id"])
+    return drift
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, true
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from inventory_management_system.db.dialect import is_postgres
+from inventory_management_system.models.inventory import Inventory
+from inventory_management_system.models.movement import Movement
+from inventory_management_system.models.snapshot import MovementBalance
+from inventory_management_system.models.store import Store
+from inventory_management_system.services.snapshot_service import movement_deltas
+from inventory_management_system.services.stock_service import adjustment_values, insert_movements
+
+RECONCILE_CONCURRENCY = 4
+
+
+async def reconcile_store(db: AsyncSession, store_id: UUID, fix: bool = False) -> list[dict]:
+    """
+    Compara el inventario de una tienda con el stock que implica su historial completo de movimientos.
+    - El historial se agrega en la BD por producto (`movement_deltas`): no se transfieren los movimientos.
+    - Si se retiraron movimientos antiguos (`expire_movements`), parte del último saldo guardado en
+      `movement_balances` y suma solo los movimientos posteriores.
+    - Historial e inventario se leen en la misma transacción (`REPEATABLE READ` en Postgres), del mismo instante.
+    - Devuelve las diferencias (`expected`, `actual`, `drift = actual - expected`) ordenadas por producto.
+    - Con `fix=True` registra un movimiento de ajuste por diferencia (IN si sobra stock, OUT si falta), de modo
+      que el historial explique el inventario; `inventory` no se modifica.
+    """
+    try:
+        if is_postgres(db):
+            await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        expected = {}
+        window = true()
+        balance_at = await db.scalar(select(func.max(MovementBalance.balance_at)))
+        if balance_at is not None:
+            window = Movement.timestamp >= balance_at
+            balances = select(MovementBalance.product_id, MovementBalance.quantity).where(
+                (MovementBalance.balance_at == balance_at) & (MovementBalance.store_id == store_id)
+            )
+            expected.update((await db.execute(balances)).tuples().all())
+        for product_id, _, delta in await db.execute(movement_deltas(window, store_id=store_id)):
+            expected[product_id] = expected.get(product_id, 0) + delta
+        actual = dict(
+            (await db.execute(select(Inventory.product_id, Inventory.quantity).where(Inventory.store_id == store_id)))
+            .tuples()
+            .all()
+        )
+        drift = [
+            {
+                "product_id": product_id,
+                "store_id": store_id,
+                "expected": expected.get(product_id, 0),
+                "actual": actual.get(product_id, 0),
+                "drift": actual.get(product_id, 0) - expected.get(product_id, 0),
+            }
+            for product_id in sorted(expected.keys() | actual.keys(), key=str)
+            if actual.get(product_id, 0) != expected.get(product_id, 0)
+        ]
+        if fix and drift:
+            await insert_movements([adjustment_values(row["product_id"], store_id, row["drift"]) for row in drift], db)
+            await db.commit()
+        else:
+            await db.rollback()
+    except Exception:
+        await db.rollback()
+        raise
+    return drift
+
+
+async def reconcile_inventory(
+    session_factory: async_sessionmaker[AsyncSession],
+    store_ids: Optional[Iterable[UUID]] = None,
+    fix: bool = False,
+    concurrency: int = RECONCILE_CONCURRENCY,
+) -> dict:
+    """
+    Concilia las tiendas indicadas (por defecto, todas las registradas) y devuelve el informe de diferencias.
+    Cada tienda es una unidad independiente, con su propia sesión y transacción, y se procesan hasta `concurrency`
+    a la vez (en SQLite, una a una: admite un solo escritor).
+    """
+    checked_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with session_factory() as session:
+        if store_ids is None:
+            store_ids = (await session.scalars(select(Store.id).order_by(Store.id))).all()
+        if not is_postgres(session):
+            concurrency = 1
+    store_ids = list(store_ids)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def reconcile(store_id: UUID) -> list[dict]:
+        async with semaphore, session_factory() as session:
+            return await reconcile_store(session, store_id, fix=fix)
+
+    reports = await asyncio.gather(*(reconcile(store_id) for store_id in store_ids))
+    return {
+        "checked_at": checked_at,
+        "stores": len(store_ids),
+        "fixed": fix,
+        "items": [row for report in reports for row in report],
+    }
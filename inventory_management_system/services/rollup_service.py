@@ -0,0 +1,268 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from inventory_management_system.core.pagination import after_cursor, decode_cursor
+from inventory_management_system.db.dialect import dialect_insert, is_postgres
+from inventory_management_system.models.movement import Movement, MovementType
+from inventory_management_system.models.rollup import MovementRollup
+from inventory_management_system.models.snapshot import MovementBalance
+from inventory_management_system.services.partition_service import (
+    list_movement_partitions,
+    month_start,
+    movements_partitioned,
+    partition_name,
+)
+
+ROLLUP_COLUMNS = ("in_quantity", "out_quantity", "transfer_in_quantity", "transfer_out_quantity", "movements")
+BACKFILL_CHUNK_SIZE = 10000
+
+
+class RollupGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+def rollup_bucket(timestamp: datetime, granularity: RollupGranularity) -> datetime:
+    """Inicio del intervalo (hora o día) que contiene `timestamp`."""
+    if granularity == RollupGranularity.DAY:
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def aggregate_rollups(movements: Iterable) -> dict[tuple, dict[str, int]]:
+    """
+    Agrega movimientos (filas de `movements` o diccionarios con sus columnas) por
+    `(granularity, bucket, product_id, store_id)`, para cada granularidad.
+    """
+    rollups: dict[tuple, dict[str, int]] = defaultdict(lambda: dict.fromkeys(ROLLUP_COLUMNS, 0))
+    for movement in movements:
+        get = movement.get if isinstance(movement, dict) else movement._mapping.get
+        for store_id, column in _rollup_targets(get("type"), get("source_store_id"), get("target_store_id")):
+            for granularity in RollupGranularity:
+                row = rollups[
+                    (granularity.value, rollup_bucket(get("timestamp"), granularity), get("product_id"), store_id)
+                ]
+                row[column] += get("quantity")
+                row["movements"] += 1
+    return rollups
+
+
+def _rollup_targets(movement_type, source_store_id, target_store_id) -> list[tuple[UUID, str]]:
+    """Tiendas afectadas por un movimiento y la columna del agregado que suma en cada una."""
+    if movement_type == MovementType.IN:
+        return [(target_store_id, "in_quantity")]
+    if movement_type == MovementType.OUT:
+        return [(source_store_id, "out_quantity")]
+    return [(source_store_id, "transfer_out_quantity"), (target_store_id, "transfer_in_quantity")]
+
+
+async def record_rollups(movements: Iterable, db: AsyncSession) -> None:
+    """
+    Suma los movimientos a sus agregados horarios y diarios dentro de la transacción en curso.
+    Un solo upsert masivo (`INSERT ... ON CONFLICT DO UPDATE` con `executemany`) por lote de movimientos.
+    """
+    rollups = aggregate_rollups(movements)
+    if not rollups:
+        return
+    stmt = dialect_insert(db, MovementRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            MovementRollup.granularity,
+            MovementRollup.bucket,
+            MovementRollup.product_id,
+            MovementRollup.store_id,
+        ],
+        set_={column: getattr(MovementRollup, column) + getattr(stmt.excluded, column) for column in ROLLUP_COLUMNS},
+    )
+    await db.execute(
+        stmt,
+        [
+            {"granularity": granularity, "bucket": bucket, "product_id": product_id, "store_id": store_id, **values}
+            for (granularity, bucket, product_id, store_id), values in sorted(rollups.items(), key=_rollup_sort_key)
+        ],
+    )
+
+
+def _rollup_sort_key(item: tuple) -> tuple:
+    # 🔹 Orden estable de claves: dos transacciones concurrentes bloquean las filas en el mismo orden
+    granularity, bucket, product_id, store_id = item[0]
+    return granularity, bucket, str(product_id), str(store_id)
+
+
+async def backfill_rollups(
+    db: AsyncSession, since: Optional[datetime] = None, chunk_size: int = BACKFILL_CHUNK_SIZE
+) -> int:
+    """
+    Reconstruye los agregados desde `movements` (todos, o desde el día de `since`) y devuelve los movimientos leídos.
+    - Nunca antes del último corte de `expire_movements` (ver `_backfill_start`).
+    - Avanza día a día hasta el último movimiento (o agregado), con una transacción y un commit por día
+      (`_backfill_day`): un error no deshace los días ya reconstruidos y ningún bloqueo dura más que un día.
+    """
+    try:
+        start = await _backfill_start(db, since)
+        movements_range = select(func.min(Movement.timestamp), func.max(Movement.timestamp))
+        rollups_range = select(func.min(MovementRollup.bucket), func.max(MovementRollup.bucket)).where(
+            MovementRollup.granularity == RollupGranularity.DAY.value
+        )
+        if start:
+            movements_range = movements_range.where(Movement.timestamp >= start)
+            rollups_range = rollups_range.where(MovementRollup.bucket >= start)
+        # 🔹 El rango cubre también los agregados sin movimientos, que se borran
+        bounds = [*(await db.execute(movements_range)).one(), *(await db.execute(rollups_range)).one()]
+        first = min(filter(None, bounds), default=None)
+        last = max(filter(None, bounds), default=None)
+        lock_tables = await _backfill_lock_tables(db)
+        await db.rollback()
+    except Exception:
+        await db.rollback()
+        raise
+    total = 0
+    if first is None:
+        return total
+    day = rollup_bucket(first, RollupGranularity.DAY)
+    while day <= last:
+        total += await _backfill_day(db, day, chunk_size, lock_tables)
+        day += timedelta(days=1)
+    return total
+
+
+async def _backfill_lock_tables(db: AsyncSession) -> Optional[set[str]]:
+    """Particiones de `movements` que puede bloquear `_backfill_day`; `None` si la tabla no está particionada."""
+    if not await movements_partitioned(db):
+        return None
+    return {name for name, _ in await list_movement_partitions(db)}
+
+
+async def _backfill_day(db: AsyncSession, day: datetime, chunk_size: int, lock_tables: Optional[set[str]]) -> int:
+    """
+    Reconstruye los agregados (horarios y diario) de `day` en su propia transacción y devuelve los movimientos leídos.
+    - En Postgres bloquea contra inserciones (`SHARE`) solo la tabla que recibe los movimientos del día: la partición
+      del mes, `movements_default` si no existe, o `movements` sin particionado. Las escrituras de los demás meses y
+      las lecturas siguen; las del mes esperan al commit del día y no se cuentan dos veces.
+    - Borra los agregados del día y recorre sus movimientos por keyset `(timestamp, id)` en bloques de
+      `chunk_size`, sumando cada bloque con `record_rollups`: la memoria usada no depende del tamaño del día.
+    """
+    end = day + timedelta(days=1)
+    try:
+        if is_postgres(db):
+            table = "movements"
+            if lock_tables is not None:
+                table = partition_name(month_start(day))
+                table = table if table in lock_tables else "movements_default"
+            await db.execute(text(f"LOCK TABLE {table} IN SHARE MODE"))
+        await db.execute(
+            delete(MovementRollup).where(
+                MovementRollup.granularity.in_([granularity.value for granularity in RollupGranularity]),
+                MovementRollup.bucket >= day,
+                MovementRollup.bucket < end,
+            )
+        )
+        total = 0
+        last_key = None
+        while True:
+            query = (
+                select(
+                    Movement.id,
+                    Movement.product_id,
+                    Movement.source_store_id,
+                    Movement.target_store_id,
+                    Movement.quantity,
+                    Movement.timestamp,
+                    Movement.type,
+                )
+                .where(Movement.timestamp >= day, Movement.timestamp < end)
+                .order_by(Movement.timestamp, Movement.id)
+            )
+            if last_key:
+                query = query.where(after_cursor((Movement.timestamp, Movement.id), last_key))
+            chunk = (await db.execute(query.limit(chunk_size))).all()
+            if not chunk:
+                break
+            await record_rollups(chunk, db)
+            total += len(chunk)
+            last_key = (chunk[-1].timestamp, chunk[-1].id)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return total
+
+
+async def _backfill_start(db: AsyncSession, since: Optional[datetime]) -> Optional[datetime]:
+    """
+    Primer intervalo a reconstruir: el día de `since` (o todo el historial), pero no antes de
+    `max(movement_balances.balance_at)`. Los movimientos anteriores ya se retiraron de `movements`, así que sus
+    agregados se conservan en lugar de borrarse sin poder reconstruirlos.
+    """
+    start = rollup_bucket(since, RollupGranularity.DAY) if since else None
+    expired_until = await db.scalar(select(func.max(MovementBalance.balance_at)))
+    if expired_until is not None and (start is None or start < expired_until):
+        return expired_until
+    return start
+
+
+async def get_movement_rollups(
+    db: AsyncSession,
+    granularity: RollupGranularity = RollupGranularity.DAY,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    product_id: Optional[UUID] = None,
+    store_id: Optional[UUID] = None,
+    limit: int = 1000,
+    cursor: Optional[str] = None,
+) -> list[dict]:
+    """
+    Agregados de movimientos ordenados por `(bucket, product_id, store_id)`, con `net_quantity` calculado.
+    - `start` incluido y `end` excluido; se comparan con el inicio de cada intervalo.
+    - Con `cursor` (ver `rollup_cursor_key`) se pagina por keyset.
+    """
+    query = (
+        select(MovementRollup)
+        .where(MovementRollup.granularity == granularity.value)
+        .order_by(MovementRollup.bucket, MovementRollup.product_id, MovementRollup.store_id)
+        .limit(limit)
+    )
+    if start:
+        query = query.where(MovementRollup.bucket >= rollup_bucket(start, granularity))
+    if end:
+        query = query.where(MovementRollup.bucket < end)
+    if product_id:
+        query = query.where(MovementRollup.product_id == product_id)
+    if store_id:
+        query = query.where(MovementRollup.store_id == store_id)
+    if cursor:
+        query = query.where(
+            after_cursor(
+                (MovementRollup.bucket, MovementRollup.product_id, MovementRollup.store_id),
+                decode_cursor(cursor, datetime.fromisoformat, UUID, UUID),
+            )
+        )
+    result = await db.execute(query)
+    return [_rollup_response(rollup) for rollup in result.scalars()]
+
+
+def _rollup_response(rollup: MovementRollup) -> dict:
+    values = {column: getattr(rollup, column) for column in ROLLUP_COLUMNS}
+    return {
+        "granularity": rollup.granularity,
+        "bucket": rollup.bucket,
+        "product_id": rollup.product_id,
+        "store_id": rollup.store_id,
+        **values,
+        "net_quantity": values["in_quantity"]
+        - values["out_quantity"]
+        + values["transfer_in_quantity"]
+        - values["transfer_out_quantity"],
+    }
+
+
+def rollup_cursor_key(rollup: dict) -> tuple:
+    """Clave de orden `(bucket, product_id, store_id)` de un agregado, para `encode_cursor`."""
+    return rollup["bucket"], rollup["product_id"], rollup["store_id"]
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, literal, text, union_all
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from inventory_management_system.core.config import INVENTORY_SNAPSHOT_RETENTION
+from inventory_management_system.db.database import disable_statement_timeouts
+from inventory_management_system.db.dialect import is_postgres
+from inventory_management_system.models.inventory import Inventory
+from inventory_management_system.models.movement import Movement, MovementType
+from inventory_management_system.models.snapshot import InventorySnapshot
+from inventory_management_system.models.types import Timestamp
+
+SNAPSHOT_CHECK_SECONDS = 60
+_SNAPSHOT_LOCK_KEY = 0x534E4150  # Clave del advisory lock que evita copias duplicadas entre workers
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def movement_time_window(db: AsyncSession) -> tuple[Optional[datetime], datetime]:
+    """
+    Intervalo `(desde, hasta]` admitido para el `timestamp` que envía el cliente en un movimiento: posterior a la
+    última copia y no futuro. `get_stock_as_of` separa lo copiado de lo que reproduce por `taken_at`, así que un
+    movimiento con fecha anterior a una copia que no la incluye (o futura, que una copia próxima sí incluiría) se
+    perdería o se contaría dos veces. Se consulta con las filas de stock ya bloqueadas: una copia que empiece después
+    espera al commit del movimiento y lo incluye.
+    """
+    return await db.scalar(select(func.max(InventorySnapshot.taken_at))), _utcnow()
+
+
+def check_movement_timestamp(timestamp: datetime, window: tuple[Optional[datetime], datetime]) -> None:
+    """Rechaza (400) un `timestamp` de cliente fuera de `movement_time_window`; se compara tal como se guarda."""
+    since, until = window
+    timestamp = timestamp.replace(tzinfo=None)
+    if since is not None and timestamp <= since:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "La fecha del movimiento debe ser posterior a la última copia del inventario "
+                f"({since:%Y-%m-%d %H:%M:%S})"
+            ),
+        )
+    if timestamp > until:
+        raise HTTPException(status_code=400, detail="La fecha del movimiento no puede ser futura.")
+
+
+async def take_inventory_snapshot(db: AsyncSession, keep: int = INVENTORY_SNAPSHOT_RETENTION) -> datetime:
+    """
+    Copia `inventory` a `inventory_snapshots` con un solo `INSERT ... SELECT`, conserva solo las `keep` copias más
+    recientes (`prune_inventory_snapshots`) y devuelve su `taken_at`.
+    En Postgres la copia no frena las escrituras mientras dura (ver `_copy_from_exported_snapshot`).
+    """
+    try:
+        if is_postgres(db):
+            await disable_statement_timeouts(await db.connection())
+            taken_at = await _copy_from_exported_snapshot(db.bind)
+        else:
+            taken_at = _utcnow()
+            await db.execute(_copy_inventory(taken_at))
+        await prune_inventory_snapshots(db, keep)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return taken_at
+
+
+async def _copy_from_exported_snapshot(engine: AsyncEngine) -> datetime:
+    """
+    Copia de Postgres desde una vista MVCC exportada, con el bloqueo solo para fijar el corte:
+    - Una transacción corta toma `LOCK TABLE inventory IN EXCLUSIVE MODE` (las lecturas siguen): espera a las
+      escrituras en curso, que bloquean su stock antes de fechar sus movimientos, y frena las nuevas. Con el bloqueo
+      toma `taken_at` y exporta su vista de los datos (`pg_export_snapshot`).
+    - La copia corre en otra transacción REPEATABLE READ que importa esa vista (`SET TRANSACTION SNAPSHOT`); el
+      bloqueo se suelta en cuanto la importa, y las escrituras siguen mientras se copia.
+    La copia contiene así exactamente los movimientos con `timestamp <= taken_at`.
+    """
+    async with engine.connect() as fence, engine.connect() as connection:
+        await fence.execute(text("LOCK TABLE inventory IN EXCLUSIVE MODE"))
+        taken_at = _utcnow()
+        snapshot_id = await fence.scalar(select(func.pg_export_snapshot()))
+        copier = await connection.execution_options(isolation_level="REPEATABLE READ")
+        await copier.exec_driver_sql(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+        await fence.rollback()
+        await disable_statement_timeouts(copier)
+        await copier.execute(_copy_inventory(taken_at))
+        await copier.commit()
+    return taken_at
+
+
+def _copy_inventory(taken_at: datetime):
+    return insert(InventorySnapshot).from_select(
+        ["taken_at", "product_id", "store_id", "quantity"],
+        select(literal(taken_at, Timestamp), Inventory.product_id, Inventory.store_id, Inventory.quantity),
+    )
+
+
+async def prune_inventory_snapshots(db: AsyncSession, keep: int) -> int:
+    """
+    Borra (sin commit) las copias anteriores a las `keep` más recientes (al menos una) y devuelve las filas borradas.
+    Las fechas de corte se buscan de una en una con `max(taken_at)` sobre la clave primaria, sin recorrer las copias.
+    `get_stock_as_of` antes de la copia más antigua que queda reproduce el historial desde cero.
+    """
+    oldest_kept = None
+    for _ in range(max(keep, 1)):
+        query = select(func.max(InventorySnapshot.taken_at))
+        if oldest_kept is not None:
+            query = query.where(InventorySnapshot.taken_at < oldest_kept)
+        oldest_kept = await db.scalar(query)
+        if oldest_kept is None:
+            return 0
+    result = await db.execute(delete(InventorySnapshot).where(InventorySnapshot.taken_at < oldest_kept))
+    return result.rowcount
+
+
+async def take_snapshot_if_due(db: AsyncSession, interval: timedelta) -> Optional[datetime]:
+    """
+    Toma una copia si la última tiene más de `interval`; devuelve su `taken_at` o `None` si no tocaba.
+    En Postgres un advisory lock de transacción evita que varios workers la tomen a la vez.
+    """
+    if is_postgres(db):
+        locked = await db.scalar(select(func.pg_try_advisory_xact_lock(_SNAPSHOT_LOCK_KEY)))
+        if not locked:
+            await db.rollback()
+            return None
+    latest = await db.scalar(select(func.max(InventorySnapshot.taken_at)))
+    if latest is not None and _utcnow() - latest < interval:
+        await db.rollback()
+        return None
+    return await take_inventory_snapshot(db)
+
+
+async def run_snapshot_scheduler(session_factory: async_sessionmaker[AsyncSession], interval: timedelta) -> None:
+    """Tarea de fondo: comprueba cada `SNAPSHOT_CHECK_SECONDS` si toca tomar una copia de inventario."""
+    while True:
+        try:
+            async with session_factory() as session:
+                taken_at = await take_snapshot_if_due(session, interval)
+            if taken_at:
+                logging.info(f"📸 Copia de inventario tomada ({taken_at:%Y-%m-%d %H:%M:%S})")
+        except Exception:
+            logging.exception("Error al tomar la copia de inventario")
+        await asyncio.sleep(SNAPSHOT_CHECK_SECONDS)
+
+
+async def get_stock_as_of(
+    db: AsyncSession, at: datetime, product_id: Optional[UUID] = None, store_id: Optional[UUID] = None
+) -> tuple[Optional[datetime], list[dict]]:
+    """
+    Reconstruye el stock en `at` (UTC sin zona): devuelve `(snapshot_at, filas)` ordenadas por producto y tienda.
+    - Parte de la copia más reciente con `taken_at <= at` (o de cero si no hay ninguna).
+    - Suma los movimientos con `snapshot_at < timestamp <= at` agregados en la BD por `(product_id, store_id)`:
+      el costo depende del intervalo entre copias, no del tamaño del historial.
+    - Filtros opcionales por producto y tienda.
+    - Solo es exacto desde el corte del último `expire_movements`: los movimientos anteriores ya no están.
+    """
+    snapshot_at = await db.scalar(select(func.max(InventorySnapshot.taken_at)).where(InventorySnapshot.taken_at <= at))
+    stock: dict[tuple[UUID, UUID], int] = defaultdict(int)
+    if snapshot_at is not None:
+        query = select(InventorySnapshot.product_id, InventorySnapshot.store_id, InventorySnapshot.quantity).where(
+            InventorySnapshot.taken_at == snapshot_at
+        )
+        if product_id:
+            query = query.where(InventorySnapshot.product_id == product_id)
+        if store_id:
+            query = query.where(InventorySnapshot.store_id == store_id)
+        for row_product_id, row_store_id, quantity in await db.execute(query):
+            stock[(row_product_id, row_store_id)] = quantity
+    window = Movement.timestamp <= at
+    if snapshot_at is not None:
+        window &= Movement.timestamp > snapshot_at
+    for row_product_id, row_store_id, delta in await db.execute(movement_deltas(window, product_id, store_id)):
+        stock[(row_product_id, row_store_id)] += delta
+    items = [
+        {"product_id": key[0], "store_id": key[1], "quantity": quantity}
+        for key, quantity in sorted(stock.items(), key=lambda item: (str(item[0][0]), str(item[0][1])))
+    ]
+    return snapshot_at, items
+
+
+def movement_deltas(window, product_id: Optional[UUID] = None, store_id: Optional[UUID] = None):
+    """
+    `SELECT product_id, store_id, SUM(delta)` de los movimientos que cumplen `window` (condición sobre
+    `Movement.timestamp`; `true()` para todo el historial): IN y TRANSFER suman en el destino; OUT y TRANSFER restan
+    en el origen (las mismas reglas con que se aplicaron al inventario).
+    """
+    if product_id:
+        window &= Movement.product_id == product_id
+    incoming = select(
+        Movement.product_id, Movement.target_store_id.label("store_id"), Movement.quantity.label("delta")
+    ).where(window & Movement.type.in_([MovementType.IN, MovementType.TRANSFER]))
+    outgoing = select(
+        Movement.product_id, Movement.source_store_id.label("store_id"), (-Movement.quantity).label("delta")
+    ).where(window & Movement.type.in_([MovementType.OUT, MovementType.TRANSFER]))
+    if store_id:
+        # 🔹 El filtro va en cada rama para que use `ix_movements_target_store_timestamp` / `..._source_store_...`
+        incoming = incoming.where(Movement.target_store_id == store_id)
+        outgoing = outgoing.where(Movement.source_store_id == store_id)
+    deltas = union_all(incoming, outgoing).subquery()
+    return select(deltas.c.product_id, deltas.c.store_id, func.sum(deltas.c.delta)).group_by(
+        deltas.c.product_id, deltas.c.store_id
+    )
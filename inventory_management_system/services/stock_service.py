@@ -0,0 +1,255 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, insert, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from inventory_management_system.core.ids import id_generator
+from inventory_management_system.db.dialect import dialect_insert
+from inventory_management_system.models.inventory import Inventory
+from inventory_management_system.models.movement import Movement
+from inventory_management_system.models.product import Product
+from inventory_management_system.schemas.movement import MovementType
+from inventory_management_system.services.alert_service import (
+    StockChange,
+    bump_low_stock_alerts_version,
+    is_low_stock,
+    publish_stock_changes,
+)
+from inventory_management_system.services.product_service import product_cache
+from inventory_management_system.services.rollup_service import record_rollups
+
+MIN_STOCK = 5
+new_inventory_id = id_generator(Inventory.__tablename__)
+new_movement_id = id_generator(Movement.__tablename__)
+
+
+async def select_inventory_for_update(keys: list[tuple[UUID, UUID]], db: AsyncSession):
+    """
+    Lee y bloquea (`FOR UPDATE`) las filas de inventario de los pares `(product_id, store_id)` indicados.
+    Las filas se bloquean siempre en orden `(product_id, store_id)` para que dos transacciones
+    concurrentes no se esperen mutuamente. En SQLite `FOR UPDATE` se omite (la BD serializa escrituras).
+    """
+    result = await db.execute(
+        select(Inventory.id, Inventory.product_id, Inventory.store_id, Inventory.quantity, Inventory.min_stock)
+        # 🔹 El `IN` por producto permite buscar en `uq_inventory_product_store` también en SQLite, que no usa
+        #    índices para `(a, b) IN (...)` con varias tuplas
+        .where(Inventory.product_id.in_({product_id for product_id, _ in keys}))
+        .where(tuple_(Inventory.product_id, Inventory.store_id).in_(keys))
+        .order_by(Inventory.product_id, Inventory.store_id)
+        .with_for_update()
+    )
+    return result.mappings().all()
+
+
+async def lock_stock(keys: set[tuple[UUID, UUID]], db: AsyncSession) -> dict:
+    """
+    Bloquea las filas indicadas y devuelve el stock de trabajo en memoria, indexado por `(product_id, store_id)`.
+    Cada fila guarda su estado inicial (`before`) y si fue modificada (`dirty`) o es nueva (`is_new`).
+    """
+    rows = await select_inventory_for_update(sorted(keys), db) if keys else []
+    return {
+        (row["product_id"], row["store_id"]): dict(
+            row, is_new=False, dirty=False, before=(row["quantity"], row["min_stock"])
+        )
+        for row in rows
+    }
+
+
+def source_not_found_error() -> HTTPException:
+    return HTTPException(status_code=404, detail="El producto no existe en la tienda de origen.")
+
+
+def min_stock_error(quantity: int, min_stock: int) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=(
+            f"Producto a enviar sobrepasa el minimo stock en la tienda de origen. "
+            f"Stock actual en tienda de origen: {quantity} ."
+            f"Minimo Stock permitido: {min_stock}"
+        ),
+    )
+
+
+def insufficient_stock_error(quantity: int) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"Stock insuficiente en la tienda de origen. Stock actual en tienda de origen: {quantity}",
+    )
+
+
+def apply_to_stock(
+    stock: dict,
+    movement_type: MovementType,
+    product_id: UUID,
+    source_store_id: UUID | None,
+    target_store_id: UUID | None,
+    quantity: int,
+) -> None:
+    """
+    Aplica un movimiento sobre el stock bloqueado en memoria; si no se puede aplicar lanza `HTTPException`
+    sin modificar nada.
+    - OUT y TRANSFER descuentan en el origen (que debe existir); OUT no puede dejarlo en negativo y TRANSFER
+      debe dejarlo por encima del stock mínimo (mismas reglas que `transfer_inventory`).
+    - IN y TRANSFER suman en el destino, creando la fila con `MIN_STOCK` si no existe.
+    """
+    if movement_type in (MovementType.OUT, MovementType.TRANSFER):
+        source = stock.get((product_id, source_store_id))
+        if source is None:
+            raise source_not_found_error()
+        if movement_type == MovementType.TRANSFER and source["min_stock"] >= source["quantity"] - quantity:
+            raise min_stock_error(source["quantity"], source["min_stock"])
+        if source["quantity"] < quantity:
+            raise insufficient_stock_error(source["quantity"])
+        source["quantity"] -= quantity
+        source["dirty"] = True
+    if movement_type in (MovementType.IN, MovementType.TRANSFER):
+        target = stock.setdefault(
+            (product_id, target_store_id),
+            {
+                "id": new_inventory_id(),
+                "product_id": product_id,
+                "store_id": target_store_id,
+                "quantity": 0,
+                "min_stock": MIN_STOCK,
+                "is_new": True,
+                "before": None,
+            },
+        )
+        target["quantity"] += quantity
+        target["dirty"] = True
+
+
+def movement_values(
+    movement_type: MovementType,
+    product_id: UUID,
+    source_store_id: UUID | None,
+    target_store_id: UUID | None,
+    quantity: int,
+    timestamp: datetime | None = None,
+) -> dict:
+    """Columnas de un movimiento del historial (`movements`), con `id` generado y `timestamp` UTC sin zona."""
+    timestamp = timestamp or datetime.now(timezone.utc)
+    return {
+        "id": new_movement_id(),
+        "product_id": product_id,
+        "source_store_id": source_store_id,
+        "target_store_id": target_store_id,
+        "quantity": quantity,
+        "timestamp": timestamp.replace(tzinfo=None),
+        "type": movement_type,
+    }
+
+
+def adjustment_values(product_id: UUID, store_id: UUID, delta: int) -> dict:
+    """Movimiento de ajuste de stock en una tienda: IN de `delta` si es positivo, OUT de `-delta` si es negativo."""
+    if delta > 0:
+        return movement_values(MovementType.IN, product_id, None, store_id, delta)
+    return movement_values(MovementType.OUT, product_id, store_id, None, -delta)
+
+
+async def insert_movements(movements: list[dict], db: AsyncSession, returning: bool = False) -> list[Movement]:
+    """
+    Inserta movimientos en el historial con un `INSERT` masivo y los suma a sus agregados (`record_rollups`),
+    sin commit. Con `returning=True` devuelve los `Movement` insertados (`INSERT ... RETURNING`).
+    """
+    if not movements:
+        return []
+    created: list[Movement] = []
+    if returning:
+        created = list((await db.scalars(insert(Movement).returning(Movement), movements)).all())
+    else:
+        await db.execute(insert(Movement), movements)
+    await record_rollups(movements, db)
+    return created
+
+
+async def write_stock(stock: dict, movements: list[dict], db: AsyncSession) -> dict:
+    """
+    Persiste el stock de trabajo y los movimientos con sentencias masivas (`executemany`), sin commit.
+    - Cada fila se escribe una sola vez aunque la hayan tocado muchos movimientos del lote.
+    - Las filas nuevas no estaban bloqueadas: si otra transacción creó la misma `(product_id, store_id)`,
+      el upsert suma sobre ella. Devuelve, por cada fila así, la diferencia entre el stock real (`RETURNING`)
+      y el calculado en memoria.
+    - Actualiza `products.stock_total` con el cambio neto por producto (cero en transferencias) y la versión
+      de alertas de cada tienda con alguna fila que entra, sale o cambia dentro del conjunto de alertas.
+    """
+    updated = [
+        {"id": row["id"], "quantity": row["quantity"]} for row in stock.values() if row["dirty"] and not row["is_new"]
+    ]
+    created = [
+        {key: row[key] for key in ("id", "product_id", "store_id", "quantity", "min_stock")}
+        for row in stock.values()
+        if row["is_new"]
+    ]
+    offsets: dict = {}
+    if updated:
+        await db.execute(update(Inventory), updated)
+    if created:
+        stmt = dialect_insert(db, Inventory)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Inventory.product_id, Inventory.store_id],
+            set_={"quantity": Inventory.quantity + stmt.excluded.quantity},
+        ).returning(Inventory.product_id, Inventory.store_id, Inventory.quantity)
+        result = await db.execute(stmt, created)
+        offsets = {
+            (product_id, store_id): quantity - stock[(product_id, store_id)]["quantity"]
+            for product_id, store_id, quantity in result.all()
+        }
+        offsets = {key: offset for key, offset in offsets.items() if offset}
+    await insert_movements(movements, db)
+    await _write_product_totals(stock, db)
+    # 🔹 Con offsets, una fila creada en paralelo tenía un stock previo desconocido (pudo estar en alerta)
+    await bump_low_stock_alerts_version(
+        db, [key[1] for key, row in stock.items() if key in offsets or _row_touches_alerts(row)]
+    )
+    return offsets
+
+
+def publish_stock(stock: dict, offsets: dict) -> None:
+    """Tras el commit: invalida los productos cuyo stock total cambió y publica los cambios de stock."""
+    for product_id in _product_deltas(stock):
+        product_cache.invalidate(product_id)
+    publish_stock_changes(_stock_changes(stock, offsets))
+
+
+def _product_deltas(stock: dict) -> dict[UUID, int]:
+    deltas: dict[UUID, int] = defaultdict(int)
+    for row in stock.values():
+        if row["dirty"]:
+            deltas[row["product_id"]] += row["quantity"] - (row["before"][0] if row["before"] else 0)
+    return {product_id: delta for product_id, delta in deltas.items() if delta}
+
+
+async def _write_product_totals(stock: dict, db: AsyncSession) -> None:
+    deltas = _product_deltas(stock)
+    if deltas:
+        await db.execute(
+            update(Product.__table__)
+            .where(Product.__table__.c.id == bindparam("product_id"))
+            .values(stock_total=Product.__table__.c.stock_total + bindparam("delta")),
+            [{"product_id": product_id, "delta": delta} for product_id, delta in deltas.items()],
+        )
+
+
+def _row_touches_alerts(row: dict) -> bool:
+    """Indica si una fila modificada estaba o queda en alerta de stock bajo."""
+    if not row["dirty"]:
+        return False
+    before = row["before"]
+    return (before is not None and is_low_stock(*before)) or is_low_stock(row["quantity"], row["min_stock"])
+
+
+def _stock_changes(stock: dict, offsets: dict) -> list[StockChange]:
+    """Cambios de stock confirmados; las filas creadas en paralelo parten del stock que ya tenían."""
+    changes = []
+    for key, row in stock.items():
+        if not row["dirty"]:
+            continue
+        offset = offsets.get(key, 0)
+        before = row["before"] or ((offset, row["min_stock"]) if offset else None)
+        changes.append((*key, before, (row["quantity"] + offset, row["min_stock"])))
+    return changes
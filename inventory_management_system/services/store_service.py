@@ -0,0 +1,134 @@
+import time
+import uuid
+from typing import Awaitable, Callable, Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from inventory_management_system.core.config import STORE_REGISTRY_TTL
+from inventory_management_system.db.dialect import is_replica
+from inventory_management_system.db.writes import insert_returning, update_returning
+from inventory_management_system.models.inventory import Inventory
+from inventory_management_system.models.store import Store
+from inventory_management_system.schemas.store import StoreCreate, StoreUpdate
+
+UUID = uuid.UUID
+
+
+class StoreRegistry:
+    """
+    Conjunto en memoria de los IDs de tienda registrados, para validar tiendas sin consultar la BD.
+    - Se carga al arrancar la API (`main.lifespan`) y se recarga tras `invalidate()`, cuando pasan `ttl` segundos
+      o cuando una validación encuentra un ID que no tiene (tienda creada en otro worker).
+    - `version` aumenta con cada invalidación: una carga que empezó antes de un cambio no se conserva.
+    - Cada worker tiene su propio registro; el TTL acota cuánto tarda en ver tiendas eliminadas en otro worker.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.version = 0
+        self._clock = clock
+        self._store_ids: Optional[frozenset[UUID]] = None
+        self._expires_at = 0.0
+
+    async def load(self, db: AsyncSession) -> frozenset[UUID]:
+        """
+        Lee los IDs de tienda de la BD y los guarda si no hubo cambios durante la lectura; las lecturas de una
+        réplica no se guardan (podrían no tener aún una tienda recién creada).
+        """
+        version = self.version
+        result = await db.execute(select(Store.id))
+        store_ids = frozenset(result.scalars().all())
+        if version == self.version and not is_replica(db):
+            self._store_ids = store_ids
+            self._expires_at = self._clock() + self.ttl
+        return store_ids
+
+    async def get_store_ids(self, db: AsyncSession) -> frozenset[UUID]:
+        if self._store_ids is None or self._expires_at <= self._clock():
+            return await self.load(db)
+        return self._store_ids
+
+    async def find_unknown(self, store_ids: Iterable[UUID], db: AsyncSession) -> set[UUID]:
+        """
+        Devuelve los IDs que no corresponden a ninguna tienda registrada (validación en lote). Si alguno falta en
+        el registro ya cargado, se recarga una vez antes de rechazarlo: pudo darse de alta en otro worker.
+        """
+        store_ids = set(store_ids)
+        cached = self._store_ids is not None and self._expires_at > self._clock()
+        unknown = store_ids - await self.get_store_ids(db)
+        if unknown and cached:
+            unknown = store_ids - await self.load(db)
+        return unknown
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._store_ids = None
+
+
+# 🔹 Registro de tiendas del worker: se invalida en cada alta, cambio o baja de tienda
+store_registry = StoreRegistry(ttl=STORE_REGISTRY_TTL)
+
+
+async def validate_store_ids(store_ids: Iterable[UUID], db: AsyncSession) -> None:
+    """Verifica que todas las tiendas indicadas estén registradas."""
+    if await store_registry.find_unknown(store_ids, db):
+        raise HTTPException(status_code=400, detail="Tienda no válida.")
+
+
+async def get_stores(db: AsyncSession, skip: int = 0, limit: int = 100) -> list[Store]:
+    result = await db.execute(select(Store).order_by(Store.name).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+async def get_store_by_id(db: AsyncSession, store_id: UUID) -> Store:
+    result = await db.execute(select(Store).where(Store.id == store_id))
+    store = result.scalar_one_or_none()
+    if not store:
+        raise HTTPException(status_code=404, detail="Tienda no encontrada")
+    return store
+
+
+async def create_store(db: AsyncSession, store_data: StoreCreate) -> Store:
+    """Registra una nueva tienda; el nombre (y el ID, si se indica) deben ser únicos."""
+    return await _write_store(db, insert_returning(db, Store, store_data.model_dump(exclude_none=True)))
+
+
+async def update_store(db: AsyncSession, store_id: UUID, store_data: StoreUpdate) -> Store:
+    """Actualiza los campos indicados con un único `UPDATE ... RETURNING` (404 si la tienda no existe)."""
+    values = store_data.model_dump(exclude_unset=True)
+    store = await _write_store(db, update_returning(db, Store, Store.id == store_id, values))
+    if not store:
+        raise HTTPException(status_code=404, detail="Tienda no encontrada")
+    return store
+
+
+async def delete_store(db: AsyncSession, store_id: UUID) -> dict:
+    """Elimina una tienda que no tenga inventario registrado."""
+    store = await get_store_by_id(db, store_id)
+    result = await db.execute(select(Inventory.id).where(Inventory.store_id == store_id).limit(1))
+    if result.scalar_one_or_none() is not None:
+        raise HTTPException(status_code=409, detail="La tienda tiene inventario registrado y no se puede eliminar.")
+    await db.delete(store)
+    await db.commit()
+    store_registry.invalidate()
+    return {"message": "Tienda eliminada exitosamente"}
+
+
+async def _write_store(db: AsyncSession, write: Awaitable[Optional[Store]]) -> Optional[Store]:
+    """
+    Ejecuta el alta o cambio de una tienda (`INSERT`/`UPDATE ... RETURNING`), lo confirma e invalida el registro
+    en memoria. Un nombre o ID repetido se rechaza con 400.
+    """
+    try:
+        store = await write
+        if store is None:
+            return None
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Ya existe una tienda con este ID o nombre.")
+    store_registry.invalidate()
+    return store
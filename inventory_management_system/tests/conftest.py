@@ -5,28 +5,49 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from inventory_management_system.config import VALID_STORE_IDS
 from inventory_management_system.db.database import get_db
 from inventory_management_system.main import app
-from inventory_management_system.models import Base, Inventory, Movement, Product
+from inventory_management_system.models import Base, Inventory, Movement, Product, Store
 from inventory_management_system.schemas.movement import MovementType
+from inventory_management_system.services.product_service import product_cache
+from inventory_management_system.services.store_service import store_registry
 
 DATABASE_URL = "sqlite+aiosqlite:///:memory:"  # Base de datos en memoria para pruebas
 engine = create_async_engine(DATABASE_URL, echo=False, future=True)
 # Crear sesión asíncrona
 TestingSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+# Tiendas registradas en cada prueba
+STORE_IDS = [
+    "9cd61e1f-f9be-4045-b67d-2cd0ffde014f",
+    "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+    "f7c9e59e-a757-4375-b1c9-167b0a90a6e4",
+    "51814955-e9d0-47fc-9c3a-5ea8459b42f0",
+    "b5d5b3f1-8d2e-4ef6-94e5-d5f8c5b8a9b4",
+]
 
 
 @pytest.fixture(scope="function", autouse=True)
 async def setup_database():
-    """Crea las tablas antes de cada prueba y las elimina después."""
+    """Crea las tablas y registra las tiendas antes de cada prueba; las elimina después (vaciando las cachés)."""
+    product_cache.clear()
+    store_registry.invalidate()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            Store.__table__.insert(),
+            [{"id": UUID(store_id), "name": f"Tienda {i}"} for i, store_id in enumerate(STORE_IDS)],
+        )
     yield  # Aquí se ejecutan las pruebas
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture
+def store_ids() -> List[str]:
+    """IDs (texto) de las tiendas registradas en `setup_database`."""
+    return list(STORE_IDS)
+
+
 @pytest.fixture(scope="function")
 async def async_db_session():
     """Crea una sesión de base de datos asíncrona para pruebas."""
@@ -93,9 +114,10 @@ async def sample_products(async_db_session: AsyncSession) -> List[Product]:
 
 
 @pytest.fixture
-async def sample_inventory(async_db_session: AsyncSession, sample_products: List[Product]) -> List[Inventory]:
+async def sample_inventory(
+    async_db_session: AsyncSession, sample_products: List[Product], store_ids: List[str]
+) -> List[Inventory]:
     """Crea tres inventarios de prueba en tiendas válidas."""
-    store_ids = list(VALID_STORE_IDS)
     inventories = []
     for i in range(3):
         inventory = Inventory(
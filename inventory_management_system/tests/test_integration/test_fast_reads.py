@@ -0,0 +1,45 @@
+from typing import List
+
+import pytest
+from httpx import AsyncClient
+
+from inventory_management_system.core import json_rows
+from inventory_management_system.core.pagination import NEXT_CURSOR_HEADER
+from inventory_management_system.models import Inventory, Movement
+
+
+async def _get_both(async_client: AsyncClient, monkeypatch, url: str, **params):
+    """Respuestas de `url` por el camino normal y por el rápido (`FAST_JSON_READS`)."""
+    monkeypatch.setattr(json_rows, "FAST_JSON_READS", False)
+    regular = await async_client.get(url, params=params)
+    monkeypatch.setattr(json_rows, "FAST_JSON_READS", True)
+    fast = await async_client.get(url, params=params)
+    return regular, fast
+
+
+@pytest.mark.asyncio
+async def test_fast_reads_match_regular_responses(
+    async_client: AsyncClient, monkeypatch, sample_movements: List[Movement], sample_inventory: List[Inventory]
+):
+    """Prueba que el camino rápido devuelve el mismo JSON, estado y cursor que el camino con ORM y Pydantic."""
+    requests = [
+        ("/api/products/", {"limit": 2}),
+        ("/api/products/", {"category": "Construcción", "min_price": 20}),
+        ("/api/movements/", {"limit": 3}),
+        ("/api/movements/", {"store_id": str(sample_inventory[0].store_id)}),
+        (f"/api/movements/{sample_movements[0].id}", {}),
+        (f"/api/inventory/item/{sample_inventory[0].id}", {}),
+        (f"/api/movements/{sample_inventory[0].id}", {}),
+        (f"/api/inventory/item/{sample_movements[0].id}", {}),
+    ]
+    for url, params in requests:
+        regular, fast = await _get_both(async_client, monkeypatch, url, **params)
+        assert (fast.status_code, fast.json()) == (regular.status_code, regular.json()), url
+        assert fast.headers.get(NEXT_CURSOR_HEADER) == regular.headers.get(NEXT_CURSOR_HEADER), url
+        if regular.status_code == 200:
+            assert fast.headers["content-type"] == "application/json"
+
+    regular, fast = await _get_both(async_client, monkeypatch, "/api/products/", limit=2)
+    cursor = fast.headers[NEXT_CURSOR_HEADER]
+    regular, fast = await _get_both(async_client, monkeypatch, "/api/products/", limit=2, cursor=cursor)
+    assert fast.json() == regular.json() and len(fast.json()) == 1
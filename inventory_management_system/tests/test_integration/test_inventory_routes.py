@@ -1,17 +1,19 @@
+import csv
+import io
 from typing import List
+from uuid import uuid4
 
 import pytest
 from httpx import AsyncClient
 
-from inventory_management_system.config import VALID_STORE_IDS
 from inventory_management_system.models import Inventory, Product
 
 
 @pytest.mark.asyncio
-async def test_create_inventory(async_client: AsyncClient, sample_products: List[Product]):
+async def test_create_inventory(async_client: AsyncClient, sample_products: List[Product], store_ids):
     """Prueba la creación de un nuevo inventario."""
     new_inventory = {
-        "store_id": str(list(VALID_STORE_IDS)[0]),
+        "store_id": store_ids[0],
         "product_id": str(sample_products[0].id),
         "quantity": 100,
         "min_stock": 10,
@@ -22,30 +24,54 @@ async def test_create_inventory(async_client: AsyncClient, sample_products: List
     assert response.json()["product_id"] == new_inventory["product_id"]
     assert response.json()["quantity"] == new_inventory["quantity"]
     assert response.json()["min_stock"] == new_inventory["min_stock"]
+    product = await async_client.get(f"/api/products/{new_inventory['product_id']}")
+    assert product.json()["stock"] == new_inventory["quantity"]
 
 
 @pytest.mark.asyncio
-async def test_get_inventory_by_store(async_client: AsyncClient):
+async def test_get_inventory_by_store(async_client: AsyncClient, store_ids):
     """Prueba obtener el inventario de una tienda."""
-    valid_store_id = str(list(VALID_STORE_IDS)[0])
+    valid_store_id = store_ids[0]
     response = await async_client.get(f"/api/stores/{valid_store_id}/inventory")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
 
 
 @pytest.mark.asyncio
-async def test_transfer_inventory(async_client: AsyncClient, sample_inventory: List[Inventory]):
+async def test_transfer_inventory(async_client: AsyncClient, sample_inventory: List[Inventory], store_ids):
     """Prueba la transferencia de inventario entre tiendas usando los inventarios de prueba."""
     transfer_data = {
         "product_id": str(sample_inventory[0].product_id),
         "source_store_id": str(sample_inventory[0].store_id),
-        "target_store_id": str(list(VALID_STORE_IDS)[1]),
+        "target_store_id": store_ids[1],
         "quantity": 10,
     }
     response = await async_client.post("/api/inventory/transfer", json=transfer_data)
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_transfer_inventory_batch(async_client: AsyncClient, sample_inventory: List[Inventory]):
+    """Prueba la transferencia por lotes devolviendo un resultado por cada transferencia."""
+    transfer = {
+        "product_id": str(sample_inventory[0].product_id),
+        "source_store_id": str(sample_inventory[0].store_id),
+        "target_store_id": str(sample_inventory[1].store_id),
+        "quantity": 10,
+    }
+    response = await async_client.post("/api/inventory/transfers:batch", json=[transfer, transfer])
+    assert response.status_code == 200
+    assert [result["status_code"] for result in response.json()] == [200, 200]
+    assert response.json()[1]["remaining_stock"] == sample_inventory[0].quantity - 20
+
+
+@pytest.mark.asyncio
+async def test_transfer_inventory_batch_rejects_empty_list(async_client: AsyncClient):
+    """Prueba que un lote vacío sea rechazado."""
+    response = await async_client.post("/api/inventory/transfers:batch", json=[])
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_get_low_stock_alerts(async_client: AsyncClient):
     """Prueba obtener alertas de stock bajo."""
@@ -54,6 +80,21 @@ async def test_get_low_stock_alerts(async_client: AsyncClient):
     assert isinstance(response.json(), list)
 
 
+@pytest.mark.asyncio
+async def test_get_low_stock_alerts_not_modified(async_client: AsyncClient, sample_inventory: List[Inventory]):
+    """Prueba que el sondeo con `If-None-Match` responda 304 hasta que cambie el conjunto de alertas."""
+    response = await async_client.get("/api/inventory/alerts")
+    etag = response.headers["ETag"]
+    response = await async_client.get("/api/inventory/alerts", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    inventory = sample_inventory[0]
+    await async_client.put(f"/api/inventory/{inventory.id}", json={"min_stock": inventory.quantity})
+    response = await async_client.get("/api/inventory/alerts", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [alert["product_id"] for alert in response.json()] == [str(inventory.product_id)]
+
+
 @pytest.mark.asyncio
 async def test_get_inventory_by_id(async_client: AsyncClient, sample_inventory: List[Inventory]):
     """Prueba obtener un inventario por su ID."""
@@ -83,3 +124,57 @@ async def test_delete_inventory(async_client: AsyncClient, sample_inventory: Lis
     # Verificar que el inventario ya no existe
     response = await async_client.get(f"/inventory/item/{inventory_id}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stream_inventory_events_unknown_store(async_client: AsyncClient):
+    """Prueba que el flujo SSE de una tienda no registrada se rechace antes de abrirse."""
+    response = await async_client.get(f"/api/inventory/alerts/stream?store_id={uuid4()}")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_stock_as_of(async_client: AsyncClient, sample_products, store_ids):
+    """Prueba consultar el stock de un producto en una fecha pasada."""
+    movement = {
+        "product_id": str(sample_products[0].id),
+        "target_store_id": store_ids[0],
+        "quantity": 12,
+        "type": "IN",
+        "timestamp": "2026-03-14T10:00:00Z",
+    }
+    assert (await async_client.post("/api/movements/", json=movement)).status_code == 201
+    response = await async_client.get(
+        "/api/inventory/as-of", params={"at": "2026-03-14T12:00:00+02:00", "product_id": movement["product_id"]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["as_of"] == "2026-03-14T10:00:00"
+    assert data["items"] == [{"product_id": movement["product_id"], "store_id": store_ids[0], "quantity": 12}]
+
+
+@pytest.mark.asyncio
+async def test_export_store_inventory(async_client: AsyncClient, sample_inventory: List[Inventory]):
+    """Prueba la exportación CSV del inventario de una tienda y el rechazo de tiendas no registradas."""
+    store_id = sample_inventory[0].store_id
+    response = await async_client.get(f"/api/stores/{store_id}/inventory/export")
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["product_id"], int(row["quantity"])) for row in rows] == [
+        (str(sample_inventory[0].product_id), sample_inventory[0].quantity)
+    ]
+    assert (await async_client.get(f"/api/stores/{uuid4()}/inventory/export")).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_reconcile_inventory(async_client: AsyncClient, sample_products: List[Product], store_ids):
+    """Prueba el informe de conciliación: el inventario creado por la API coincide con su historial."""
+    payload = {"product_id": str(sample_products[0].id), "store_id": store_ids[0], "quantity": 30, "min_stock": 5}
+    assert (await async_client.post("/api/inventory/", json=payload)).status_code == 201
+    response = await async_client.post("/api/admin/inventory/reconcile", params={"store_id": store_ids[0]})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["stores"], report["fixed"], report["items"]) == (1, False, [])
+    assert (
+        await async_client.post("/api/admin/inventory/reconcile", params={"store_id": str(uuid4())})
+    ).status_code == 400
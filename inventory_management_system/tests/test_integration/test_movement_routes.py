@@ -1,21 +1,25 @@
+import csv
+import gzip
+import io
+import json
+import uuid
 from datetime import datetime, timezone
 from typing import List
 
 import pytest
 from httpx import AsyncClient
 
-from inventory_management_system.config import VALID_STORE_IDS
 from inventory_management_system.models import Inventory
 from inventory_management_system.models.movement import Movement, MovementType
 
 
 @pytest.mark.asyncio
-async def test_create_movement(async_client: AsyncClient, sample_inventory: List[Inventory]):
+async def test_create_movement(async_client: AsyncClient, sample_inventory: List[Inventory], store_ids):
     """Prueba la creación de un movimiento de inventario."""
     movement_data = {
-        "product_id": str(sample_inventory[0].id),
+        "product_id": str(sample_inventory[0].product_id),
         "source_store_id": str(sample_inventory[0].store_id),
-        "target_store_id": str(list(VALID_STORE_IDS)[1]),
+        "target_store_id": store_ids[1],
         "quantity": 15,
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "type": MovementType.TRANSFER,
@@ -30,6 +34,23 @@ async def test_create_movement(async_client: AsyncClient, sample_inventory: List
     assert response_data["type"] == movement_data["type"]
 
 
+@pytest.mark.asyncio
+async def test_create_movements_batch(async_client: AsyncClient, sample_inventory: List[Inventory]):
+    """Prueba un lote de ventas (OUT) con un producto inexistente que se reporta sin afectar al resto."""
+    sale = {
+        "product_id": str(sample_inventory[0].product_id),
+        "source_store_id": str(sample_inventory[0].store_id),
+        "quantity": 10,
+        "type": MovementType.OUT,
+    }
+    unknown = {**sale, "product_id": str(uuid.uuid4())}
+    response = await async_client.post("/api/movements/batch", json=[sale, unknown, sale])
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status_code"] for result in results] == [201, 404, 201]
+    assert results[2]["source_stock"] == 30
+
+
 @pytest.mark.asyncio
 async def test_get_all_movements(async_client: AsyncClient, sample_movements: List[Movement]):
     """Prueba la obtención de todos los movimientos sin filtros ni paginación."""
@@ -50,6 +71,21 @@ async def test_get_all_movements_pagination(async_client: AsyncClient, sample_mo
     assert len(data) == 3  # Verifica que solo se devuelven 3 movimientos
 
 
+@pytest.mark.asyncio
+async def test_get_all_movements_cursor_pagination(async_client: AsyncClient, sample_movements: List[Movement]):
+    """Prueba recorrer los movimientos con el cursor de la cabecera X-Next-Cursor sin repetir registros."""
+    seen = []
+    params = {"limit": 3}
+    while True:
+        response = await async_client.get("/api/movements/", params=params)
+        assert response.status_code == 200
+        seen.extend(movement["id"] for movement in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params = {"limit": 3, "cursor": response.headers["X-Next-Cursor"]}
+    assert sorted(seen) == sorted(str(movement.id) for movement in sample_movements)
+
+
 @pytest.mark.asyncio
 async def test_get_movement_by_id(async_client: AsyncClient, sample_movements: List[Movement]):
     """Prueba la obtención de un movimiento por su ID."""
@@ -58,3 +94,54 @@ async def test_get_movement_by_id(async_client: AsyncClient, sample_movements: L
     assert response.status_code == 200
     response_data = response.json()
     assert response_data["id"] == str(movement.id)  # Convertimos el UUID a string para comparar correctamente
+
+
+@pytest.mark.asyncio
+async def test_get_movement_rollups(async_client: AsyncClient, sample_inventory: List[Inventory]):
+    """Prueba consultar los agregados diarios de un producto tras registrar ventas."""
+    sale = {
+        "product_id": str(sample_inventory[0].product_id),
+        "source_store_id": str(sample_inventory[0].store_id),
+        "quantity": 4,
+        "type": MovementType.OUT,
+        "timestamp": "2026-03-14T10:15:00Z",
+    }
+    assert (await async_client.post("/api/movements/batch", json=[sale, sale])).status_code == 200
+    response = await async_client.get(
+        "/api/movements/rollups",
+        params={"product_id": sale["product_id"], "start": "2026-03-14T00:00:00Z", "end": "2026-03-15T00:00:00Z"},
+    )
+    assert response.status_code == 200
+    assert [(r["bucket"], r["out_quantity"], r["net_quantity"]) for r in response.json()] == [
+        ("2026-03-14T00:00:00", 8, -8)
+    ]
+    assert (await async_client.get("/api/movements/rollups", params={"granularity": "week"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_movements_csv(async_client: AsyncClient, sample_movements: List[Movement]):
+    """Prueba la exportación CSV del historial en orden cronológico, con filtro por tipo."""
+    response = await async_client.get("/api/movements/export", params={"movement_type": "IN"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="movements.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    expected = sorted((m for m in sample_movements if m.type == MovementType.IN), key=lambda m: (m.timestamp, m.id))
+    assert [row["id"] for row in rows] == [str(m.id) for m in expected]
+    assert {row["type"] for row in rows} == {"IN"}
+    assert rows[0]["timestamp"] == expected[0].timestamp.isoformat()
+
+
+@pytest.mark.asyncio
+async def test_export_movements_ndjson_gzip(async_client: AsyncClient, sample_movements: List[Movement]):
+    """Prueba la exportación NDJSON comprimida con gzip cuando el cliente la acepta."""
+    async with async_client.stream(
+        "GET", "/api/movements/export", params={"format": "ndjson"}, headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+    lines = [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+    assert len(lines) == len(sample_movements)
+    assert {line["quantity"] for line in lines} == {m.quantity for m in sample_movements}
+    assert (await async_client.get("/api/movements/export", params={"format": "xml"})).status_code == 422
@@ -64,3 +64,33 @@ async def test_delete_product(async_client: AsyncClient, sample_products):
     # Verificar que ya no existe
     response = await async_client.get(f"/api/products/{product_id}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_products(async_client: AsyncClient):
+    """Prueba la importación masiva de productos en NDJSON y el rechazo de formatos no soportados."""
+    body = (
+        '{"name": "Cemento", "description": "Cemento gris 50kg", "category": "Obra", "price": 30, "sku": "CEM1"}\n'
+        '{"name": "Arena", "description": "Arena fina", "category": "Obra", "price": 12, "sku": "ARE1"}\n'
+    )
+    response = await async_client.post(
+        "/api/products/import", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    assert len((await async_client.get("/api/products/")).json()) == 2
+    response = await async_client.post("/api/products/import", content=body, headers={"Content-Type": "text/plain"})
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_product_cache_stats(async_client: AsyncClient, sample_products):
+    """Prueba que el endpoint de administración exponga los contadores de la caché de productos."""
+    product_id = str(sample_products[0].id)
+    hits = (await async_client.get("/api/admin/cache/products")).json()["hits"]
+    for _ in range(3):
+        await async_client.get(f"/api/products/{product_id}")
+    response = await async_client.get("/api/admin/cache/products")
+    assert response.status_code == 200
+    assert response.json()["hits"] == hits + 2
+    assert response.json()["size"] == 1
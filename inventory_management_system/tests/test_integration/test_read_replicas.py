@@ -0,0 +1,116 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from inventory_management_system.api.v1.routes import admin
+from inventory_management_system.db import database
+from inventory_management_system.db.database import READ_PRIMARY_COOKIE, ReplicaPool
+from inventory_management_system.models import Base, Product
+
+NEW_PRODUCT = {
+    "name": "Cemento",
+    "description": "Bolsa de 25 kg",
+    "category": "Construcción",
+    "price": 9.5,
+    "sku": "C25",
+}
+
+
+async def _replica(url: str, product_name: str) -> async_sessionmaker:
+    """Base SQLite que hace de réplica, con un único producto que la identifica."""
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(Product(name=product_name, description="Réplica", category="Réplica", price=1.0, sku=product_name))
+        await session.commit()
+    return session_factory
+
+
+@pytest.fixture
+async def replicas(tmp_path, monkeypatch):
+    """Dos réplicas SQLite en archivos temporales, en turno rotatorio."""
+    pool = ReplicaPool(
+        [
+            await _replica(f"sqlite+aiosqlite:///{tmp_path}/replica_a.db", "replica-a"),
+            await _replica(f"sqlite+aiosqlite:///{tmp_path}/replica_b.db", "replica-b"),
+        ]
+    )
+    monkeypatch.setattr(database, "read_replicas", pool)
+    yield pool
+    for session_factory in pool.session_factories:
+        await session_factory.kw["bind"].dispose()
+
+
+async def _product_names(async_client: AsyncClient) -> list[str]:
+    response = await async_client.get("/api/products/")
+    assert response.status_code == 200
+    return [product["name"] for product in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_reads_rotate_and_stick_to_primary_after_write(async_client: AsyncClient, replicas):
+    """Prueba el turno rotatorio entre réplicas y que, tras escribir, el mismo cliente lee del primario."""
+    assert await _product_names(async_client) == ["replica-a"]
+    assert await _product_names(async_client) == ["replica-b"]
+
+    response = await async_client.post("/api/products/", json=NEW_PRODUCT)
+    assert response.status_code == 201
+    assert READ_PRIMARY_COOKIE in response.cookies
+    assert await _product_names(async_client) == ["Cemento"]
+
+    async_client.cookies.clear()
+    assert await _product_names(async_client) == ["replica-a"]
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_is_skipped(async_client: AsyncClient, replicas, tmp_path):
+    """Prueba que una réplica que no conecta se excluye y las lecturas siguen en la otra."""
+    broken = async_sessionmaker(
+        bind=create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db"), class_=AsyncSession
+    )
+    replicas.session_factories[0] = broken
+
+    assert [await _product_names(async_client) for _ in range(3)] == [["replica-b"]] * 3
+    assert [replica["healthy"] for replica in replicas.status()] == [False, True]
+    await broken.kw["bind"].dispose()
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_do_not_cache_missing_products(async_client: AsyncClient, replicas, store_ids):
+    """Prueba que un producto aún ausente en la réplica no queda en la caché negativa usada por las escrituras."""
+    response = await async_client.post("/api/products/", json=NEW_PRODUCT)
+    product_id = response.json()["id"]
+    async_client.cookies.clear()
+    assert (await async_client.get(f"/api/products/{product_id}")).status_code == 404
+
+    response = await async_client.post(
+        "/api/inventory/",
+        json={
+            "product_id": product_id,
+            "store_id": store_ids[0],
+            "quantity": 5,
+            "min_stock": 1,
+            "id": str(uuid.uuid4()),
+        },
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_db_pool_endpoint(async_client: AsyncClient, replicas, monkeypatch):
+    """Prueba que el endpoint de administración exponga el perfil y la ocupación del pool de cada réplica."""
+    monkeypatch.setattr(admin, "read_replicas", replicas)
+    session = await replicas.connect()
+    response = await async_client.get("/api/admin/db/pool")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["profile"] in ("dev", "test", "prod")
+    assert body["primary"]["pool"]
+    assert [replica["checkedout"] for replica in body["replicas"]] == [1, 0]
+    await session.close()
+    body = (await async_client.get("/api/admin/db/pool")).json()
+    assert [replica["checkedout"] for replica in body["replicas"]] == [0, 0]
@@ -0,0 +1,36 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_get_stores(async_client: AsyncClient, store_ids):
+    """Prueba listar las tiendas registradas."""
+    response = await async_client.get("/api/stores/")
+    assert response.status_code == 200
+    assert {store["id"] for store in response.json()} == set(store_ids)
+
+
+@pytest.mark.asyncio
+async def test_store_crud(async_client: AsyncClient):
+    """Prueba crear, consultar, actualizar y eliminar una tienda."""
+    response = await async_client.post("/api/stores/", json={"name": "Sucursal Este"})
+    assert response.status_code == 201
+    store_id = response.json()["id"]
+    response = await async_client.put(f"/api/stores/{store_id}", json={"address": "Calle 10"})
+    assert response.json()["address"] == "Calle 10"
+    response = await async_client.get(f"/api/stores/{store_id}")
+    assert response.json()["name"] == "Sucursal Este"
+    response = await async_client.delete(f"/api/stores/{store_id}")
+    assert response.status_code == 200
+    response = await async_client.get(f"/api/stores/{store_id}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_inventory_in_unknown_store(async_client: AsyncClient):
+    """Prueba que el inventario de una tienda no registrada se rechace."""
+    response = await async_client.get(f"/api/stores/{uuid4()}/inventory")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Tienda no válida."
@@ -1,9 +1,11 @@
+import time
 import uuid
 
 import pytest
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from inventory_management_system.core.ids import uuid7
 from inventory_management_system.models.movement import Movement, MovementType
 from inventory_management_system.models.product import Product
 
@@ -93,3 +95,18 @@ async def test_movement_type_is_valid(sample_products):
             quantity=10,
             type="INVALID_TYPE",
         )
+
+
+def test_uuid7_is_time_ordered():
+    """Prueba que los UUIDv7 tienen versión 7, variante RFC y son crecientes aunque compartan milisegundo."""
+    ids = [uuid7() for _ in range(10000)]
+    assert all(value.version == 7 and value.variant == uuid.RFC_4122 for value in ids)
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert abs((ids[0].int >> 80) - time.time_ns() // 1_000_000) < 5000
+
+
+@pytest.mark.asyncio
+async def test_movement_id_defaults_to_uuid7(create_movement):
+    """Prueba que el ID de un movimiento nuevo es un UUIDv7 (valor por defecto de `UUID7_TABLES`)."""
+    movement = await create_movement()
+    assert movement.id.version == 7
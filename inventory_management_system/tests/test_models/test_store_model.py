@@ -0,0 +1,27 @@
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.models import Store
+
+
+@pytest.mark.asyncio
+async def test_create_store(async_db_session: AsyncSession) -> None:
+    """Verifica que una tienda se pueda crear con ID generado y fecha de alta."""
+    store = Store(name="Sucursal Norte", address="Av. Principal 100")
+    async_db_session.add(store)
+    await async_db_session.commit()
+    await async_db_session.refresh(store)
+
+    assert isinstance(store.id, uuid.UUID)
+    assert store.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_store_name_is_unique(async_db_session: AsyncSession) -> None:
+    """Verifica que no se puedan registrar dos tiendas con el mismo nombre."""
+    async_db_session.add_all([Store(name="Sucursal Sur"), Store(name="Sucursal Sur")])
+    with pytest.raises(IntegrityError):
+        await async_db_session.commit()
@@ -0,0 +1,71 @@
+import pytest
+from pydantic import ValidationError
+
+from inventory_management_system.core.settings import DATABASE_PROFILES, load_settings
+from inventory_management_system.db.database import engine_options, maintenance_engine_options
+
+PG_URL = "postgresql+asyncpg://user:password@db/inventory"
+
+
+def test_load_settings_profile_defaults():
+    """Verifica que APP_PROFILE elige los valores del pool y que el resto mantiene sus valores por defecto."""
+    settings = load_settings({"APP_PROFILE": "prod", "DATABASE_URL": PG_URL})
+    assert settings.database.profile == "prod"
+    assert settings.database.url == PG_URL
+    assert settings.database.pool_size == DATABASE_PROFILES["prod"]["pool_size"]
+    assert settings.database.statement_timeout_ms == DATABASE_PROFILES["prod"]["statement_timeout_ms"]
+    assert settings.database.echo is False
+    assert settings.product_cache_ttl == 300
+    assert settings.uuid7_tables == {"movements"}
+    assert settings.inventory_snapshot_interval_hours == 0
+
+
+def test_load_settings_overrides_and_lists():
+    """Verifica que las variables DB_* y las de la aplicación se imponen al perfil y que las listas se separan."""
+    settings = load_settings(
+        {
+            "APP_PROFILE": "test",
+            "DB_POOL_SIZE": "7",
+            "DB_ECHO": "true",
+            "DB_POOL_TIMEOUT": "",
+            "DATABASE_REPLICA_URLS": "sqlite+aiosqlite:///a.db, ,sqlite+aiosqlite:///b.db",
+            "UUID7_TABLES": "movements,products",
+            "MOVEMENT_WRITER_ENABLED": "1",
+        }
+    )
+    assert settings.database.pool_size == 7
+    assert settings.database.echo is True
+    assert settings.database.pool_timeout == DATABASE_PROFILES["test"]["pool_timeout"]
+    assert settings.database.replica_urls == ["sqlite+aiosqlite:///a.db", "sqlite+aiosqlite:///b.db"]
+    assert settings.uuid7_tables == {"movements", "products"}
+    assert settings.movement_writer_enabled is True
+
+
+def test_load_settings_rejects_invalid_values():
+    """Verifica que un perfil desconocido o un valor fuera de rango detienen la carga."""
+    with pytest.raises(ValueError, match="APP_PROFILE"):
+        load_settings({"APP_PROFILE": "staging"})
+    with pytest.raises(ValidationError):
+        load_settings({"DB_POOL_SIZE": "0"})
+    with pytest.raises(ValidationError):
+        load_settings({"PRODUCT_CACHE_TTL": "pronto"})
+
+
+def test_engine_options_by_backend():
+    """Verifica que el pool solo se dimensiona fuera de SQLite en memoria y los parámetros de sesión de asyncpg."""
+    database = load_settings({"APP_PROFILE": "prod"}).database
+    assert "pool_size" not in engine_options("sqlite+aiosqlite:///:memory:", database)
+    options = engine_options(PG_URL, database)
+    assert (options["pool_size"], options["max_overflow"], options["pool_recycle"]) == (20, 20, 1800)
+    assert options["connect_args"]["prepared_statement_cache_size"] == 500
+    assert options["connect_args"]["server_settings"]["statement_timeout"] == "30000"
+
+
+def test_maintenance_engine_options_without_session_limits():
+    """Verifica que el motor de mantenimiento conserva el pool del perfil pero sin límites de sesión."""
+    database = load_settings({"APP_PROFILE": "prod"}).database
+    options = maintenance_engine_options(PG_URL, database)
+    assert options["pool_size"] == engine_options(PG_URL, database)["pool_size"]
+    server_settings = options["connect_args"]["server_settings"]
+    assert (server_settings["statement_timeout"], server_settings["idle_in_transaction_session_timeout"]) == ("0", "0")
+    assert database.statement_timeout_ms == 30_000
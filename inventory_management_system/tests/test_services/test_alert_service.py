@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.core.events import RESET_EVENT, EventBroker, sse_stream
+from inventory_management_system.models.inventory import Inventory
+from inventory_management_system.schemas.inventory import InventoryTransferRequest, InventoryUpdate
+from inventory_management_system.services.alert_service import (
+    ALERT_CLEARED,
+    ALERT_RAISED,
+    STOCK_CHANGED,
+    inventory_events,
+)
+from inventory_management_system.services.inventory_service import transfer_inventory, update_inventory
+
+
+def _drain(subscription) -> list:
+    events = []
+    while not subscription._queue.empty():
+        events.append(subscription._queue.get_nowait())
+    return events
+
+
+@pytest.mark.asyncio
+async def test_event_broker_filters_by_topic():
+    """Prueba que cada suscriptor reciba solo los eventos de su tienda."""
+    broker = EventBroker(queue_size=10, history_size=10)
+    store_a = broker.subscribe("a")
+    everything = broker.subscribe()
+    broker.publish(STOCK_CHANGED, "a", {})
+    broker.publish(STOCK_CHANGED, "b", {})
+    assert len(_drain(store_a)) == 1
+    assert len(_drain(everything)) == 2
+
+
+@pytest.mark.asyncio
+async def test_event_broker_drops_slow_consumer():
+    """Prueba que un suscriptor con la cola llena se descarte sin bloquear al publicador."""
+    broker = EventBroker(queue_size=2, history_size=10)
+    slow = broker.subscribe()
+    for _ in range(3):
+        broker.publish(STOCK_CHANGED, "a", {})
+    assert slow.dropped
+    assert await slow.get() is None
+    assert broker.stats()["dropped_subscribers"] == 1
+    assert broker.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_event_broker_resume_token():
+    """Prueba reanudar desde un token y recibir `reset` con un token de otra época o fuera del historial."""
+    broker = EventBroker(queue_size=10, history_size=2)
+    first = broker.publish(STOCK_CHANGED, "a", {})
+    second = broker.publish(STOCK_CHANGED, "a", {})
+    third = broker.publish(STOCK_CHANGED, "a", {})
+    resumed = broker.subscribe("a", last_event_id=second.id)
+    assert [event.id for event in _drain(resumed)] == [third.id]
+    expired = broker.subscribe("a", last_event_id=f"{first.id.split('-')[0]}-0")
+    assert [event.type for event in _drain(expired)] == [RESET_EVENT]
+    other_epoch = broker.subscribe("a", last_event_id="otra-1")
+    assert [event.type for event in _drain(other_epoch)] == [RESET_EVENT]
+
+
+@pytest.mark.asyncio
+async def test_event_broker_resume_backlog_larger_than_queue():
+    """Prueba que, si los eventos a reenviar no caben en la cola, el suscriptor recibe `reset` y sigue suscrito."""
+    broker = EventBroker(queue_size=2, history_size=10)
+    first = broker.publish(STOCK_CHANGED, "a", {})
+    for _ in range(3):
+        broker.publish(STOCK_CHANGED, "a", {})
+    resumed = broker.subscribe("a", last_event_id=first.id)
+    (reset,) = _drain(resumed)
+    assert (reset.type, resumed.dropped) == (RESET_EVENT, False)
+    following = broker.publish(STOCK_CHANGED, "a", {})
+    assert [event.id for event in _drain(resumed)] == [following.id]
+    assert broker.subscribe("a", last_event_id=reset.id).dropped is False
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_formats_events_and_unsubscribes():
+    """Prueba el formato SSE, el keep-alive y que la suscripción se elimine al cerrar el flujo."""
+    broker = EventBroker(queue_size=10, history_size=10)
+    subscription = broker.subscribe()
+    stream = sse_stream(broker, subscription, keepalive=0.01)
+    assert (await stream.__anext__()).startswith("retry:")
+    assert await stream.__anext__() == ": keep-alive\n\n"
+    event = broker.publish(ALERT_RAISED, "a", {"quantity": 1})
+    assert await stream.__anext__() == f'id: {event.id}\nevent: alert_raised\ndata: {{"quantity": 1}}\n\n'
+    await stream.aclose()
+    assert broker.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_inventory_writes_publish_alert_events(async_db_session: AsyncSession, sample_inventory):
+    """Prueba que actualizar y transferir stock publique los eventos de alerta de la tienda afectada."""
+    inventory = sample_inventory[0]
+    source_store_id = sample_inventory[1].store_id
+    async_db_session.add(
+        Inventory(product_id=inventory.product_id, store_id=source_store_id, quantity=100, min_stock=5)
+    )
+    await async_db_session.commit()
+    subscription = inventory_events.subscribe(inventory.store_id)
+    try:
+        await update_inventory(inventory.id, InventoryUpdate(min_stock=inventory.quantity), async_db_session)
+        assert [event.type for event in _drain(subscription)] == [STOCK_CHANGED, ALERT_RAISED]
+        transfer_data = InventoryTransferRequest(
+            product_id=inventory.product_id,
+            source_store_id=source_store_id,
+            target_store_id=inventory.store_id,
+            quantity=1,
+        )
+        await transfer_inventory(transfer_data, async_db_session)
+        events = _drain(subscription)
+    finally:
+        inventory_events.unsubscribe(subscription)
+    assert [event.type for event in events] == [STOCK_CHANGED, ALERT_CLEARED]
+    assert events[0].data["quantity"] == inventory.quantity + 1
@@ -0,0 +1,94 @@
+import os
+import uuid
+from datetime import datetime
+from typing import List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.core.pagination import encode_cursor
+from inventory_management_system.models import Product
+from inventory_management_system.models.movement import MovementType
+from inventory_management_system.services import archive_service
+from inventory_management_system.services.movement_service import get_all_movements, movement_cursor_key
+from inventory_management_system.services.partition_service import expire_movements
+from inventory_management_system.services.stock_service import insert_movements, movement_values
+
+
+@pytest.fixture
+async def archived_movements(async_db_session: AsyncSession, sample_products: List[Product], store_ids, tmp_path):
+    """Tres movimientos de enero y febrero de 2025 retirados al archivo y uno reciente que sigue en la BD."""
+    product_id, store_a, store_b = sample_products[0].id, uuid.UUID(store_ids[0]), uuid.UUID(store_ids[1])
+    await insert_movements(
+        [
+            movement_values(MovementType.IN, product_id, None, store_a, 5, timestamp=datetime(2025, 1, 10)),
+            movement_values(MovementType.TRANSFER, product_id, store_a, store_b, 2, timestamp=datetime(2025, 2, 3)),
+            movement_values(MovementType.OUT, product_id, store_b, None, 1, timestamp=datetime(2025, 2, 20)),
+            movement_values(MovementType.IN, product_id, None, store_a, 7),
+        ],
+        async_db_session,
+    )
+    await async_db_session.commit()
+    report = await expire_movements(async_db_session, 6, archive_dir=str(tmp_path))
+    assert (report["archived"], report["deleted"]) == (3, 3)
+    return store_a, store_b, report["cutoff"]
+
+
+@pytest.mark.asyncio
+async def test_archive_files_by_month_and_store(archived_movements, tmp_path):
+    """Prueba que el archivo tiene un Parquet por mes y por tienda de origen (o destino) en cada ejecución."""
+    store_a, store_b, cutoff = archived_movements
+    part = f"{cutoff:%Y%m%dT%H%M%S}"
+    assert sorted(os.listdir(tmp_path)) == ["2025-01", "2025-02"]
+    assert os.listdir(tmp_path / "2025-01") == [f"store={store_a}-{part}.parquet"]
+    assert sorted(os.listdir(tmp_path / "2025-02")) == sorted(
+        [f"store={store_a}-{part}.parquet", f"store={store_b}-{part}.parquet"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_archive_run_keeps_earlier_files(
+    async_db_session: AsyncSession, archived_movements, sample_products: List[Product], tmp_path
+):
+    """Prueba que una ejecución posterior con filas del mismo mes y tienda no reemplaza lo archivado antes."""
+    store_a, _, _ = archived_movements
+    await insert_movements(
+        [movement_values(MovementType.OUT, sample_products[0].id, store_a, None, 3, timestamp=datetime(2025, 2, 25))],
+        async_db_session,
+    )
+    await async_db_session.commit()
+    assert await archive_service.archive_movements(async_db_session, datetime(2026, 5, 1), str(tmp_path)) == 1
+    assert len(os.listdir(tmp_path / "2025-02")) == 3
+    movements = archive_service.read_archived_movements(str(tmp_path), limit=10, store_id=store_a)
+    assert [movement.quantity for movement in movements] == [3, 2, 5]
+
+
+@pytest.mark.asyncio
+async def test_get_all_movements_merges_archive(
+    async_db_session: AsyncSession, archived_movements, tmp_path, monkeypatch
+):
+    """Prueba que el listado sigue con el archivo cuando la BD no completa la página (filtros, offset y cursor)."""
+    store_a, store_b, _ = archived_movements
+    monkeypatch.setattr(archive_service, "MOVEMENT_ARCHIVE_DIR", str(tmp_path))
+
+    movements = await get_all_movements(async_db_session, limit=10)
+    assert [(movement.type, movement.quantity) for movement in movements] == [
+        (MovementType.IN, 7),
+        (MovementType.OUT, 1),
+        (MovementType.TRANSFER, 2),
+        (MovementType.IN, 5),
+    ]
+    # 🔹 La transferencia está en el archivo de la tienda A, pero sus metadatos incluyen la B
+    movements = await get_all_movements(async_db_session, store_id=store_b)
+    assert [movement.type for movement in movements] == [MovementType.OUT, MovementType.TRANSFER]
+    movements = await get_all_movements(async_db_session, skip=3)
+    assert [movement.quantity for movement in movements] == [5]
+
+    first_page = await get_all_movements(async_db_session, limit=2)
+    cursor = encode_cursor(*movement_cursor_key(first_page[-1]))
+    second_page = await get_all_movements(async_db_session, limit=2, cursor=cursor)
+    assert [movement.quantity for movement in first_page + second_page] == [7, 1, 2, 5]
+
+    rows = await get_all_movements(async_db_session, limit=10, as_rows=True)
+    pages = first_page + second_page
+    assert [(row.id, row.type, row.timestamp) for row in rows] == [(m.id, m.type, m.timestamp) for m in pages]
@@ -3,28 +3,37 @@ from typing import List
 
 import pytest
 from fastapi.exceptions import HTTPException
+from sqlalchemy import event, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from inventory_management_system.config import VALID_STORE_IDS
+from inventory_management_system.core.pagination import encode_cursor
 from inventory_management_system.models.inventory import Inventory
+from inventory_management_system.models.movement import Movement, MovementType
+from inventory_management_system.models.product import Product
 from inventory_management_system.schemas.inventory import InventoryCreate, InventoryTransferRequest, InventoryUpdate
+from inventory_management_system.services import stock_service
+from inventory_management_system.services.alert_service import get_low_stock_alerts_version
 from inventory_management_system.services.inventory_service import (
     create_inventory,
     delete_inventory,
     get_inventory_by_id,
     get_inventory_by_store,
     get_low_stock_alerts,
+    low_stock_alert_cursor_key,
     transfer_inventory,
+    transfer_inventory_batch,
     update_inventory,
 )
+from inventory_management_system.services.product_service import check_stock_totals
+from inventory_management_system.tests.conftest import TestingSessionLocal
 
 
 @pytest.mark.asyncio
-async def test_create_inventory(async_db_session: AsyncSession, sample_products: List):
+async def test_create_inventory(async_db_session: AsyncSession, sample_products: List, store_ids):
     """Prueba la creación de un nuevo inventario"""
     # 🔹 Generar UUIDs para producto y tienda
     product_id = sample_products[0].id
-    store_id = list(VALID_STORE_IDS)[0]
+    store_id = store_ids[0]
     # 🔹 Datos de prueba corregidos
     inventory_data = InventoryCreate(
         product_id=product_id, store_id=store_id, quantity=10, min_stock=2  # Agregamos el campo requerido
@@ -41,11 +50,85 @@ async def test_create_inventory(async_db_session: AsyncSession, sample_products:
 
 
 @pytest.mark.asyncio
-async def test_transfer_inventory(async_db_session: AsyncSession, sample_products):
+async def test_inventory_writes_maintain_product_stock(
+    async_db_session: AsyncSession, sample_products: List, store_ids
+):
+    """Prueba que crear, actualizar, transferir y eliminar inventario mantenga `Product.stock`"""
+    product = sample_products[0]
+    source_store_id, target_store_id = (uuid.UUID(store_id) for store_id in store_ids[:2])
+    inventory = await create_inventory(
+        InventoryCreate(product_id=product.id, store_id=source_store_id, quantity=30, min_stock=2), async_db_session
+    )
+    await create_inventory(
+        InventoryCreate(product_id=product.id, store_id=target_store_id, quantity=10, min_stock=2), async_db_session
+    )
+    await update_inventory(inventory.id, InventoryUpdate(quantity=25), async_db_session)
+    await transfer_inventory(
+        InventoryTransferRequest(
+            product_id=product.id, source_store_id=source_store_id, target_store_id=target_store_id, quantity=5
+        ),
+        async_db_session,
+    )
+    await async_db_session.refresh(product)
+    assert product.stock == 35
+    await delete_inventory(inventory.id, async_db_session)
+    await async_db_session.refresh(product)
+    assert product.stock == 15
+    assert await check_stock_totals(async_db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_inventory_use_current_quantity(
+    async_db_session: AsyncSession, sample_products: List, store_ids
+):
+    """
+    Prueba que actualizar y eliminar ajusten `Product.stock` y el historial con la cantidad vigente (no la cargada
+    antes en la sesión) y que la fila de inventario sea la primera que se escribe (mismo orden de bloqueo que los
+    movimientos).
+    """
+    product = sample_products[0]
+    inventory = await create_inventory(
+        InventoryCreate(product_id=product.id, store_id=uuid.UUID(store_ids[0]), quantity=30, min_stock=2),
+        async_db_session,
+    )
+    async with TestingSessionLocal() as other_request:  # 🔹 Una venta de otra petición tras cargar la fila
+        await other_request.execute(update(Inventory).where(Inventory.id == inventory.id).values(quantity=20))
+        await other_request.execute(update(Product).where(Product.id == product.id).values(stock_total=20))
+        await other_request.commit()
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().upper())
+
+    engine = async_db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        await update_inventory(inventory.id, InventoryUpdate(quantity=25), async_db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    writes = [statement for statement in statements if not statement.startswith("SELECT")]
+    assert statements[0].startswith("SELECT") and writes[0].startswith("UPDATE INVENTORY")
+    await async_db_session.refresh(product)
+    assert product.stock == 25
+    async with TestingSessionLocal() as other_request:
+        await other_request.execute(update(Inventory).where(Inventory.id == inventory.id).values(quantity=15))
+        await other_request.execute(update(Product).where(Product.id == product.id).values(stock_total=15))
+        await other_request.commit()
+    await delete_inventory(inventory.id, async_db_session)
+    await async_db_session.refresh(product)
+    assert product.stock == 0
+    adjustments = await async_db_session.execute(
+        select(Movement.type, Movement.quantity).where(Movement.product_id == product.id).order_by(Movement.timestamp)
+    )
+    assert adjustments.all() == [(MovementType.IN, 30), (MovementType.IN, 5), (MovementType.OUT, 15)]
+
+
+@pytest.mark.asyncio
+async def test_transfer_inventory(async_db_session: AsyncSession, sample_products, store_ids):
     """Prueba la transferencia de inventario entre tiendas"""
     product_id = sample_products[0].id
-    source_store_id = uuid.UUID(list(VALID_STORE_IDS)[0])
-    target_store_id = uuid.UUID(list(VALID_STORE_IDS)[1])  # Una tienda diferente
+    source_store_id = uuid.UUID(store_ids[0])
+    target_store_id = uuid.UUID(store_ids[1])  # Una tienda diferente
     # 🔹 Crear inventario en la tienda de origen con stock suficiente
     source_inventory = Inventory(
         product_id=product_id,
@@ -70,11 +153,11 @@ async def test_transfer_inventory(async_db_session: AsyncSession, sample_product
 
 
 @pytest.mark.asyncio
-async def test_transfer_fails_due_to_low_stock(async_db_session: AsyncSession, sample_products):
+async def test_transfer_fails_due_to_low_stock(async_db_session: AsyncSession, sample_products, store_ids):
     """Prueba que falle la transferencia si el stock en la tienda de origen queda por debajo del mínimo"""
     product_id = sample_products[0].id
-    source_store_id = uuid.UUID(list(VALID_STORE_IDS)[0])
-    target_store_id = uuid.UUID(list(VALID_STORE_IDS)[1])
+    source_store_id = uuid.UUID(store_ids[0])
+    target_store_id = uuid.UUID(store_ids[1])
     # 🔹 Crear inventario con poco stock
     source_inventory = Inventory(
         product_id=product_id,
@@ -98,9 +181,133 @@ async def test_transfer_fails_due_to_low_stock(async_db_session: AsyncSession, s
 
 
 @pytest.mark.asyncio
-async def test_get_inventory_by_store(async_db_session: AsyncSession, sample_products):
+async def test_transfer_inventory_upserts_target_and_records_movement(
+    async_db_session: AsyncSession, sample_products, store_ids
+):
+    """Prueba que la transferencia sume en un destino existente y registre el movimiento en la misma transacción"""
+    product_id = sample_products[0].id
+    source_store_id = uuid.UUID(store_ids[0])
+    target_store_id = uuid.UUID(store_ids[1])
+    async_db_session.add_all(
+        [
+            Inventory(product_id=product_id, store_id=source_store_id, quantity=20, min_stock=3),
+            Inventory(product_id=product_id, store_id=target_store_id, quantity=7, min_stock=2),
+        ]
+    )
+    await async_db_session.commit()
+    transfer_data = InventoryTransferRequest(
+        product_id=product_id, source_store_id=source_store_id, target_store_id=target_store_id, quantity=6
+    )
+    response = await transfer_inventory(transfer_data, async_db_session)
+    assert response["source_store"]["remaining_stock"] == 14
+    assert response["target_store"]["new_stock"] == 13
+    result = await async_db_session.execute(select(Movement).where(Movement.product_id == product_id))
+    movement = result.scalar_one()
+    assert movement.type == MovementType.TRANSFER
+    assert movement.quantity == 6
+    assert movement.source_store_id == source_store_id
+    assert movement.target_store_id == target_store_id
+
+
+@pytest.mark.asyncio
+async def test_transfer_fails_without_changing_stock(async_db_session: AsyncSession, sample_products, store_ids):
+    """Prueba que una transferencia rechazada no modifique el stock ni registre movimientos"""
+    product_id = sample_products[0].id
+    source_store_id = uuid.UUID(store_ids[0])
+    target_store_id = uuid.UUID(store_ids[1])
+    async_db_session.add(Inventory(product_id=product_id, store_id=source_store_id, quantity=10, min_stock=5))
+    await async_db_session.commit()
+    transfer_data = InventoryTransferRequest(
+        product_id=product_id, source_store_id=source_store_id, target_store_id=target_store_id, quantity=5
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await transfer_inventory(transfer_data, async_db_session)
+    assert exc_info.value.status_code == 400
+    quantities = await async_db_session.execute(select(Inventory.store_id, Inventory.quantity))
+    assert quantities.all() == [(source_store_id, 10)]
+    movements = await async_db_session.execute(select(Movement))
+    assert movements.scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_transfer_fails_when_source_has_no_inventory(async_db_session: AsyncSession, sample_products, store_ids):
+    """Prueba que falle la transferencia si el producto no existe en la tienda de origen"""
+    transfer_data = InventoryTransferRequest(
+        product_id=sample_products[0].id,
+        source_store_id=uuid.UUID(store_ids[0]),
+        target_store_id=uuid.UUID(store_ids[1]),
+        quantity=1,
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await transfer_inventory(transfer_data, async_db_session)
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_transfer_inventory_batch(async_db_session: AsyncSession, sample_products, store_ids):
+    """Prueba un lote de transferencias con resultados mixtos aplicado en una sola transacción"""
+    product_id = sample_products[0].id
+    source_store_id = uuid.UUID(store_ids[0])
+    target_store_id = uuid.UUID(store_ids[1])
+    async_db_session.add(Inventory(product_id=product_id, store_id=source_store_id, quantity=20, min_stock=5))
+    await async_db_session.commit()
+    transfers = [
+        InventoryTransferRequest(
+            product_id=product_id, source_store_id=source_store_id, target_store_id=target_store_id, quantity=6
+        ),
+        InventoryTransferRequest(
+            product_id=product_id, source_store_id=source_store_id, target_store_id=target_store_id, quantity=6
+        ),
+        # 🔹 Dejaría 2 unidades en origen (mínimo 5): se rechaza sin afectar al resto del lote
+        InventoryTransferRequest(
+            product_id=product_id, source_store_id=source_store_id, target_store_id=target_store_id, quantity=6
+        ),
+        InventoryTransferRequest(
+            product_id=uuid.uuid4(), source_store_id=source_store_id, target_store_id=target_store_id, quantity=1
+        ),
+    ]
+    results = await transfer_inventory_batch(transfers, async_db_session)
+    assert [result.status_code for result in results] == [200, 200, 400, 404]
+    assert (results[1].remaining_stock, results[1].new_stock) == (8, 12)
+    quantities = await async_db_session.execute(select(Inventory.store_id, Inventory.quantity))
+    assert dict(quantities.all()) == {source_store_id: 8, target_store_id: 12}
+    movements = await async_db_session.execute(select(Movement).where(Movement.type == MovementType.TRANSFER))
+    assert len(movements.scalars().all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_transfer_inventory_batch_target_created_concurrently(
+    async_db_session: AsyncSession, sample_products, monkeypatch, store_ids
+):
+    """Prueba que el stock informado use el valor real si otra transacción creó la fila destino tras el bloqueo"""
+    product_id = sample_products[0].id
+    source_store_id = uuid.UUID(store_ids[0])
+    target_store_id = uuid.UUID(store_ids[1])
+    async_db_session.add_all(
+        [
+            Inventory(product_id=product_id, store_id=source_store_id, quantity=20, min_stock=5),
+            Inventory(product_id=product_id, store_id=target_store_id, quantity=7, min_stock=2),
+        ]
+    )
+    await async_db_session.commit()
+    select_for_update = stock_service.select_inventory_for_update
+
+    async def _without_target(keys, db):
+        rows = await select_for_update(keys, db)
+        return [row for row in rows if row["store_id"] != target_store_id]
+
+    monkeypatch.setattr(stock_service, "select_inventory_for_update", _without_target)
+    transfer_data = InventoryTransferRequest(
+        product_id=product_id, source_store_id=source_store_id, target_store_id=target_store_id, quantity=6
+    )
+    results = await transfer_inventory_batch([transfer_data, transfer_data], async_db_session)
+    assert [(result.remaining_stock, result.new_stock) for result in results] == [(14, 13), (8, 19)]
+
+
+@pytest.mark.asyncio
+async def test_get_inventory_by_store(async_db_session: AsyncSession, sample_products, store_ids):
     """Prueba obtener inventario de una tienda con paginación"""
-    store_id = uuid.UUID(list(VALID_STORE_IDS)[0])
+    store_id = uuid.UUID(store_ids[0])
     inventory_item = Inventory(
         id=uuid.uuid4(),
         product_id=sample_products[0].id,
@@ -116,12 +323,12 @@ async def test_get_inventory_by_store(async_db_session: AsyncSession, sample_pro
 
 
 @pytest.mark.asyncio
-async def test_get_low_stock_alerts(async_db_session: AsyncSession, sample_products):
+async def test_get_low_stock_alerts(async_db_session: AsyncSession, sample_products, store_ids):
     """Prueba obtener alertas de inventario bajo"""
     low_stock_item = Inventory(
         id=uuid.uuid4(),
         product_id=sample_products[0].id,
-        store_id=uuid.UUID(list(VALID_STORE_IDS)[0]),
+        store_id=uuid.UUID(store_ids[0]),
         quantity=1,
         min_stock=5,
     )
@@ -133,13 +340,60 @@ async def test_get_low_stock_alerts(async_db_session: AsyncSession, sample_produ
 
 
 @pytest.mark.asyncio
-async def test_get_inventory_by_id(async_db_session: AsyncSession, sample_products):
+async def test_get_low_stock_alerts_filters_and_cursor(async_db_session: AsyncSession, sample_products, store_ids):
+    """Prueba filtrar las alertas por tienda y categoría y recorrerlas por cursor."""
+    sample_products[2].category = "Acabados"
+    async_db_session.add_all(
+        Inventory(product_id=product.id, store_id=uuid.UUID(store_id), quantity=1, min_stock=5)
+        for product in sample_products
+        for store_id in store_ids[:2]
+    )
+    await async_db_session.commit()
+    alerts = await get_low_stock_alerts(async_db_session, store_id=uuid.UUID(store_ids[0]))
+    assert len(alerts) == 3
+    alerts = await get_low_stock_alerts(async_db_session, category="Acabados")
+    assert {alert["product_id"] for alert in alerts} == {sample_products[2].id}
+    first_page = await get_low_stock_alerts(async_db_session, limit=4)
+    cursor = encode_cursor(*low_stock_alert_cursor_key(first_page[-1]))
+    second_page = await get_low_stock_alerts(async_db_session, limit=4, cursor=cursor)
+    assert len(first_page) + len(second_page) == 6
+
+
+@pytest.mark.asyncio
+async def test_low_stock_alerts_version(async_db_session: AsyncSession, sample_inventory):
+    """Prueba que la versión de alertas solo cambie cuando una escritura afecta al conjunto de alertas."""
+    inventory = sample_inventory[0]
+    version = await get_low_stock_alerts_version(async_db_session)
+    await update_inventory(inventory.id, InventoryUpdate(quantity=inventory.quantity + 1), async_db_session)
+    assert await get_low_stock_alerts_version(async_db_session) == version
+    await update_inventory(inventory.id, InventoryUpdate(min_stock=inventory.quantity), async_db_session)
+    assert await get_low_stock_alerts_version(async_db_session) == version + 1
+    assert len(await get_low_stock_alerts(async_db_session)) == 1
+    # 🔹 Una transferencia que saca el destino de la alerta también cambia la versión
+    source_store_id = sample_inventory[1].store_id
+    async_db_session.add(
+        Inventory(product_id=inventory.product_id, store_id=source_store_id, quantity=100, min_stock=5)
+    )
+    await async_db_session.commit()
+    transfer_data = InventoryTransferRequest(
+        product_id=inventory.product_id, source_store_id=source_store_id, target_store_id=inventory.store_id, quantity=1
+    )
+    await transfer_inventory(transfer_data, async_db_session)
+    assert await get_low_stock_alerts_version(async_db_session) == version + 2
+    assert await get_low_stock_alerts(async_db_session) == []
+    # 🔹 Cada tienda tiene su versión: la del origen de la transferencia no cambió
+    assert await get_low_stock_alerts_version(async_db_session, inventory.store_id) == 2
+    assert await get_low_stock_alerts_version(async_db_session, source_store_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_inventory_by_id(async_db_session: AsyncSession, sample_products, store_ids):
     """Prueba obtener inventario por ID"""
     inventory_id = uuid.uuid4()
     inventory_item = Inventory(
         id=inventory_id,
         product_id=sample_products[0].id,
-        store_id=uuid.UUID(list(VALID_STORE_IDS)[0]),
+        store_id=uuid.UUID(store_ids[0]),
         quantity=10,
         min_stock=2,
     )
@@ -150,13 +404,13 @@ async def test_get_inventory_by_id(async_db_session: AsyncSession, sample_produc
 
 
 @pytest.mark.asyncio
-async def test_update_inventory(async_db_session: AsyncSession, sample_products):
+async def test_update_inventory(async_db_session: AsyncSession, sample_products, store_ids):
     """Prueba actualizar el inventario"""
     inventory_id = uuid.uuid4()
     inventory_item = Inventory(
         id=inventory_id,
         product_id=sample_products[0].id,
-        store_id=uuid.UUID(list(VALID_STORE_IDS)[0]),
+        store_id=uuid.UUID(store_ids[0]),
         quantity=10,
         min_stock=2,
     )
@@ -168,13 +422,13 @@ async def test_update_inventory(async_db_session: AsyncSession, sample_products)
 
 
 @pytest.mark.asyncio
-async def test_delete_inventory(async_db_session: AsyncSession, sample_products):
+async def test_delete_inventory(async_db_session: AsyncSession, sample_products, store_ids):
     """Prueba eliminar inventario"""
     inventory_id = uuid.uuid4()
     inventory_item = Inventory(
         id=inventory_id,
         product_id=sample_products[0].id,
-        store_id=uuid.UUID(list(VALID_STORE_IDS)[0]),
+        store_id=uuid.UUID(store_ids[0]),
         quantity=10,
         min_stock=2,
     )
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from inventory_management_system import main
+from inventory_management_system.db import migrations
+from inventory_management_system.db.migrations import (
+    apply_migrations,
+    initial_store_rows,
+    schema_differences,
+    script_heads,
+)
+from inventory_management_system.models import Base
+from inventory_management_system.services.store_service import store_registry
+
+HEAD = "f9b3d6e2a714"
+PREVIOUS = "c8a3f5d17e42"  # 🔹 Pasar de aquí a HEAD cambia `low_stock_alert_state` por `low_stock_alert_versions`
+
+
+async def _database(url: str, revision: str) -> None:
+    """Base con el esquema actual marcada en `revision` (con la versión de alertas única si no es la cabeza)."""
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if revision != HEAD:
+            await conn.execute(text("DROP TABLE low_stock_alert_versions"))
+            await conn.execute(
+                text("CREATE TABLE low_stock_alert_state (id INTEGER PRIMARY KEY, version BIGINT NOT NULL)")
+            )
+            await conn.execute(text("INSERT INTO low_stock_alert_state VALUES (1, 7)"))
+            await conn.execute(
+                text("INSERT INTO stores (id, name) VALUES ('00000000000000000000000000000001', 'Centro')")
+            )
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": revision})
+    await engine.dispose()
+
+
+def test_script_heads_without_importing_scripts():
+    """Prueba que la cabeza se obtiene leyendo `revision`/`down_revision` de los archivos de versiones."""
+    assert script_heads() == {HEAD}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_migrate_once(tmp_path):
+    """Prueba que, con dos workers arrancando a la vez, solo uno migra (bloqueo de archivo) y el otro no repite."""
+    url = f"sqlite+aiosqlite:///{tmp_path}/migrate.db"
+    await _database(url, PREVIOUS)
+    engines = [create_async_engine(url), create_async_engine(url)]
+    reports = await asyncio.gather(*(apply_migrations(engine) for engine in engines))
+    assert sorted(report["applied"] for report in reports) == [False, True]
+    assert all(report["to"] == [HEAD] for report in reports)
+    async with engines[0].connect() as conn:
+        tables = await conn.run_sync(lambda sync: inspect(sync).get_table_names())
+        assert "low_stock_alert_versions" in tables and "low_stock_alert_state" not in tables
+        # 🔹 Cada tienda parte de la versión global anterior
+        assert (await conn.execute(text("SELECT version FROM low_stock_alert_versions"))).scalars().all() == [7]
+        assert (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar_one() == HEAD
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_at_head_skips_alembic(tmp_path, monkeypatch, caplog):
+    """Prueba que con la base en la cabeza el arranque no carga Alembic ni toma el bloqueo, e informa del tiempo."""
+    url = f"sqlite+aiosqlite:///{tmp_path}/head.db"
+    await _database(url, HEAD)
+
+    def fail(connection):
+        raise AssertionError("no debería cargar los scripts de migración")
+
+    engine = create_async_engine(url)
+    monkeypatch.setattr(migrations, "_upgrade", fail)
+    monkeypatch.setattr(migrations, "_migration_lock", fail)
+    monkeypatch.setattr(main, "engine", engine)
+    with caplog.at_level(logging.INFO):
+        async with main.lifespan(main.app):
+            pass
+    assert f"Migraciones ya al día ({HEAD})" in caplog.text
+    assert "API lista en" in caplog.text
+    assert store_registry._store_ids is not None  # 🔹 Registro de tiendas cargado al arrancar
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_empty_database_bootstrap_matches_models(tmp_path):
+    """
+    Prueba que una base vacía se crea desde los modelos y queda marcada en la cabeza sin ejecutar migraciones,
+    que el esquema coincide con los modelos y que un índice ausente aparece como diferencia.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/empty.db")
+    report = await apply_migrations(engine)
+    assert (report["applied"], report["bootstrapped"], report["from"], report["to"]) == (True, True, [], [HEAD])
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar_one() == HEAD
+        assert await conn.run_sync(schema_differences) == []
+        # 🔹 Las mismas tiendas iniciales que siembra la migración `d4a9b2c7e815`
+        stores = (await conn.execute(text("SELECT name FROM stores"))).scalars().all()
+        assert sorted(stores) == sorted(row["name"] for row in initial_store_rows()) and len(stores) == 5
+        await conn.execute(text("DROP INDEX ix_movements_product_timestamp"))
+        differences = await conn.run_sync(schema_differences)
+    assert [(kind, index.name) for kind, index in differences] == [("add_index", "ix_movements_product_timestamp")]
+    assert (await apply_migrations(engine))["applied"] is False
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_empty_database_without_bootstrap_replays_migrations(tmp_path, monkeypatch):
+    """Prueba que sin `bootstrap` una base vacía se migra con Alembic."""
+    calls = []
+    monkeypatch.setattr(migrations, "_upgrade", calls.append)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/empty.db")
+    report = await apply_migrations(engine, bootstrap=False)
+    assert (report["applied"], report["bootstrapped"], len(calls)) == (True, False, 1)
+    await engine.dispose()
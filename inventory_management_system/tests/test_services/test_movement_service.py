@@ -4,24 +4,29 @@ from typing import List
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy import event, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from inventory_management_system.config import VALID_STORE_IDS
-from inventory_management_system.models import Inventory
+from inventory_management_system.models import Inventory, Product
 from inventory_management_system.models.movement import Movement, MovementType
 from inventory_management_system.schemas.movement import MovementCreate
-from inventory_management_system.services.movement_service import create_movement, get_all_movements, get_movement_by_id
+from inventory_management_system.services.movement_service import (
+    create_movement,
+    create_movements_batch,
+    get_all_movements,
+    get_movement_by_id,
+)
 
 
 @pytest.mark.asyncio
-async def test_create_movement(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+async def test_create_movement(async_db_session: AsyncSession, sample_inventory: List[Inventory], store_ids):
     """Prueba la creación de un nuevo movimiento en el inventario"""
     # Seleccionar un inventario existente
     inventory_item = sample_inventory[0]
     movement_data = MovementCreate(
         product_id=inventory_item.product_id,
         source_store_id=inventory_item.store_id,
-        target_store_id=uuid.UUID(list(VALID_STORE_IDS)[1]),
+        target_store_id=uuid.UUID(store_ids[1]),
         quantity=5,
         type=MovementType.TRANSFER,
         timestamp=datetime.now(UTC),
@@ -37,6 +42,68 @@ async def test_create_movement(async_db_session: AsyncSession, sample_inventory:
     assert response.type == movement_data.type
 
 
+async def _quantities(db: AsyncSession, product_id: uuid.UUID) -> dict:
+    result = await db.execute(select(Inventory.store_id, Inventory.quantity).where(Inventory.product_id == product_id))
+    return dict(result.all())
+
+
+@pytest.mark.asyncio
+async def test_create_movement_applies_stock(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que un movimiento OUT descuente stock y uno IN cree el registro en una tienda nueva"""
+    product_id, store_id = sample_inventory[0].product_id, sample_inventory[0].store_id
+    other_store_id = sample_inventory[1].store_id
+    stock_total = await async_db_session.scalar(select(Product.stock_total).where(Product.id == product_id))
+    await create_movement(
+        MovementCreate(product_id=product_id, source_store_id=store_id, quantity=45, type=MovementType.OUT),
+        async_db_session,
+    )
+    await create_movement(
+        MovementCreate(product_id=product_id, target_store_id=other_store_id, quantity=3, type=MovementType.IN),
+        async_db_session,
+    )
+    assert await _quantities(async_db_session, product_id) == {store_id: 5, other_store_id: 3}
+    new_stock_total = await async_db_session.scalar(select(Product.stock_total).where(Product.id == product_id))
+    assert new_stock_total == stock_total - 45 + 3
+
+
+@pytest.mark.asyncio
+async def test_create_movement_insufficient_stock(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que un OUT mayor que el stock se rechace sin registrar el movimiento"""
+    product_id, store_id = sample_inventory[0].product_id, sample_inventory[0].store_id
+    movement_data = MovementCreate(product_id=product_id, source_store_id=store_id, quantity=51, type=MovementType.OUT)
+    with pytest.raises(HTTPException) as exc_info:
+        await create_movement(movement_data, async_db_session)
+    assert exc_info.value.status_code == 400
+    assert await _quantities(async_db_session, product_id) == {store_id: 50}
+    movements = await async_db_session.execute(select(Movement))
+    assert movements.scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_create_movements_batch_coalesces(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que muchas ventas sobre la misma fila se apliquen con un único UPDATE de inventario"""
+    product_id, store_id = sample_inventory[0].product_id, sample_inventory[0].store_id
+    sale = MovementCreate(product_id=product_id, source_store_id=store_id, quantity=4, type=MovementType.OUT)
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = async_db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        results = await create_movements_batch([sale] * 13, async_db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    # 🔹 50 unidades: 12 ventas de 4 se aplican, la 13ª dejaría el stock en negativo
+    assert [result.status_code for result in results] == [201] * 12 + [400]
+    assert results[11].source_stock == 2
+    assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE INVENTORY")]) == 1
+    assert await _quantities(async_db_session, product_id) == {store_id: 2}
+    movements = await async_db_session.execute(select(Movement))
+    assert len(movements.scalars().all()) == 12
+
+
 @pytest.mark.asyncio
 async def test_get_all_movements(async_db_session: AsyncSession, sample_movements: List[Movement]):
     """Prueba la obtención de todos los movimientos registrados en la base de datos."""
@@ -48,6 +115,20 @@ async def test_get_all_movements(async_db_session: AsyncSession, sample_movement
     assert all(isinstance(movement, Movement) for movement in movements)
 
 
+@pytest.mark.asyncio
+async def test_get_all_movements_date_range(async_db_session: AsyncSession, sample_movements: List[Movement]):
+    """Prueba que `date` y `end_date` (ambos días incluidos) acotan los movimientos por `timestamp`."""
+    days = [datetime(2026, 3, 31, 23, 59), datetime(2026, 4, 1, 8), datetime(2026, 4, 30, 23, 59), datetime(2026, 5, 1)]
+    for movement, timestamp in zip(sample_movements, days):
+        await async_db_session.execute(update(Movement).where(Movement.id == movement.id).values(timestamp=timestamp))
+    await async_db_session.commit()
+
+    movements = await get_all_movements(
+        async_db_session, date=datetime(2026, 4, 1).date(), end_date=datetime(2026, 4, 30).date()
+    )
+    assert [movement.timestamp for movement in movements] == [days[2], days[1]]
+
+
 @pytest.mark.asyncio
 async def test_get_movement_by_id(async_db_session: AsyncSession, sample_movements: List[Movement]):
     """Prueba la obtención de un movimiento por su ID usando datos de sample_movements"""
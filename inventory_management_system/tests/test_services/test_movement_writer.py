@@ -0,0 +1,76 @@
+import asyncio
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from inventory_management_system.models import Inventory
+from inventory_management_system.models.movement import Movement, MovementType
+from inventory_management_system.schemas.movement import MovementCreate
+from inventory_management_system.services.movement_writer import MovementWriter
+
+
+def _writer(db: AsyncSession, max_batch: int = 100, max_delay: float = 0.05) -> MovementWriter:
+    return MovementWriter(async_sessionmaker(bind=db.bind, expire_on_commit=False), max_batch, max_delay)
+
+
+def _sale(inventory: Inventory, quantity: int) -> MovementCreate:
+    return MovementCreate(
+        product_id=inventory.product_id, source_store_id=inventory.store_id, quantity=quantity, type=MovementType.OUT
+    )
+
+
+@pytest.mark.asyncio
+async def test_movement_writer_groups_concurrent_movements(
+    async_db_session: AsyncSession, sample_inventory: List[Inventory]
+):
+    """Prueba que movimientos concurrentes se confirmen en un solo lote y cada llamador reciba el suyo"""
+    product_id, store_id = sample_inventory[0].product_id, sample_inventory[0].store_id
+    writer = _writer(async_db_session)
+    writer.start()
+    try:
+        movements = await asyncio.gather(*(writer.submit(_sale(sample_inventory[0], 2)) for _ in range(10)))
+    finally:
+        await writer.close()
+    assert writer.batches == 1
+    assert len({movement.id for movement in movements}) == 10
+    assert all(isinstance(movement, Movement) and movement.quantity == 2 for movement in movements)
+    quantity = await async_db_session.scalar(
+        select(Inventory.quantity).where((Inventory.product_id == product_id) & (Inventory.store_id == store_id))
+    )
+    assert quantity == 30
+
+
+@pytest.mark.asyncio
+async def test_movement_writer_reports_errors_per_caller(
+    async_db_session: AsyncSession, sample_inventory: List[Inventory]
+):
+    """Prueba que un movimiento inválido falle solo para su llamador"""
+    writer = _writer(async_db_session)
+    writer.start()
+    try:
+        results = await asyncio.gather(
+            writer.submit(_sale(sample_inventory[0], 10)),
+            writer.submit(_sale(sample_inventory[0], 1000)),
+            return_exceptions=True,
+        )
+    finally:
+        await writer.close()
+    assert isinstance(results[0], Movement)
+    assert isinstance(results[1], HTTPException) and results[1].status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_movement_writer_close_flushes_pending(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que `close()` confirme los movimientos encolados y deje de aceptar nuevos"""
+    writer = _writer(async_db_session, max_batch=3, max_delay=10)
+    writer.start()
+    pending = [asyncio.create_task(writer.submit(_sale(sample_inventory[0], 1))) for _ in range(5)]
+    await asyncio.sleep(0)
+    await writer.close()
+    assert all(task.done() and isinstance(task.result(), Movement) for task in pending)
+    assert writer.flushed == 5
+    with pytest.raises(RuntimeError):
+        await writer.submit(_sale(sample_inventory[0], 1))
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime
+from typing import List
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.models import Movement, MovementBalance, Product
+from inventory_management_system.schemas.inventory import InventoryCreate, InventoryTransferRequest
+from inventory_management_system.services.inventory_service import create_inventory, transfer_inventory
+from inventory_management_system.services.partition_service import (
+    add_months,
+    ensure_movement_partitions,
+    expire_movements,
+    partition_from_default_statements,
+    partition_name,
+)
+from inventory_management_system.services.reconciliation_service import reconcile_store
+
+
+def test_partition_months():
+    """Prueba el cálculo de meses (con cambio de año) y el nombre de la partición mensual."""
+    assert add_months(datetime(2026, 11, 1), 3) == datetime(2027, 2, 1)
+    assert add_months(datetime(2026, 1, 1), -13) == datetime(2024, 12, 1)
+    assert partition_name(datetime(2026, 4, 1)) == "movements_p2026_04"
+
+
+def test_partition_from_default_moves_rows_before_attaching():
+    """Prueba que las filas del mes salen de `movements_default` antes de adjuntar la nueva partición."""
+    statements = partition_from_default_statements(datetime(2026, 12, 1))
+    assert statements[0] == "LOCK TABLE movements_default IN EXCLUSIVE MODE"
+    assert statements[2].startswith("INSERT INTO movements_p2026_12 SELECT * FROM movements_default WHERE")
+    assert statements[3].startswith("DELETE FROM movements_default WHERE")
+    assert statements[-1] == (
+        "ALTER TABLE movements ATTACH PARTITION movements_p2026_12 FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_expire_movements_keeps_reconciliation_clean(
+    async_db_session: AsyncSession, sample_products: List[Product], store_ids
+):
+    """
+    Prueba que retirar los meses expirados guarda su saldo en `movement_balances`, borra solo esos movimientos y
+    la conciliación sigue cuadrando; en SQLite no hay particiones que crear.
+    """
+    product_id, store_a, store_b = sample_products[0].id, uuid.UUID(store_ids[0]), uuid.UUID(store_ids[1])
+    await create_inventory(
+        InventoryCreate(product_id=product_id, store_id=store_a, quantity=20, min_stock=5), async_db_session
+    )
+    await async_db_session.execute(update(Movement).values(timestamp=datetime(2025, 1, 15)))
+    await async_db_session.commit()
+    await transfer_inventory(
+        InventoryTransferRequest(product_id=product_id, source_store_id=store_a, target_store_id=store_b, quantity=5),
+        async_db_session,
+    )
+
+    assert await ensure_movement_partitions(async_db_session) == []
+    report = await expire_movements(async_db_session, 6)
+    assert report["balances"] == 1
+    assert report["deleted"] == 1
+    assert await async_db_session.scalar(select(func.count()).select_from(Movement)) == 1
+    balance = await async_db_session.scalar(select(MovementBalance))
+    assert (balance.store_id, balance.quantity, balance.balance_at) == (store_a, 20, report["cutoff"])
+
+    assert await reconcile_store(async_db_session, store_a) == []
+    assert await reconcile_store(async_db_session, store_b) == []
+    assert (await expire_movements(async_db_session, 6))["balances"] == 0
@@ -0,0 +1,102 @@
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.models.product import Product
+from inventory_management_system.services import product_import_service
+from inventory_management_system.services.product_import_service import import_products, iter_lines
+
+
+async def _stream(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_joins_chunks():
+    """Prueba que las líneas partidas entre bloques de bytes (incluso a mitad de un carácter) se reconstruyan."""
+    data = "nombre,descripción\r\nTubería,ñandú\n".encode()
+    lines = [line async for line in iter_lines(_stream(data[:10], data[10:17], data[17:]))]
+    assert lines == ["nombre,descripción", "Tubería,ñandú"]
+
+
+@pytest.mark.asyncio
+async def test_import_products_ndjson(async_db_session: AsyncSession, sample_products):
+    """Prueba la importación NDJSON con filas válidas, inválidas y duplicadas"""
+    body = (
+        b'{"name": "Cemento", "description": "Cemento gris 50kg", "category": "Obra", "price": 30, "sku": "CEM1"}\n'
+        b"\n"
+        b"{no es json}\n"
+        b'{"name": "Arena", "description": "Arena fina", "category": "Obra", "price": -1, "sku": "ARE1"}\n'
+        b'{"name": "Otro", "description": "SKU existente", "category": "Obra", "price": 3, "sku": "VARILLA123"}\n'
+        b'{"name": "Cemento", "description": "Nombre repetido", "category": "Obra", "price": 3, "sku": "CEM2"}\n'
+    )
+    summary = await import_products(iter_lines(_stream(body)), "ndjson", async_db_session)
+    assert (summary.total_rows, summary.created, summary.failed) == (5, 1, 4)
+    assert [error.row for error in summary.errors] == [2, 3, 4, 5]
+    assert "price" in summary.errors[1].detail
+    assert summary.errors[2].sku == "VARILLA123"
+    created = await async_db_session.execute(select(Product).where(Product.sku == "CEM1"))
+    assert created.scalar_one().price == 30
+
+
+@pytest.mark.asyncio
+async def test_import_products_csv_in_chunks(async_db_session: AsyncSession, monkeypatch):
+    """Prueba la importación CSV por bloques, con campos entre comillas que contienen saltos de línea"""
+    monkeypatch.setattr(product_import_service, "IMPORT_CHUNK_SIZE", 2)
+    body = (
+        b"name,description,category,price,sku\n"
+        b'Tubo,"Tubo PVC\n3 pulgadas",Plomeria,12.5,TUB1\n'
+        b"Codo,Codo PVC 90,Plomeria,2.25,COD1\n"
+        b"Llave,Llave de paso,Plomeria,8\n"
+        b"Tubo,Tubo repetido,Plomeria,1,TUB2\n"
+    )
+    summary = await import_products(iter_lines(_stream(body)), "csv", async_db_session)
+    assert (summary.total_rows, summary.created, summary.failed) == (4, 2, 2)
+    assert summary.errors[0].detail == "Se esperaban 5 columnas y se recibieron 4"
+    assert summary.errors[1].detail == "Ya existe un producto con este SKU o nombre"
+    count = await async_db_session.execute(select(func.count()).select_from(Product))
+    assert count.scalar_one() == 2
+    description = await async_db_session.execute(select(Product.description).where(Product.sku == "TUB1"))
+    assert description.scalar_one() == "Tubo PVC\n3 pulgadas"
+
+
+@pytest.mark.asyncio
+async def test_import_products_csv_literal_and_unclosed_quotes(async_db_session: AsyncSession, monkeypatch):
+    """Prueba que una comilla literal no absorba las filas siguientes y que una comilla sin cerrar se reporte"""
+    monkeypatch.setattr(product_import_service, "MAX_CSV_RECORD_LINES", 2)
+    body = (
+        b"name,description,category,price,sku\n"
+        b'Tubo,Tubo 3" PVC,Plomeria,12,TUB1\n'
+        b'Codo,"Codo sin cerrar,Plomeria,2,COD1\n'
+        b"Llave,Llave de paso,Plomeria,8,LLA1\n"
+        b"Valvula,Valvula de bola,Plomeria,9,VAL1\n"
+        b'Niple,"Niple sin cerrar,Plomeria,1,NIP1\n'
+    )
+    summary = await import_products(iter_lines(_stream(body)), "csv", async_db_session)
+    assert (summary.total_rows, summary.created, summary.failed) == (5, 3, 2)
+    assert [(error.row, error.detail) for error in summary.errors] == [
+        (2, "Campo entre comillas sin cerrar"),
+        (5, "Campo entre comillas sin cerrar"),
+    ]
+    description = await async_db_session.execute(select(Product.description).where(Product.sku == "TUB1"))
+    assert description.scalar_one() == 'Tubo 3" PVC'
+
+
+@pytest.mark.asyncio
+async def test_import_products_reports_rejected_chunk(async_db_session: AsyncSession, sample_products, monkeypatch):
+    """Prueba que un bloque rechazado por la BD (SKU creado por otro proceso) se reporte sin cortar la importación"""
+
+    async def _no_conflicts(products, db):
+        return set(), set()
+
+    monkeypatch.setattr(product_import_service, "_find_existing_skus_and_names", _no_conflicts)
+    body = (
+        b'{"name": "Otra varilla", "description": "SKU ya existente", "category": "Obra", "price": 3,'
+        b' "sku": "VARILLA123"}\n'
+    )
+    summary = await import_products(iter_lines(_stream(body)), "ndjson", async_db_session)
+    assert (summary.total_rows, summary.created, summary.failed) == (1, 0, 1)
+    assert summary.errors[0].detail.startswith("No se pudo insertar el bloque: IntegrityError")
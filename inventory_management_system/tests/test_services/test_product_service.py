@@ -4,12 +4,17 @@ import pytest
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from inventory_management_system.core.cache import TTLCache
+from inventory_management_system.core.pagination import encode_cursor
 from inventory_management_system.schemas.product import ProductCreate, ProductUpdate
 from inventory_management_system.services.product_service import (
+    check_stock_totals,
     create_product,
     delete_product,
     get_product_by_id,
     get_products,
+    product_cache,
+    product_cursor_key,
     update_product,
 )
 
@@ -22,6 +27,24 @@ async def test_get_products(async_db_session: AsyncSession, sample_products):
     assert all(product.category == "Construcción" for product in products)
 
 
+@pytest.mark.asyncio
+async def test_get_products_with_cursor(async_db_session: AsyncSession, sample_products):
+    """Prueba recorrer todos los productos por cursor en orden estable (nombre, id)."""
+    first_page = await get_products(async_db_session, limit=2)
+    cursor = encode_cursor(*product_cursor_key(first_page[-1]))
+    second_page = await get_products(async_db_session, limit=2, cursor=cursor)
+    names = [product.name for product in first_page + second_page]
+    assert names == sorted(product.name for product in sample_products)
+
+
+@pytest.mark.asyncio
+async def test_get_products_invalid_cursor(async_db_session: AsyncSession):
+    """Prueba que un cursor manipulado se rechace con 400."""
+    with pytest.raises(HTTPException) as excinfo:
+        await get_products(async_db_session, cursor="no-es-un-cursor")
+    assert excinfo.value.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_get_product_by_id(async_db_session: AsyncSession, sample_products):
     """Prueba la recuperación de un producto por ID."""
@@ -113,3 +136,64 @@ async def test_delete_product_not_found(async_db_session: AsyncSession):
         await delete_product(async_db_session, fake_id)
     assert excinfo.value.status_code == 404
     assert "Producto no encontrado" in excinfo.value.detail
+
+
+@pytest.mark.asyncio
+async def test_check_stock_totals(async_db_session: AsyncSession, sample_inventory):
+    """Prueba detectar y corregir productos cuyo stock total no coincide con el inventario."""
+    drift = await check_stock_totals(async_db_session)
+    assert {row["product_id"]: row["expected"] for row in drift} == {
+        inventory.product_id: inventory.quantity for inventory in sample_inventory
+    }
+    await check_stock_totals(async_db_session, fix=True)
+    assert await check_stock_totals(async_db_session) == []
+    product = await get_product_by_id(async_db_session, sample_inventory[0].product_id)
+    assert product.stock == sample_inventory[0].quantity
+
+
+def test_ttl_cache_lru_and_expiration():
+    """Prueba el desalojo LRU y la expiración por TTL de la caché en memoria."""
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" pasa a ser el más reciente
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["evictions"], stats["expirations"], stats["hits"]) == (1, 1, 1)
+
+
+def test_ttl_cache_discards_stale_fill():
+    """Prueba que una lectura iniciada antes de una invalidación no se guarde en la caché."""
+    cache = TTLCache(maxsize=10, ttl=10)
+    version = cache.version
+    cache.invalidate("a")
+    cache.set("a", "viejo", version=version)
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_get_product_by_id_uses_cache(async_db_session: AsyncSession, sample_products):
+    """Prueba que las lecturas repetidas salgan de la caché y que `update_product` la invalide."""
+    product_id = sample_products[0].id
+    hits = product_cache.hits
+    await get_product_by_id(async_db_session, product_id)
+    await get_product_by_id(async_db_session, product_id)
+    assert product_cache.hits == hits + 1
+    await update_product(async_db_session, product_id, ProductUpdate(price=99.0))
+    product = await get_product_by_id(async_db_session, product_id)
+    assert product.price == 99.0
+
+
+@pytest.mark.asyncio
+async def test_get_product_by_id_negative_cache(async_db_session: AsyncSession):
+    """Prueba que un ID inexistente se cachee como ausente (caché negativa)."""
+    fake_id = uuid.uuid4()
+    hits = product_cache.hits
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await get_product_by_id(async_db_session, fake_id)
+    assert product_cache.hits == hits + 1
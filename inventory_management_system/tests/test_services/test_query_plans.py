@@ -0,0 +1,194 @@
+"""
+Planes de ejecución de las consultas de los servicios sobre datos sembrados a escala.
+Cada escenario llama a un servicio, captura las sentencias que emite y obtiene su `EXPLAIN` (`EXPLAIN QUERY PLAN`
+en SQLite); la prueba falla si alguna recorre una tabla completa (`SCAN tabla` / `Seq Scan`).
+"""
+
+import random
+import re
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from inventory_management_system.models import Base, Inventory, Movement, Product
+from inventory_management_system.models.movement import MovementType
+from inventory_management_system.schemas.inventory import InventoryCreate, InventoryTransferRequest, InventoryUpdate
+from inventory_management_system.schemas.movement import MovementCreate
+from inventory_management_system.services.export_service import movements_export_query, store_inventory_export_query
+from inventory_management_system.services.inventory_service import (
+    create_inventory,
+    get_inventory_by_id,
+    get_inventory_by_store,
+    get_low_stock_alerts,
+    transfer_inventory,
+    transfer_inventory_batch,
+    update_inventory,
+)
+from inventory_management_system.services.movement_service import (
+    create_movement,
+    create_movements_batch,
+    get_all_movements,
+    get_movement_by_id,
+)
+from inventory_management_system.services.product_service import get_product_by_id, get_products, product_cache
+from inventory_management_system.services.reconciliation_service import reconcile_store
+from inventory_management_system.services.rollup_service import get_movement_rollups
+from inventory_management_system.services.snapshot_service import get_stock_as_of
+from inventory_management_system.tests.conftest import STORE_IDS, TestingSessionLocal, engine
+
+SEED_PRODUCTS = 500
+SEED_MOVEMENTS = 5000
+START = datetime(2026, 1, 1)
+# 🔹 Tablas que se leen completas a propósito: el registro de tiendas se carga entero en memoria
+ALLOWED_SCANS = {"stores"}
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)( USING (COVERING )?INDEX \w+)?$")
+_POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+@contextmanager
+def capture_statements(async_engine: AsyncEngine) -> Iterator[list[tuple[str, object]]]:
+    """Guarda `(sentencia, parámetros)` de cada lectura o modificación emitida por el motor durante el bloque."""
+    statements: list[tuple[str, object]] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", on_execute)
+
+
+async def explain(async_engine: AsyncEngine, statement: str, parameters) -> list[str]:
+    """Líneas del plan de ejecución de una sentencia ya compilada."""
+    async with async_engine.connect() as conn:
+        if async_engine.dialect.name == "sqlite":
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[3] for row in result]
+        result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        return [row[0] for row in result]
+
+
+def sequential_scans(statement: str, plan: list[str], dialect: str) -> set[str]:
+    """
+    Tablas del esquema que el plan recorre completas: sin índice o, en SQLite, recorriendo un índice entero salvo
+    que la sentencia tenga `LIMIT` (listado paginado en el orden del índice, que se detiene al llenar la página).
+    """
+    tables = set()
+    for line in plan:
+        if dialect != "sqlite":
+            match = _POSTGRES_SCAN.search(line)
+        elif (match := _SQLITE_SCAN.match(line.strip())) and match.group(2) and re.search(r"\bLIMIT\b", statement):
+            match = None
+        if match:
+            tables.add(match.group(1))
+    return (tables & Base.metadata.tables.keys()) - ALLOWED_SCANS
+
+
+async def _seed() -> dict:
+    rng = random.Random(7)
+    store_ids = [uuid.UUID(store_id) for store_id in STORE_IDS]
+    product_ids = [uuid.uuid4() for _ in range(SEED_PRODUCTS)]
+    inventory = [
+        {"id": uuid.uuid4(), "product_id": product_id, "store_id": store_id, "quantity": 1000, "min_stock": 5}
+        for product_id in product_ids
+        for store_id in store_ids[:-1]  # 🔹 La última tienda queda vacía para `create_inventory`
+    ]
+    movements = []
+    for i in range(SEED_MOVEMENTS):
+        movement_type = rng.choice(list(MovementType))
+        source_store_id, target_store_id = rng.sample(store_ids, 2)
+        movements.append(
+            {
+                "id": uuid.uuid4(),
+                "product_id": rng.choice(product_ids),
+                "source_store_id": None if movement_type == MovementType.IN else source_store_id,
+                "target_store_id": None if movement_type == MovementType.OUT else target_store_id,
+                "quantity": 1,
+                "timestamp": START + timedelta(minutes=i),
+                "type": movement_type,
+            }
+        )
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(Product),
+            [
+                {
+                    "id": product_id,
+                    "name": f"Producto {i:04d}",
+                    "description": "Producto sembrado",
+                    "category": f"Cat {i % 10}",
+                    "price": 10.0,
+                    "sku": f"S{i}",
+                }
+                for i, product_id in enumerate(product_ids)
+            ],
+        )
+        await conn.execute(insert(Inventory), inventory)
+        await conn.execute(insert(Movement), movements)
+        await conn.exec_driver_sql("ANALYZE")
+    return {"stores": store_ids, "products": product_ids, "inventory": inventory, "movements": movements}
+
+
+def _scenarios(data: dict) -> dict:
+    """Llamadas a servicios con las consultas calientes de la API (lecturas filtradas y escrituras por clave)."""
+    product_id = data["products"][0]
+    store_a, store_b, empty_store = data["stores"][0], data["stores"][1], data["stores"][-1]
+    inventory_id = data["inventory"][0]["id"]
+    sale = MovementCreate(product_id=product_id, source_store_id=store_a, quantity=1, type=MovementType.OUT)
+    transfer = InventoryTransferRequest(
+        product_id=product_id, source_store_id=store_a, target_store_id=store_b, quantity=1
+    )
+    at = START + timedelta(days=2)
+    return {
+        "get_products": lambda db: get_products(db, limit=20),
+        "get_product_by_id": lambda db: get_product_by_id(db, product_id),
+        "get_inventory_by_id": lambda db: get_inventory_by_id(inventory_id, db),
+        "get_inventory_by_store": lambda db: get_inventory_by_store(store_a, db, limit=50),
+        "get_low_stock_alerts": lambda db: get_low_stock_alerts(db, store_id=store_a),
+        "create_inventory": lambda db: create_inventory(
+            InventoryCreate(product_id=product_id, store_id=empty_store, quantity=10, min_stock=5), db
+        ),
+        "update_inventory": lambda db: update_inventory(inventory_id, InventoryUpdate(quantity=900), db),
+        "transfer_inventory": lambda db: transfer_inventory(transfer, db),
+        "transfer_inventory_batch": lambda db: transfer_inventory_batch([transfer, transfer], db),
+        "create_movement": lambda db: create_movement(sale, db),
+        "create_movements_batch": lambda db: create_movements_batch([sale, sale], db),
+        "get_movement_by_id": lambda db: get_movement_by_id(db, data["movements"][0]["id"]),
+        "get_all_movements": lambda db: get_all_movements(db, limit=20),
+        "get_all_movements_by_product": lambda db: get_all_movements(db, limit=20, product_id=product_id),
+        "get_all_movements_by_store": lambda db: get_all_movements(db, limit=20, store_id=store_a),
+        "get_movement_rollups": lambda db: get_movement_rollups(db, product_id=product_id, store_id=store_a),
+        "get_stock_as_of_product": lambda db: get_stock_as_of(db, at, product_id=product_id),
+        "get_stock_as_of_store": lambda db: get_stock_as_of(db, at, store_id=store_a),
+        "reconcile_store": lambda db: reconcile_store(db, store_a),
+        "export_movements_by_product": lambda db: db.execute(movements_export_query(product_id=product_id)),
+        "export_movements_by_store": lambda db: db.execute(movements_export_query(store_id=store_a, start=at)),
+        "export_store_inventory": lambda db: db.execute(store_inventory_export_query(store_a)),
+    }
+
+
+@pytest.mark.asyncio
+async def test_service_queries_avoid_sequential_scans():
+    """Prueba que ninguna consulta de los servicios recorre una tabla completa con datos sembrados a escala."""
+    data = await _seed()
+    dialect = engine.dialect.name
+    scans = []
+    for name, scenario in _scenarios(data).items():
+        product_cache.clear()
+        with capture_statements(engine) as statements:
+            async with TestingSessionLocal() as session:
+                await scenario(session)
+        assert statements, name
+        for statement, parameters in statements:
+            plan = await explain(engine, statement, parameters)
+            if tables := sequential_scans(statement, plan, dialect):
+                scans.append(f"{name}: {sorted(tables)}\n  {statement}\n  " + "\n  ".join(plan))
+    assert not scans, "Consultas con recorrido completo de tabla:\n" + "\n".join(scans)
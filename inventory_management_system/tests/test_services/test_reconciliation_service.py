@@ -0,0 +1,55 @@
+import uuid
+from typing import List
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.models import Inventory, Product
+from inventory_management_system.schemas.inventory import InventoryCreate, InventoryTransferRequest
+from inventory_management_system.services.inventory_service import create_inventory, transfer_inventory
+from inventory_management_system.services.reconciliation_service import reconcile_inventory, reconcile_store
+from inventory_management_system.tests.conftest import TestingSessionLocal
+
+
+async def _stock_with_drift(db: AsyncSession, product_id: uuid.UUID, store_a: uuid.UUID, store_b: uuid.UUID) -> None:
+    """20 unidades en A, 5 transferidas a B y una escritura directa que deja A en 12 sin movimiento."""
+    await create_inventory(InventoryCreate(product_id=product_id, store_id=store_a, quantity=20, min_stock=5), db)
+    await transfer_inventory(
+        InventoryTransferRequest(product_id=product_id, source_store_id=store_a, target_store_id=store_b, quantity=5),
+        db,
+    )
+    await db.execute(
+        update(Inventory)
+        .where((Inventory.product_id == product_id) & (Inventory.store_id == store_a))
+        .values(quantity=12)
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_store_reports_drift(async_db_session: AsyncSession, sample_products: List[Product], store_ids):
+    """Prueba que la conciliación detecta la diferencia de la tienda alterada y no la de la tienda sana."""
+    product_id, store_a, store_b = sample_products[0].id, uuid.UUID(store_ids[0]), uuid.UUID(store_ids[1])
+    await _stock_with_drift(async_db_session, product_id, store_a, store_b)
+
+    assert await reconcile_store(async_db_session, store_a) == [
+        {"product_id": product_id, "store_id": store_a, "expected": 15, "actual": 12, "drift": -3}
+    ]
+    assert await reconcile_store(async_db_session, store_b) == []
+
+
+@pytest.mark.asyncio
+async def test_reconcile_inventory_fix_records_adjustments(
+    async_db_session: AsyncSession, sample_products: List[Product], store_ids
+):
+    """Prueba que `fix=True` registra un ajuste OUT que explica la diferencia y una segunda pasada sale limpia."""
+    product_id, store_a, store_b = sample_products[0].id, uuid.UUID(store_ids[0]), uuid.UUID(store_ids[1])
+    await _stock_with_drift(async_db_session, product_id, store_a, store_b)
+
+    report = await reconcile_inventory(TestingSessionLocal, fix=True)
+    assert report["stores"] == len(store_ids)
+    assert [(row["store_id"], row["drift"]) for row in report["items"]] == [(store_a, -3)]
+
+    report = await reconcile_inventory(TestingSessionLocal)
+    assert report["items"] == []
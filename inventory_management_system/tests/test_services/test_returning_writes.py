@@ -0,0 +1,159 @@
+"""
+Sentencias que emite cada escritura de los servicios: las filas creadas o modificadas vuelven con `RETURNING` en la
+misma sentencia, sin el `SELECT` de `refresh()` tras el commit. Las cachés de productos y tiendas se calientan
+antes, para contar solo las sentencias de la operación.
+"""
+
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.models import Inventory, Product
+from inventory_management_system.schemas.inventory import InventoryCreate, InventoryTransferRequest, InventoryUpdate
+from inventory_management_system.schemas.movement import MovementCreate, MovementType
+from inventory_management_system.schemas.product import ProductCreate, ProductUpdate
+from inventory_management_system.schemas.store import StoreCreate, StoreUpdate
+from inventory_management_system.services.inventory_service import (
+    create_inventory,
+    transfer_inventory,
+    update_inventory,
+)
+from inventory_management_system.services.movement_service import create_movement
+from inventory_management_system.services.product_service import create_product, get_cached_product, update_product
+from inventory_management_system.services.store_service import create_store, store_registry, update_store
+
+
+@contextmanager
+def record_statements(db: AsyncSession) -> Iterator[list[str]]:
+    """Sentencias SQL emitidas por la sesión durante el bloque, en mayúsculas y sin espacios iniciales."""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement.lstrip().upper())
+
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _selects(statements: list[str]) -> list[str]:
+    return [statement for statement in statements if statement.startswith("SELECT")]
+
+
+async def _warm_caches(db: AsyncSession, *products: Product) -> None:
+    await store_registry.get_store_ids(db)
+    for product in products:
+        await get_cached_product(db, product.id)
+
+
+@pytest.mark.asyncio
+async def test_create_product_inserts_with_returning(async_db_session: AsyncSession):
+    """Alta de producto: comprobación de duplicados e `INSERT ... RETURNING`, sin releer la fila."""
+    product_data = ProductCreate(
+        name="Cemento Portland", description="Bolsa de cemento de 50 kg", category="Construcción", price=12.3, sku="C1"
+    )
+    with record_statements(async_db_session) as statements:
+        product = await create_product(async_db_session, product_data)
+    assert len(statements) == 2
+    assert statements[1].startswith("INSERT INTO PRODUCTS") and "RETURNING" in statements[1]
+    assert (product.sku, product.stock_total) == ("C1", 0)
+
+
+@pytest.mark.asyncio
+async def test_update_product_single_statement(async_db_session: AsyncSession, sample_products: List[Product]):
+    """Cambio de producto: un único `UPDATE ... RETURNING`, también cuando el producto no existe (404)."""
+    product_id = sample_products[0].id
+    with record_statements(async_db_session) as statements:
+        product = await update_product(async_db_session, product_id, ProductUpdate(price=29.99))
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE PRODUCTS") and "RETURNING" in statements[0]
+    assert (product.id, product.price, product.sku) == (product_id, 29.99, sample_products[0].sku)
+
+    with record_statements(async_db_session) as statements:
+        with pytest.raises(HTTPException) as excinfo:
+            await update_product(async_db_session, uuid.uuid4(), ProductUpdate(price=1.0))
+    assert excinfo.value.status_code == 404
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_inventory_without_refresh(
+    async_db_session: AsyncSession, sample_products: List[Product], store_ids: List[str]
+):
+    """Alta de inventario: la única lectura es la comprobación de duplicados; la fila vuelve con `RETURNING`."""
+    await _warm_caches(async_db_session, sample_products[0])
+    inventory_data = InventoryCreate(
+        product_id=sample_products[0].id, store_id=uuid.UUID(store_ids[0]), quantity=20, min_stock=5
+    )
+    with record_statements(async_db_session) as statements:
+        inventory = await create_inventory(inventory_data, async_db_session)
+    assert len(_selects(statements)) == 1
+    (insert,) = [statement for statement in statements if statement.startswith("INSERT INTO INVENTORY")]
+    assert "RETURNING" in insert
+    assert inventory.id is not None and (inventory.quantity, inventory.min_stock) == (20, 5)
+
+
+@pytest.mark.asyncio
+async def test_update_inventory_without_refresh(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Cambio de inventario: lee la fila una vez (stock anterior) y la escribe con `UPDATE ... RETURNING`."""
+    inventory_id = sample_inventory[0].id
+    with record_statements(async_db_session) as statements:
+        inventory = await update_inventory(inventory_id, InventoryUpdate(quantity=70, min_stock=8), async_db_session)
+    assert len(_selects(statements)) == 1
+    (update,) = [statement for statement in statements if statement.startswith("UPDATE INVENTORY")]
+    assert "RETURNING" in update
+    assert (inventory.id, inventory.quantity, inventory.min_stock) == (inventory_id, 70, 8)
+
+
+@pytest.mark.asyncio
+async def test_store_writes_single_statement(async_db_session: AsyncSession):
+    """Alta y cambio de tienda: una sentencia cada uno; `created_at` (valor del servidor) vuelve con `RETURNING`."""
+    with record_statements(async_db_session) as statements:
+        store = await create_store(async_db_session, StoreCreate(name="Tienda Norte"))
+    assert len(statements) == 1 and "RETURNING" in statements[0]
+    assert store.id is not None and store.created_at is not None
+
+    with record_statements(async_db_session) as statements:
+        updated = await update_store(async_db_session, store.id, StoreUpdate(address="Av. Siempre Viva 742"))
+    assert len(statements) == 1 and statements[0].startswith("UPDATE STORES")
+    assert (updated.name, updated.address) == ("Tienda Norte", "Av. Siempre Viva 742")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await update_store(async_db_session, uuid.uuid4(), StoreUpdate(address="Sin tienda"))
+    assert excinfo.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stock_writes_without_rereads(
+    async_db_session: AsyncSession, sample_products: List[Product], sample_inventory: List[Inventory]
+):
+    """Transferencias y movimientos: el stock y el movimiento vuelven con `RETURNING`, sin releer filas."""
+    source = sample_inventory[0]
+    await _warm_caches(async_db_session, sample_products[0])
+    transfer = InventoryTransferRequest(
+        product_id=source.product_id,
+        source_store_id=source.store_id,
+        target_store_id=sample_inventory[1].store_id,
+        quantity=10,
+    )
+    with record_statements(async_db_session) as statements:
+        result = await transfer_inventory(transfer, async_db_session)
+    assert _selects(statements) == []
+    assert (result["source_store"]["remaining_stock"], result["target_store"]["new_stock"]) == (40, 10)
+
+    movement_data = MovementCreate(
+        product_id=source.product_id, source_store_id=source.store_id, quantity=5, type=MovementType.OUT
+    )
+    with record_statements(async_db_session) as statements:
+        movement = await create_movement(movement_data, async_db_session)
+    # 🔹 La única lectura es la del stock que se bloquea (`lock_stock`)
+    assert len(_selects(statements)) == 1
+    assert movement.id is not None and movement.quantity == 5
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.models import Inventory, Movement, MovementBalance, MovementRollup
+from inventory_management_system.models.movement import MovementType
+from inventory_management_system.schemas.movement import MovementCreate
+from inventory_management_system.services.movement_service import create_movement, create_movements_batch
+from inventory_management_system.services.rollup_service import (
+    ROLLUP_COLUMNS,
+    RollupGranularity,
+    backfill_rollups,
+    get_movement_rollups,
+)
+
+DAY = datetime(2026, 3, 14)
+
+
+async def _write_movements(db: AsyncSession, inventory: Inventory, other_store_id) -> None:
+    product_id, store_id = inventory.product_id, inventory.store_id
+    await create_movements_batch(
+        [
+            MovementCreate(
+                product_id=product_id, source_store_id=store_id, quantity=3, type=MovementType.OUT, timestamp=DAY
+            ),
+            MovementCreate(
+                product_id=product_id,
+                source_store_id=store_id,
+                quantity=2,
+                type=MovementType.OUT,
+                timestamp=DAY + timedelta(hours=5),
+            ),
+            MovementCreate(
+                product_id=product_id,
+                source_store_id=store_id,
+                target_store_id=other_store_id,
+                quantity=10,
+                type=MovementType.TRANSFER,
+                timestamp=DAY + timedelta(hours=5, minutes=30),
+            ),
+        ],
+        db,
+    )
+    await create_movement(
+        MovementCreate(
+            product_id=product_id,
+            target_store_id=store_id,
+            quantity=7,
+            type=MovementType.IN,
+            timestamp=DAY + timedelta(days=1),
+        ),
+        db,
+    )
+
+
+def _summary(rollups: list[dict]) -> list[tuple]:
+    return [
+        (r["bucket"], r["store_id"], r["in_quantity"], r["out_quantity"], r["transfer_in_quantity"],
+         r["transfer_out_quantity"], r["movements"], r["net_quantity"])
+        for r in rollups
+    ]  # fmt: skip
+
+
+@pytest.mark.asyncio
+async def test_rollups_recorded_with_movements(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que los agregados diarios y horarios se actualicen al registrar movimientos"""
+    inventory, other_store_id = sample_inventory[0], sample_inventory[1].store_id
+    product_id, store_id = inventory.product_id, inventory.store_id
+    await _write_movements(async_db_session, inventory, other_store_id)
+    daily = await get_movement_rollups(async_db_session, product_id=product_id, store_id=store_id)
+    assert _summary(daily) == [
+        (DAY, store_id, 0, 5, 0, 10, 3, -15),
+        (DAY + timedelta(days=1), store_id, 7, 0, 0, 0, 1, 7),
+    ]
+    hourly = await get_movement_rollups(
+        async_db_session,
+        granularity=RollupGranularity.HOUR,
+        start=DAY + timedelta(hours=1),
+        end=DAY + timedelta(days=1),
+        product_id=product_id,
+    )
+    assert sorted(_summary(hourly), key=lambda row: row[5]) == sorted(
+        [
+            (DAY + timedelta(hours=5), store_id, 0, 2, 0, 10, 2, -12),
+            (DAY + timedelta(hours=5), other_store_id, 0, 0, 10, 0, 1, 10),
+        ],
+        key=lambda row: row[5],
+    )
+
+
+@pytest.mark.asyncio
+async def test_backfill_rollups_matches_incremental(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que la reconstrucción por bloques produzca los mismos agregados que el mantenimiento incremental"""
+    await _write_movements(async_db_session, sample_inventory[0], sample_inventory[1].store_id)
+    for granularity in RollupGranularity:
+        expected = await get_movement_rollups(async_db_session, granularity=granularity)
+        await async_db_session.execute(delete(MovementRollup))
+        await async_db_session.commit()
+        assert await backfill_rollups(async_db_session, chunk_size=2) == 4
+        assert await get_movement_rollups(async_db_session, granularity=granularity) == expected
+    # 🔹 Con `since` solo se reconstruyen los días desde esa fecha
+    assert await backfill_rollups(async_db_session, since=DAY + timedelta(days=1, hours=3)) == 1
+    assert len(await get_movement_rollups(async_db_session)) == 3
+
+
+@pytest.mark.asyncio
+async def test_backfill_rollups_keeps_expired_buckets(
+    async_db_session: AsyncSession, sample_inventory: List[Inventory]
+):
+    """Prueba que una reconstrucción completa no borre los agregados de movimientos ya retirados del historial"""
+    inventory = sample_inventory[0]
+    await _write_movements(async_db_session, inventory, sample_inventory[1].store_id)
+    expected = await get_movement_rollups(async_db_session)
+    # 🔹 Como `expire_movements`: saldo en el corte y movimientos anteriores retirados
+    cutoff = DAY + timedelta(days=1)
+    async_db_session.add(
+        MovementBalance(balance_at=cutoff, product_id=inventory.product_id, store_id=inventory.store_id, quantity=-15)
+    )
+    await async_db_session.execute(delete(Movement).where(Movement.timestamp < cutoff))
+    await async_db_session.commit()
+    assert await backfill_rollups(async_db_session) == 1
+    assert await backfill_rollups(async_db_session, since=DAY) == 1
+    assert await get_movement_rollups(async_db_session) == expected
+
+
+@pytest.mark.asyncio
+async def test_backfill_rollups_commits_per_day(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que la reconstrucción confirme cada día por separado y borre los agregados sin movimientos"""
+    inventory = sample_inventory[0]
+    await _write_movements(async_db_session, inventory, sample_inventory[1].store_id)
+    expected = await get_movement_rollups(async_db_session)
+    stale = DAY - timedelta(days=2)
+    for granularity in RollupGranularity:
+        async_db_session.add(
+            MovementRollup(
+                granularity=granularity.value,
+                bucket=stale,
+                product_id=inventory.product_id,
+                store_id=inventory.store_id,
+                **dict.fromkeys(ROLLUP_COLUMNS, 1),
+            )
+        )
+    await async_db_session.commit()
+    commits = []
+
+    def _record(conn) -> None:
+        commits.append(conn)
+
+    engine = async_db_session.bind.sync_engine
+    event.listen(engine, "commit", _record)
+    try:
+        assert await backfill_rollups(async_db_session) == 4
+    finally:
+        event.remove(engine, "commit", _record)
+    # 🔹 Un commit por día, del agregado sin movimientos al último movimiento
+    assert len(commits) == 4
+    assert await get_movement_rollups(async_db_session) == expected
@@ -0,0 +1,156 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.models import Inventory, InventorySnapshot, Movement, Product
+from inventory_management_system.models.movement import MovementType
+from inventory_management_system.schemas.inventory import InventoryUpdate
+from inventory_management_system.schemas.movement import MovementCreate
+from inventory_management_system.services.inventory_service import update_inventory
+from inventory_management_system.services.movement_service import create_movement, create_movements_batch
+from inventory_management_system.services.snapshot_service import (
+    get_stock_as_of,
+    prune_inventory_snapshots,
+    take_inventory_snapshot,
+    take_snapshot_if_due,
+)
+
+DAY = datetime(2026, 3, 14)
+
+
+async def _write_history(db: AsyncSession, product_id: uuid.UUID, store_a: uuid.UUID, store_b: uuid.UUID) -> None:
+    await create_movements_batch(
+        [
+            MovementCreate(
+                product_id=product_id, target_store_id=store_a, quantity=20, type=MovementType.IN, timestamp=DAY
+            ),
+            MovementCreate(
+                product_id=product_id,
+                source_store_id=store_a,
+                quantity=3,
+                type=MovementType.OUT,
+                timestamp=DAY + timedelta(days=1),
+            ),
+            MovementCreate(
+                product_id=product_id,
+                source_store_id=store_a,
+                target_store_id=store_b,
+                quantity=4,
+                type=MovementType.TRANSFER,
+                timestamp=DAY + timedelta(days=2),
+            ),
+        ],
+        db,
+    )
+
+
+def _quantities(items: list[dict]) -> dict:
+    return {item["store_id"]: item["quantity"] for item in items}
+
+
+@pytest.mark.asyncio
+async def test_stock_as_of_replays_ledger(async_db_session: AsyncSession, sample_products: List[Product], store_ids):
+    """Prueba reconstruir el stock en distintas fechas sin copias, solo con el historial de movimientos"""
+    product_id, store_a, store_b = sample_products[0].id, uuid.UUID(store_ids[0]), uuid.UUID(store_ids[1])
+    await _write_history(async_db_session, product_id, store_a, store_b)
+    assert (await get_stock_as_of(async_db_session, DAY - timedelta(seconds=1), product_id))[1] == []
+    snapshot_at, items = await get_stock_as_of(async_db_session, DAY + timedelta(days=1), product_id)
+    assert snapshot_at is None
+    assert _quantities(items) == {store_a: 17}
+    _, items = await get_stock_as_of(async_db_session, DAY + timedelta(days=2), product_id, store_b)
+    assert _quantities(items) == {store_b: 4}
+
+
+@pytest.mark.asyncio
+async def test_stock_as_of_starts_from_snapshot(
+    async_db_session: AsyncSession, sample_products: List[Product], store_ids
+):
+    """Prueba que la consulta parta de la copia y reproduzca solo los movimientos posteriores a ella"""
+    product_id, store_a, store_b = sample_products[0].id, uuid.UUID(store_ids[0]), uuid.UUID(store_ids[1])
+    await _write_history(async_db_session, product_id, store_a, store_b)
+    taken_at = await take_inventory_snapshot(async_db_session)
+    # 🔹 Un movimiento anterior a la copia ya no se reproduce: la copia es el punto de partida
+    async_db_session.add(
+        Movement(
+            product_id=product_id,
+            source_store_id=store_a,
+            quantity=1,
+            type=MovementType.OUT,
+            timestamp=taken_at - timedelta(minutes=1),
+        )
+    )
+    await async_db_session.commit()
+    await create_movements_batch(
+        [MovementCreate(product_id=product_id, source_store_id=store_b, quantity=1, type=MovementType.OUT)],
+        async_db_session,
+    )
+    later = datetime.now(timezone.utc).replace(tzinfo=None)
+    snapshot_at, items = await get_stock_as_of(async_db_session, later, product_id)
+    assert snapshot_at == taken_at
+    assert _quantities(items) == {store_a: 13, store_b: 3}
+    # 🔹 Antes de la copia se reconstruye desde el historial
+    assert _quantities((await get_stock_as_of(async_db_session, DAY, product_id))[1]) == {store_a: 20}
+
+
+@pytest.mark.asyncio
+async def test_take_snapshot_if_due(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que solo se tome una copia si la última es más antigua que el intervalo"""
+    assert await take_snapshot_if_due(async_db_session, timedelta(hours=1)) is not None
+    assert await take_snapshot_if_due(async_db_session, timedelta(hours=1)) is None
+    assert await take_snapshot_if_due(async_db_session, timedelta(0)) is not None
+
+
+@pytest.mark.asyncio
+async def test_snapshot_retention(async_db_session: AsyncSession, sample_inventory: List[Inventory]):
+    """Prueba que cada copia borre las anteriores a las `keep` más recientes"""
+    taken = [await take_inventory_snapshot(async_db_session, keep=2) for _ in range(3)]
+    rows = await async_db_session.execute(
+        select(InventorySnapshot.taken_at, func.count()).group_by(InventorySnapshot.taken_at)
+    )
+    assert sorted(rows.all()) == [(taken[1], len(sample_inventory)), (taken[2], len(sample_inventory))]
+    assert await prune_inventory_snapshots(async_db_session, keep=1) == len(sample_inventory)
+    assert await async_db_session.scalar(select(func.min(InventorySnapshot.taken_at))) == taken[2]
+
+
+@pytest.mark.asyncio
+async def test_manual_adjustment_is_replayed(async_db_session: AsyncSession, sample_products: List[Product], store_ids):
+    """Prueba que un ajuste manual de cantidad quede en el historial y en la reconstrucción del stock"""
+    product_id, store_a, store_b = sample_products[0].id, uuid.UUID(store_ids[0]), uuid.UUID(store_ids[1])
+    await _write_history(async_db_session, product_id, store_a, store_b)
+    inventory_id = await async_db_session.scalar(
+        select(Inventory.id).where((Inventory.product_id == product_id) & (Inventory.store_id == store_a))
+    )
+    await update_inventory(inventory_id, InventoryUpdate(quantity=9), async_db_session)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert _quantities((await get_stock_as_of(async_db_session, now, product_id))[1]) == {store_a: 9, store_b: 4}
+
+
+@pytest.mark.asyncio
+async def test_movement_timestamp_after_latest_snapshot(
+    async_db_session: AsyncSession, sample_products: List[Product], store_ids
+):
+    """Prueba que se rechacen fechas de cliente anteriores a la última copia o futuras, y que sin fecha se use la
+    hora de escritura y no la de validación del request"""
+    product_id, store_a = sample_products[0].id, uuid.UUID(store_ids[0])
+    await _write_history(async_db_session, product_id, store_a, uuid.UUID(store_ids[1]))
+    pending = MovementCreate(product_id=product_id, target_store_id=store_a, quantity=2, type=MovementType.IN)
+    taken_at = await take_inventory_snapshot(async_db_session)
+    movement = await create_movement(pending, async_db_session)
+    assert movement.timestamp > taken_at
+
+    for timestamp in (taken_at, datetime.now(timezone.utc) + timedelta(minutes=5)):
+        movement_data = MovementCreate(
+            product_id=product_id, target_store_id=store_a, quantity=1, type=MovementType.IN, timestamp=timestamp
+        )
+        with pytest.raises(HTTPException) as excinfo:
+            await create_movement(movement_data, async_db_session)
+        assert excinfo.value.status_code == 400
+        (result,) = await create_movements_batch([movement_data], async_db_session)
+        assert result.status_code == 400
+    _, items = await get_stock_as_of(async_db_session, datetime.now(timezone.utc).replace(tzinfo=None), product_id)
+    assert _quantities(items)[store_a] == 15
@@ -0,0 +1,96 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventory_management_system.models.store import Store
+from inventory_management_system.schemas.inventory import InventoryCreate
+from inventory_management_system.schemas.store import StoreCreate, StoreUpdate
+from inventory_management_system.services.inventory_service import create_inventory
+from inventory_management_system.services.store_service import (
+    StoreRegistry,
+    create_store,
+    delete_store,
+    store_registry,
+    update_store,
+    validate_store_ids,
+)
+
+
+@pytest.mark.asyncio
+async def test_store_registry_batch_validation(async_db_session: AsyncSession, store_ids):
+    """Prueba validar muchas tiendas a la vez con una sola carga del registro."""
+    unknown_id = uuid.uuid4()
+    registry = StoreRegistry(ttl=60)
+    unknown = await registry.find_unknown(
+        [uuid.UUID(store_id) for store_id in store_ids] + [unknown_id], async_db_session
+    )
+    assert unknown == {unknown_id}
+
+
+@pytest.mark.asyncio
+async def test_store_registry_reloads_on_miss(async_db_session: AsyncSession):
+    """Prueba que una tienda creada en otro worker (sin invalidar este registro) se acepte sin esperar al TTL."""
+    registry = StoreRegistry(ttl=60)
+    await registry.load(async_db_session)
+    other_worker_store = Store(name="Sucursal de otro worker")
+    async_db_session.add(other_worker_store)
+    await async_db_session.commit()
+    unknown_id = uuid.uuid4()
+    assert await registry.find_unknown([other_worker_store.id, unknown_id], async_db_session) == {unknown_id}
+    assert other_worker_store.id in registry._store_ids
+
+
+@pytest.mark.asyncio
+async def test_store_registry_discards_stale_load(async_db_session: AsyncSession, monkeypatch):
+    """Prueba que una carga durante la cual se invalidó el registro no se conserve."""
+    registry = StoreRegistry(ttl=60)
+    execute = async_db_session.execute
+
+    async def execute_and_invalidate(*args, **kwargs):
+        result = await execute(*args, **kwargs)
+        registry.invalidate()  # Simula un alta de tienda mientras se leía el registro
+        return result
+
+    monkeypatch.setattr(async_db_session, "execute", execute_and_invalidate)
+    await registry.load(async_db_session)
+    assert registry._store_ids is None
+
+
+@pytest.mark.asyncio
+async def test_create_store_is_valid_immediately(async_db_session: AsyncSession, sample_products):
+    """Prueba que una tienda nueva se pueda usar en el inventario sin reiniciar la API."""
+    await validate_store_ids([], async_db_session)  # Carga el registro antes del alta
+    store = await create_store(async_db_session, StoreCreate(name="Sucursal Centro"))
+    inventory = await create_inventory(
+        InventoryCreate(product_id=sample_products[0].id, store_id=store.id, quantity=10, min_stock=5),
+        async_db_session,
+    )
+    assert inventory.store_id == store.id
+
+
+@pytest.mark.asyncio
+async def test_create_store_duplicate_name(async_db_session: AsyncSession):
+    """Prueba que no se puedan registrar dos tiendas con el mismo nombre."""
+    with pytest.raises(HTTPException) as excinfo:
+        await create_store(async_db_session, StoreCreate(name="Tienda 0"))
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_update_store(async_db_session: AsyncSession, store_ids):
+    """Prueba actualizar la dirección de una tienda."""
+    store = await update_store(async_db_session, uuid.UUID(store_ids[0]), StoreUpdate(address="Calle 5"))
+    assert store.address == "Calle 5"
+
+
+@pytest.mark.asyncio
+async def test_delete_store(async_db_session: AsyncSession, sample_inventory, store_ids):
+    """Prueba que solo se puedan eliminar tiendas sin inventario y que dejen de ser válidas."""
+    with pytest.raises(HTTPException) as excinfo:
+        await delete_store(async_db_session, sample_inventory[0].store_id)
+    assert excinfo.value.status_code == 409
+    empty_store_id = uuid.UUID(store_ids[-1])
+    await delete_store(async_db_session, empty_store_id)
+    assert await store_registry.find_unknown([empty_store_id], async_db_session) == {empty_store_id}